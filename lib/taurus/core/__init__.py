@@ -34,4 +34,23 @@ LIGHTWEIGHT_IMPORTS = getattr(taurus.tauruscustomsettings, 'LIGHTWEIGHT_IMPORTS'
 if LIGHTWEIGHT_IMPORTS:
     from init_lightweight import *
 else:
-    from init_bkcomp import *
\ No newline at end of file
+    # the model classes (and the pint units registry they need) are only
+    # imported when first used
+    import release as Release
+    from .taurusbasetypes import *
+    from .taurusexception import *
+
+    # enable compatibility code with tau V1 if tauv1 package is present
+    try:
+        from .tauv1 import *
+    except:
+        pass
+
+    from .util.lazymodule import installLazyModule as _installLazyModule
+    _installLazyModule(__name__,
+                       imports=['taurusmodel', 'tauruslistener',
+                                'taurusdevice', 'taurusattribute',
+                                'taurusconfiguration', 'taurusauthority',
+                                'taurusfactory', 'taurusmanager',
+                                'taurusoperation', 'tauruspollingtimer',
+                                'taurusvalidator'])
\ No newline at end of file
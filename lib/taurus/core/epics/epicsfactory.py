@@ -41,7 +41,7 @@ from taurus.core.util.singleton import Singleton
 from taurus.core.util.log import Logger
 from taurus.core.taurusbasetypes import MatchLevel, TaurusDevState, \
     SubscriptionState, TaurusEventType, TaurusAttrValue, TaurusTimeVal, \
-    AttrQuality
+    AttrQuality, DataFormat
 from taurus.core.taurusfactory import TaurusFactory
 from taurus.core.taurusattribute import TaurusAttribute
 from taurus.core.taurusdevice import TaurusDevice
@@ -121,6 +121,11 @@ class EpicsDevice(TaurusDevice):
 class EpicsAttribute(TaurusAttribute):
     '''
     A :class:`TaurusAttribute` that gives access to an Epics Process Variable.
+
+    The connection to the PV is not waited for: the attribute is returned
+    right away (with an invalid value) and the value is delivered with a
+    Change event as soon as the PV gets connected. This allows to create many
+    attributes without blocking (the PVs are connected concurrently).
     
     .. seealso:: :mod:`taurus.core.epics` 
     
@@ -132,22 +137,46 @@ class EpicsAttribute(TaurusAttribute):
         self.call__init__(TaurusAttribute, name, parent, storeCallback=storeCallback)
                
         self.__attr_config = None
-        self.__pv = epics.PV(self.getNormalName(), callback=self.onEpicsEvent)
-        connected = self.__pv.wait_for_connection()
-        if connected:
-            self.info('successfully connected to epics PV')
-            self._value = self.decode_pv(self.__pv)
-        else:
-            self.info('connection to epics PV failed')
-            self._value = TaurusAttrValue()
+        #the value is invalid until the PV is connected
+        self._value = TaurusAttrValue()
+        self._value.quality = AttrQuality.ATTR_INVALID
         self.scheme = 'epics'
-        
-        #print "INIT",self.__pv, connected
+        #do not wait for the connection (see onEpicsConnectionEvent)
+        self.__pv = epics.PV(self.getNormalName(), callback=self.onEpicsEvent,
+                             connection_callback=self.onEpicsConnectionEvent)
         
     def onEpicsEvent(self, **kw):
         '''callback for PV changes'''
         self._value = self.decode_epics_evt(kw)
         self.fireEvent(TaurusEventType.Change, self._value)
+
+    def onEpicsConnectionEvent(self, conn=False, **kw):
+        '''callback for PV connection changes. Once connected, the (first)
+        value is delivered through a Change event by :meth:`onEpicsEvent`.
+        On disconnection, the value is invalidated and a Change event is
+        fired'''
+        if conn:
+            self.info('successfully connected to epics PV')
+        else:
+            self.info('epics PV disconnected')
+            value = TaurusAttrValue()
+            value.quality = AttrQuality.ATTR_INVALID
+            self._value = value
+            self.fireEvent(TaurusEventType.Change, self._value)
+
+    def isConnected(self):
+        '''returns True if the PV is currently connected'''
+        return self.__pv.connected
+
+    def waitForConnection(self, timeout=None):
+        '''blocks until the PV is connected (or the timeout expires)
+
+        :param timeout: (float or None) maximum time to wait (in s). If None,
+                        the default timeout of pyepics is used
+
+        :return: (bool) True if the PV is connected
+        '''
+        return self.__pv.wait_for_connection(timeout=timeout)
     
     def __getattr__(self,name):
         return getattr(self._getRealConfig(), name)
@@ -204,7 +233,7 @@ class EpicsAttribute(TaurusAttribute):
             attr_value.quality = AttrQuality.ATTR_ALARM
         else:
             attr_value.quality = AttrQuality.ATTR_VALID
-        attr_value.config.data_format = len(numpy.shape(attr_value.value))
+        self.data_format = DataFormat(len(numpy.shape(attr_value.value)))
         return attr_value
     
     def decode_epics_evt(self, evt):
@@ -223,7 +252,7 @@ class EpicsAttribute(TaurusAttribute):
             attr_value.quality = AttrQuality.ATTR_ALARM
         else:
             attr_value.quality = AttrQuality.ATTR_VALID
-        attr_value.config.data_format = len(numpy.shape(attr_value.value))
+        self.data_format = DataFormat(len(numpy.shape(attr_value.value)))
         return attr_value
 
     def write(self, value, with_read=True):
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+##
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.epics.epicsfactory (using a fake epics module)"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import time
+from taurus.external import unittest
+from taurus.core.taurusbasetypes import TaurusEventType, AttrQuality
+import taurus.core.epics.epicsfactory as epicsfactory
+
+
+class _FakePV(object):
+    '''Mimics the API of epics.PV used by EpicsAttribute. Connecting takes
+    `delay` seconds when waited for'''
+
+    delay = 1.
+    instances = []
+
+    def __init__(self, pvname, callback=None, connection_callback=None):
+        self.pvname = pvname
+        self.callback = callback
+        self.connection_callback = connection_callback
+        self.connected = False
+        self.instances.append(self)
+
+    def wait_for_connection(self, timeout=None):
+        time.sleep(self.delay)
+        return self.connected
+
+    def connect(self, value):
+        '''simulates the connection and the first monitor update'''
+        self.connected = True
+        self.connection_callback(pvname=self.pvname, conn=True, pv=self)
+        self.callback(pvname=self.pvname, value=value, severity=0,
+                      timestamp=time.time(), write_access=False)
+
+
+class _FakeEpics(object):
+    PV = _FakePV
+
+
+class _Listener(object):
+
+    def __init__(self):
+        self.events = []
+
+    def eventReceived(self, src, evt_type, evt_value):
+        self.events.append((evt_type, evt_value))
+
+
+class EpicsAttributeTestCase(unittest.TestCase):
+    '''Test case for the connection of EpicsAttribute'''
+
+    def setUp(self):
+        self._epics = getattr(epicsfactory, 'epics', None)
+        epicsfactory.epics = _FakeEpics()
+        _FakePV.instances = []
+
+    def tearDown(self):
+        if self._epics is None:
+            del epicsfactory.epics
+        else:
+            epicsfactory.epics = self._epics
+
+    def _createAttribute(self, name):
+        # the attribute is created without parent device (not needed here)
+        return epicsfactory.EpicsAttribute(name, None)
+
+    def test_nonblocking(self):
+        '''check that the attributes are created without waiting'''
+        t0 = time.time()
+        attrs = [self._createAttribute('epics://taurustest:nonblocking%d' % i)
+                 for i in range(5)]
+        self.assertTrue(time.time() - t0 < _FakePV.delay)
+        self.assertEqual(len(_FakePV.instances), 5)
+        for a in attrs:
+            self.assertFalse(a.isConnected())
+            self.assertEqual(a.read().quality, AttrQuality.ATTR_INVALID)
+
+    def test_first_value(self):
+        '''check that the first value is delivered with a Change event'''
+        a = self._createAttribute('epics://taurustest:firstvalue')
+        listener = _Listener()
+        a.addListener(listener)
+        pv, = _FakePV.instances
+        pv.connect(7)
+        self.assertTrue(a.isConnected())
+        self.assertEqual(len(listener.events), 1)
+        evt_type, evt_value = listener.events[0]
+        self.assertEqual(evt_type, TaurusEventType.Change)
+        self.assertEqual(evt_value.value, 7)
+        self.assertEqual(a.read().value, 7)
+        self.assertEqual(a.read().quality, AttrQuality.ATTR_VALID)
+        pv.connection_callback(pvname=pv.pvname, conn=False, pv=pv)
+        self.assertEqual(len(listener.events), 2)
+        self.assertEqual(a.read().quality, AttrQuality.ATTR_INVALID)
+        a.removeListener(listener)
+
+
+if __name__ == '__main__':
+    unittest.main()
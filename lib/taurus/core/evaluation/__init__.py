@@ -85,6 +85,13 @@ where:
     - The optional `<subst>` segment is used to provide substitution symbols. 
       `<subst>` is a semicolon-separated string of `<key>=<value>` strings.
       
+When a referenced attribute changes, the evaluation attribute is not
+recalculated at once: it is marked as dirty and recalculated by the
+:class:`EvaluationPropagator` in its next propagation tick, so that a burst
+of changes in several references produces only one evaluation (and so that
+evaluation attributes referencing other evaluation attributes are recalculated
+after them). The minimum time between ticks is set with the
+`EVAL_PROPAGATION_INTERVAL` option of :mod:`taurus.tauruscustomsettings`.
 
 Some examples of valid evaluation models are:
 
@@ -129,4 +136,5 @@ Some examples of valid evaluation models are:
 from evalfactory import EvaluationFactory
 from evalattribute import EvaluationAttribute
 from evalauthority import EvaluationAuthority
-from evaldevice import EvaluationDevice 
\ No newline at end of file
+from evaldevice import EvaluationDevice
+from evalpropagator import EvaluationPropagator
@@ -24,7 +24,7 @@
 
 __all__ = ['EvaluationAttribute']
 
-import numpy, re
+import numpy
 import weakref
 
 from taurus.external.pint import Quantity
@@ -35,8 +35,8 @@ from taurus.core.taurusexception import TaurusException
 from taurus.core.taurushelper import Attribute, Manager
 from taurus.core import DataFormat
 from taurus.core.util.log import debug, tep14_deprecation
+from taurus.core.util.safeeval import SafeNamespace
 
-from taurus.core.evaluation.evalvalidator import QUOTED_TEXT_RE, PY_VAR_RE
 
 class EvaluationAttrValue(TaurusAttrValue):
     """Reimplementation of TaurusAttrValue to provide bck-compat via a ref
@@ -172,6 +172,7 @@ class EvaluationAttribute(TaurusAttribute):
         self._label = self.getSimpleName()
         self.writable = False
         self._references = []
+        self._symbols = None
         self._validator = self.getNameValidator()
         self._transformation = None
         self.__subscription_state = SubscriptionState.Unsubscribed
@@ -200,11 +201,26 @@ class EvaluationAttribute(TaurusAttribute):
         '''
         return idFormat%id(obj)
         
+    @staticmethod
+    def getSymbol(index):
+        """returns the name of the symbol used in the transformation for the
+        reference at the given position of the references list
+
+        :param index: (int) position of the reference
+
+        :return: (str)
+        """
+        return '_R%d_' % index
+
     def preProcessTransformation(self, trstring):
         """
         parses the transformation string and creates the necessary symbols for
         the evaluator. It also connects any referenced attributes so that the
         transformation gets re-evaluated if they change.
+
+        The values of the references are kept in a namespace of this
+        attribute (one slot per reference, layered over the whitelist of the
+        evaluator), so the symbols of the evaluator are not modified.
         
         :param trstring: (str) a string to be pre-processed
         
@@ -213,12 +229,11 @@ class EvaluationAttribute(TaurusAttribute):
                  if ok==True, the string is ready to be evaluated
         """
         #disconnect previously referenced attributes and clean the list
-        for ref in self._references:
-            ref.removeListener(self)
-        self._references = []  
-        
+        self._freeReferences()
+
         #get symbols
-        evaluator = self.getParentObj()  
+        evaluator = self.getParentObj()
+        self._symbols = SafeNamespace(evaluator)
 
         #Find references in the string, create references if needed, 
         #connect to them and substitute the references by their id
@@ -227,14 +242,16 @@ class EvaluationAttribute(TaurusAttribute):
             symbol = self.__ref2Id(r)
             trstring = trstring.replace('{%s}' %r, symbol)
 
-        #validate the expression (look for missing symbols) 
-        safesymbols = evaluator.getSafe().keys()        
-        #remove literal text strings from the validation
-        trimmedstring = re.sub(QUOTED_TEXT_RE, '', trstring)
-        for s in set(re.findall(PY_VAR_RE, trimmedstring)):
-            if s not in safesymbols:
-                self.warning('Missing symbol "%s"'%s)
-                return trstring, False
+        #validate the expression (look for missing symbols). The compiled
+        #expression is kept by the evaluator for the following evaluations
+        try:
+            evaluator.compile(trstring, symbols=self._symbols)
+        except NameError, e:
+            self.warning('Missing symbol: %s' % e)
+            return trstring, False
+        except Exception:
+            #other errors (e.g. syntax) are reported when evaluating
+            pass
 
         #If all went ok, enable/disable polling based on whether 
         #there are references or not
@@ -250,21 +267,21 @@ class EvaluationAttribute(TaurusAttribute):
               
     def __ref2Id(self, ref):
         """
-        Returns the id of an
+        Returns the symbol of an
         existing taurus attribute corresponding to the match. 
         The attribute is created if it didn't previously exist.
 
         :param ref: (str)  string corresponding to a reference. e.g. eval:1
         """
         refobj = self.__createReference(ref)
-        return self.getId(refobj)
+        return self.getSymbol(self._references.index(refobj))
         
     def __createReference(self, ref):
         '''
         Receives a taurus attribute name and creates/retrieves a reference to
         the attribute object. If the object was not already referenced, it adds
-        it to the reference list and adds its id and current value to the
-        symbols dictionary of the evaluator.
+        it to the reference list and stores its current value in the
+        corresponding slot of the namespace of this attribute.
         
         :param ref: (str) 
         
@@ -273,13 +290,20 @@ class EvaluationAttribute(TaurusAttribute):
         '''
         refobj = Attribute(ref)
         if refobj not in self._references:
-            evaluator = self.getParentObj()
             v = refobj.read().rvalue
-            # add its rvalue to the evaluator symbols
-            evaluator.addSafe({self.getId(refobj): v})
+            # store its rvalue in the next slot
+            self._symbols[self.getSymbol(len(self._references))] = v
             #add the object to the reference list 
             self._references.append(refobj)             
         return refobj        
+
+    def _freeReferences(self):
+        """disconnects from the referenced attributes and drops them (and
+        their values)"""
+        for ref in self._references:
+            ref.removeListener(self)
+        self._references = []
+        self._symbols = None
     
     def eventReceived(self, evt_src, evt_type, evt_value):
         try:
@@ -288,9 +312,18 @@ class EvaluationAttribute(TaurusAttribute):
             self.trace('Ignoring event from %s'%repr(evt_src))
             return
         #update the corresponding value
-        evaluator = self.getParentObj()
-        evaluator.addSafe({self.getId(evt_src): v})
-        #re-evaluate
+        try:
+            index = self._references.index(evt_src)
+        except ValueError:
+            self.trace('Ignoring event from %s'%repr(evt_src))
+            return
+        self._symbols[self.getSymbol(index)] = v
+        #re-evaluate (once for all the references changed in a burst)
+        self.factory().getPropagator().markDirty(self, evt_type)
+
+    def _propagateChange(self, evt_type):
+        """Called by the :class:`EvaluationPropagator` to recompute the value
+        after any of the referenced attributes changed"""
         self.applyTransformation()
         #notify listeners that the value changed
         if self.isUsingEvents():
@@ -301,7 +334,7 @@ class EvaluationAttribute(TaurusAttribute):
             return
         try:
             evaluator = self.getParentObj()
-            rvalue = evaluator.eval(self._transformation)
+            rvalue = evaluator.eval(self._transformation, self._symbols)
             value_dimension = len(numpy.shape(rvalue))
             value_dformat = DataFormat(value_dimension)
             self.data_format = value_dformat
@@ -385,14 +418,17 @@ class EvaluationAttribute(TaurusAttribute):
         :return: attribute value
         '''
         if not cache:
-            symbols = {}
-            for ref in self._references:
-                symbols[self.getId(ref)] = ref.read(cache=False).rvalue
-            evaluator = self.getParentObj()  
-            evaluator.addSafe(symbols)
+            for i, ref in enumerate(self._references):
+                v = ref.read(cache=False).rvalue
+                self._symbols[self.getSymbol(i)] = v
             self.applyTransformation()
         return self._value    
 
+    def cleanUp(self):
+        self.trace("[EvaluationAttribute] cleanUp")
+        self._freeReferences()
+        TaurusAttribute.cleanUp(self)
+
     def poll(self):
         v = self.read(cache=False)
         self.fireEvent(TaurusEventType.Periodic, v)
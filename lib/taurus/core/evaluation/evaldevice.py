@@ -24,6 +24,8 @@
 
 __all__ = ['EvaluationDevice']
 
+import numpy
+
 from taurus import Factory
 from taurus.core.taurusdevice import TaurusDevice
 from taurus.core.util.safeeval import SafeEvaluator
@@ -42,6 +44,9 @@ class EvaluationDevice(TaurusDevice, SafeEvaluator):
                     :meth:`EvaluationFactory.getDevice`
     '''
     _symbols = []
+    #: alignment policies of :meth:`evalSeries`
+    HOLD = 'hold'
+    INTERPOLATE = 'interpolate'
     # helper class property that stores a reference to the corresponding factory
     _factory = None
     _scheme = 'eval'
@@ -67,6 +72,90 @@ class EvaluationDevice(TaurusDevice, SafeEvaluator):
         full_attrname = "%s;%s"%(self.getFullName(), attrname)
         return self.factory().getAttribute(full_attrname)
     
+    def evalSeries(self, expr, series, policy=HOLD, times=None):
+        """Evaluates an expression over whole time series of values of its
+        references (e.g. for processing archived data). The series are first
+        aligned to common timestamps and then the expression is evaluated
+        only once, with each reference replaced by the array of its aligned
+        values.
+
+        :param expr: (str) an eval attribute name (e.g. ``"eval:{a/b/c/d}*2"``)
+                     or an expression with references (e.g. ``"{a/b/c/d}*2"``).
+                     Substitutions (``"k=2;{a/b/c/d}*k"``) are also accepted
+        :param series: (dict<str,tuple>) maps each reference (as written in
+                       the expression, without the brackets) to a
+                       (times, values) tuple of sequences. The values may be
+                       arrays or Quantities
+        :param policy: (str) how the values are aligned to the common times:
+                       :attr:`HOLD` (the last value before each time is used)
+                       or :attr:`INTERPOLATE` (linear interpolation; only for
+                       series of scalars)
+        :param times: (sequence<float> or None) the times for which the
+                      expression is evaluated. If None, all the times of
+                      the series are used. In both cases, only the times for
+                      which all the references have a value are used
+
+        :return: (tuple<numpy.ndarray, object>) the times and the results of
+                 the evaluation for each of them
+        """
+        validator = self.factory().getAttributeNameValidator()
+        expr = validator.getExpandedExpr(expr) or expr
+        symbols = {}
+        for i, ref in enumerate(validator.getRefs(expr)):
+            if ref not in series:
+                raise KeyError('No series given for reference {%s}' % ref)
+            symbol = '_R%d_' % i
+            expr = expr.replace('{%s}' % ref, symbol)
+            symbols[symbol] = series[ref]
+        times, values = self._alignSeries(symbols, policy, times)
+        code = self.compile(expr, symbols=values)
+        namespace = dict(self.safe_dict)
+        namespace.update(values)
+        return times, eval(code, {"__builtins__": None}, namespace)
+
+    def _alignSeries(self, series, policy, times):
+        """returns the common times and a dict with the values of each series
+        aligned to them"""
+        if policy not in (self.HOLD, self.INTERPOLATE):
+            raise ValueError('Unknown alignment policy "%s"' % policy)
+        sorted_series = {}
+        for key, (t, v) in series.items():
+            t = numpy.asarray(t, dtype=float)
+            if not hasattr(v, 'units'):
+                v = numpy.asarray(v)
+            order = numpy.argsort(t, kind='mergesort')
+            sorted_series[key] = t[order], v[order]
+        if times is None:
+            if sorted_series:
+                times = numpy.unique(numpy.concatenate(
+                                [t for t, _ in sorted_series.values()]))
+            else:
+                times = numpy.array([], dtype=float)
+        times = numpy.asarray(times, dtype=float)
+        # only the times for which all the series have a value are used
+        for t, _ in sorted_series.values():
+            if len(t) == 0:
+                times = times[:0]
+            else:
+                times = times[times >= t[0]]
+                if policy == self.INTERPOLATE:
+                    times = times[times <= t[-1]]
+        values = {}
+        for key, (t, v) in sorted_series.items():
+            if policy == self.HOLD:
+                values[key] = v[numpy.searchsorted(t, times, 'right') - 1]
+            else:
+                units = getattr(v, 'units', None)
+                magnitude = numpy.asarray(getattr(v, 'magnitude', v))
+                if magnitude.ndim != 1:
+                    raise ValueError('Only series of scalars can be '
+                                     'interpolated ({%s})' % key)
+                aligned = numpy.interp(times, t, magnitude)
+                if units is not None:
+                    aligned = type(v)(aligned, units)
+                values[key] = aligned
+        return times, values
+
     def decode(self, event_value):
         if isinstance(event_value, int): # TaurusSWDevState
             new_sw_state = event_value
@@ -30,10 +30,12 @@ __all__ = ['EvaluationFactory']
 
 import weakref
 
+from taurus import tauruscustomsettings
 from taurus.core.taurusbasetypes import TaurusElementType
 from evalattribute import EvaluationAttribute
 from evalauthority import EvaluationAuthority
 from evaldevice import EvaluationDevice 
+from evalpropagator import EvaluationPropagator
 from taurus.core.taurusexception import TaurusException
 from taurus.core.tauruspollingtimer import TaurusPollingTimer
 from taurus.core.util.log import Logger
@@ -66,6 +68,17 @@ class EvaluationFactory(Singleton, TaurusFactory, Logger):
         self.eval_devs = weakref.WeakValueDictionary()
         self.eval_configs = weakref.WeakValueDictionary()
         self.scheme = 'eval'
+        interval = getattr(tauruscustomsettings, 'EVAL_PROPAGATION_INTERVAL',
+                           0)
+        self._propagator = EvaluationPropagator(minInterval=interval)
+
+    def getPropagator(self):
+        """Returns the object which propagates the changes of the referenced
+        attributes to the evaluation attributes
+
+        :return: (EvaluationPropagator)
+        """
+        return self._propagator
         
     def findObjectClass(self, absolute_name):
         """Operation models are always OperationAttributes
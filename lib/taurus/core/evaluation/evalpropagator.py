@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+'''
+Propagation of the changes of the referenced attributes to the evaluation
+attributes. See __init__.py for more detailed documentation
+'''
+
+__all__ = ['EvaluationPropagator']
+
+import time
+import heapq
+import threading
+
+from taurus.core.util.log import Logger
+
+
+class EvaluationPropagator(Logger):
+    '''
+    Recomputes the :class:`EvaluationAttribute` objects whose references
+    changed.
+
+    When an evaluation attribute receives an event from one of its
+    references it is just marked as dirty. The dirty attributes are then
+    recomputed (once, regardless of how many of its references changed) in
+    the next propagation tick. Within a tick, the attributes are recomputed in
+    topological order (i.e. an attribute is recomputed after the evaluation
+    attributes it references), so that the attributes depending on other
+    evaluation attributes are evaluated only once and with consistent values.
+
+    The ticks are run by a worker thread, separated by (at least)
+    `minInterval` seconds. If `minInterval` is None, the propagation is done
+    synchronously (in the thread that delivered the event). The ticks are
+    serialized: an event delivered while another thread is propagating
+    waits for the current tick to end (which may have recomputed the
+    attribute already).
+
+    .. warning:: In most cases this class should not be instantiated directly.
+                 Use :meth:`EvaluationFactory.getPropagator` instead
+    '''
+
+    def __init__(self, minInterval=0):
+        """
+        :param minInterval: (float or None) minimum time (in s) between two
+                            propagation ticks. None for synchronous
+                            propagation
+        """
+        self.call__init__(Logger, self.__class__.__name__)
+        self._minInterval = minInterval
+        self._cond = threading.Condition()
+        self._tickLock = threading.Lock()
+        self._dirty = {}
+        self._thread = None
+        self._lastTick = 0
+        self._local = threading.local()
+
+    def getMinInterval(self):
+        """Returns the minimum time between two propagation ticks
+
+        :return: (float or None) the interval (in s) or None if the
+                 propagation is synchronous
+        """
+        return self._minInterval
+
+    def setMinInterval(self, minInterval):
+        """Sets the minimum time between two propagation ticks
+
+        :param minInterval: (float or None) the interval (in s). None for
+                            synchronous propagation
+        """
+        with self._cond:
+            self._minInterval = minInterval
+            self._cond.notify()
+
+    def markDirty(self, attr, evt_type):
+        """Marks the given attribute to be recomputed in the next tick
+
+        :param attr: (EvaluationAttribute) the attribute
+        :param evt_type: (TaurusEventType) type of the event to be fired
+                         when the attribute is recomputed
+        """
+        with self._cond:
+            self._dirty[attr] = evt_type
+            synchronous = self._minInterval is None
+            if not synchronous:
+                if self._thread is None:
+                    self._thread = threading.Thread(name=self.log_name,
+                                                    target=self._run)
+                    self._thread.daemon = True
+                    self._thread.start()
+                self._cond.notify()
+        # (if we are already propagating in this thread, the attribute
+        # will be recomputed in the current tick)
+        if synchronous and not getattr(self._local, 'propagating', False):
+            self.propagate()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty or self._minInterval is None:
+                    self._cond.wait()
+                wait = self._lastTick + self._minInterval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self._lastTick = time.time()
+            try:
+                self.propagate()
+            except Exception:
+                self.warning("Error propagating changes", exc_info=1)
+
+    @staticmethod
+    def _getLevel(attr, levels, visiting=()):
+        """returns the position of the attribute in the evaluation order: 0 if
+        it does not reference other evaluation attributes or 1 + the maximum
+        of the levels of the evaluation attributes it references"""
+        try:
+            return levels[attr]
+        except KeyError:
+            pass
+        visiting = visiting + (attr,)
+        level = 0
+        for ref in getattr(attr, '_references', ()):
+            if ref in visiting or not hasattr(ref, '_references'):
+                continue
+            level = max(level, EvaluationPropagator._getLevel(
+                ref, levels, visiting) + 1)
+        levels[attr] = level
+        return level
+
+    def propagate(self):
+        """Runs a propagation tick: recomputes all the dirty attributes (and
+        the attributes that get dirty by recomputing them)"""
+        with self._tickLock:
+            self._local.propagating = True
+            try:
+                self._propagate()
+            finally:
+                self._local.propagating = False
+
+    def _propagate(self):
+        levels, heap, pending, done, later = {}, [], {}, set(), {}
+        counter = 0
+        while True:
+            with self._cond:
+                dirty, self._dirty = self._dirty, {}
+            for attr, evt_type in dirty.iteritems():
+                if attr in done:
+                    # it changed again after being recomputed
+                    later[attr] = evt_type
+                    continue
+                if attr not in pending:
+                    counter += 1
+                    level = self._getLevel(attr, levels)
+                    heapq.heappush(heap, (level, counter, attr))
+                pending[attr] = evt_type
+            if not heap:
+                if not later or self._minInterval is not None:
+                    break
+                # synchronous: nobody else will run a tick for the attributes
+                # that changed after being recomputed. Do it now
+                done.clear()
+                with self._cond:
+                    for attr, evt_type in later.iteritems():
+                        self._dirty.setdefault(attr, evt_type)
+                later = {}
+                continue
+            _, _, attr = heapq.heappop(heap)
+            evt_type = pending.pop(attr)
+            done.add(attr)
+            try:
+                attr._propagateChange(evt_type)
+            except Exception:
+                self.warning("Error recomputing %s", attr, exc_info=1)
+        if later:
+            with self._cond:
+                for attr, evt_type in later.iteritems():
+                    self._dirty.setdefault(attr, evt_type)
+                self._cond.notify()
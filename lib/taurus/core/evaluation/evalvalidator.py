@@ -128,11 +128,10 @@ class EvaluationDeviceNameValidator(TaurusDeviceNameValidator):
     query = '(?!)'
     fragment = '(?!)' 
     
-    def getUriGroups(self, name, strict=None):
+    def _parseUriGroups(self, name, strict):
         '''reimplemented from :class:`TaurusDeviceNameValidator` to provide 
         backwards compatibility with ol syntax'''
-        groups = TaurusDeviceNameValidator.getUriGroups(self, name, 
-                                                        strict=strict)
+        groups = TaurusDeviceNameValidator._parseUriGroups(self, name, strict)
         if groups is not None and not groups['__STRICT__']:
             _old_devname = groups['_old_devname']
             groups['devname'] = '@%s' % _old_devname
@@ -152,6 +151,7 @@ class EvaluationDeviceNameValidator(TaurusDeviceNameValidator):
         groups = self.getUriGroups(fullname)
         if groups is None:
             return None      
+        groups = dict(groups)
 
         authority = groups.get('authority')
         if authority is None:
@@ -277,11 +277,11 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
                     return False
         return True
 
-    def getUriGroups(self, name, strict=None):
+    def _parseUriGroups(self, name, strict):
         '''reimplemented from :class:`TaurusAttributeNameValidator` to provide 
         backwards compatibility with old syntax'''
-        groups = TaurusAttributeNameValidator.getUriGroups(self, name, 
-                                                           strict=strict)
+        groups = TaurusAttributeNameValidator._parseUriGroups(self, name,
+                                                              strict)
         if groups is None:
             return None
         
@@ -343,6 +343,7 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
         groups = self.getUriGroups(fullname) 
         if groups is None:
             return None
+        groups = dict(groups)
         
         f_or_fklass = factory or EvaluationFactory
 
@@ -235,6 +235,17 @@ from taurus.core.evaluation.evalattribute import EvaluationAttrValue
             )
 class EvalAttributeTestCase(unittest.TestCase):
 
+    def test_symbols(self):
+        """check that the references are kept in the attribute namespace"""
+        a = taurus.Attribute('eval:{eval:3}*{eval:2}+{eval:3}')
+        self.assertEqual(a.read().rvalue.magnitude, 9)
+        self.assertEqual(len(a._references), 2)
+        self.assertEqual(sorted(a._symbols), ['_R0_', '_R1_'])
+        evaluator = a.getParentObj()
+        self.assertFalse([k for k in evaluator.getSafe() if k.startswith('_')])
+        a.cleanUp()
+        self.assertEqual(a._references, [])
+
     def read_attr(self, attr_fullname, expected={}, expected_attrv={},
                   expectedshape=None):
         """check creation and correct read of an evaluationAttribute"""
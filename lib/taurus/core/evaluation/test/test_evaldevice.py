@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+##
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.evaluation.evaldevice"""
+
+import numpy
+
+import taurus
+from taurus.external import unittest
+from taurus.external.pint import Quantity
+
+
+class EvaluationDeviceSeriesTestCase(unittest.TestCase):
+    """Test case for EvaluationDevice.evalSeries"""
+
+    def setUp(self):
+        self.dev = taurus.Device('eval:@DefaultEvaluator')
+        self.series = {'a/b/c/x': ([0, 1, 2, 3], [1., 2., 3., 4.]),
+                       'a/b/c/y': ([0.5, 2.5], [10., 30.])}
+
+    def test_hold(self):
+        """Check the last-value-hold alignment"""
+        times, values = self.dev.evalSeries('eval:{a/b/c/x}+{a/b/c/y}',
+                                            self.series)
+        numpy.testing.assert_array_equal(times, [0.5, 1, 2, 2.5, 3])
+        numpy.testing.assert_array_equal(values, [11, 12, 13, 33, 34])
+
+    def test_interpolate(self):
+        """Check the interpolation alignment"""
+        times, values = self.dev.evalSeries('{a/b/c/y}*2', self.series,
+                                            policy=self.dev.INTERPOLATE,
+                                            times=[0, 1, 1.5, 2.5, 4])
+        numpy.testing.assert_array_equal(times, [1, 1.5, 2.5])
+        numpy.testing.assert_array_almost_equal(values, [30, 40, 60])
+
+    def test_quantities(self):
+        """Check that the units of the series are kept"""
+        series = {'x': ([0, 1], Quantity([1., 2.], 'm'))}
+        for policy in (self.dev.HOLD, self.dev.INTERPOLATE):
+            times, values = self.dev.evalSeries('sqrt({x}*{x})', series,
+                                                policy=policy)
+            self.assertEqual(values.units, Quantity(1, 'm').units)
+            numpy.testing.assert_array_equal(values.magnitude, [1, 2])
+
+    def test_missing_series(self):
+        """Check that all the references need a series"""
+        self.assertRaises(KeyError, self.dev.evalSeries, '{a/b/c/z}',
+                          self.series)
+
+
+if __name__ == '__main__':
+    unittest.main()
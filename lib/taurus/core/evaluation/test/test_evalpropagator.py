@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+##
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.evaluation.evalpropagator"""
+
+import threading
+
+from taurus.external import unittest
+from taurus.core.evaluation.evalpropagator import EvaluationPropagator
+
+
+class _Node(object):
+    """a fake evaluation attribute: it recomputes (and records it) and then
+    marks its listeners as dirty"""
+
+    def __init__(self, name, propagator, log, references=()):
+        self.name = name
+        self._references = list(references)
+        self._propagator = propagator
+        self._log = log
+        self.listeners = []
+        for r in references:
+            if isinstance(r, _Node):
+                r.listeners.append(self)
+
+    def _propagateChange(self, evt_type):
+        self._log.append(self.name)
+        for l in self.listeners:
+            self._propagator.markDirty(l, evt_type)
+
+
+class EvaluationPropagatorTestCase(unittest.TestCase):
+    """Test case for the EvaluationPropagator"""
+
+    def _diamond(self, propagator):
+        """source -> a, b -> c -> d (c references a and b)"""
+        log = []
+        source = object()
+        a = _Node('a', propagator, log, [source])
+        b = _Node('b', propagator, log, [source])
+        c = _Node('c', propagator, log, [b, a])
+        d = _Node('d', propagator, log, [c])
+        return log, (a, b, c, d)
+
+    def test_synchronous(self):
+        """Check that a burst is recomputed in order and only once"""
+        propagator = EvaluationPropagator(minInterval=None)
+        log, (a, b, c, d) = self._diamond(propagator)
+        # simulate a burst (the events are received while propagating)
+        propagator._local.propagating = True
+        propagator.markDirty(c, 0)
+        propagator.markDirty(b, 0)
+        propagator.markDirty(a, 0)
+        self.assertEqual(log, [])
+        propagator.propagate()
+        self.assertEqual(sorted(log[:2]), ['a', 'b'])
+        self.assertEqual(log[2:], ['c', 'd'])
+        # outside of a propagation, the changes are propagated at once
+        propagator.markDirty(c, 0)
+        self.assertEqual(log[4:], ['c', 'd'])
+
+    def test_synchronous_again(self):
+        """Check that an attribute changing again after being recomputed
+        is recomputed again in the same synchronous tick"""
+        propagator = EvaluationPropagator(minInterval=None)
+        log, (a, b, c, d) = self._diamond(propagator)
+
+        def changeAgain(evt_type):
+            log.append('d')
+            if log.count('d') == 1:
+                propagator.markDirty(c, evt_type)
+        d._propagateChange = changeAgain
+        propagator.markDirty(c, 0)
+        self.assertEqual(log, ['c', 'd', 'c', 'd'])
+
+    def test_synchronous_threads(self):
+        """Check that synchronous propagations from different threads are
+        serialized"""
+        propagator = EvaluationPropagator(minInterval=None)
+        log, (a, b, c, d) = self._diamond(propagator)
+        lock = threading.Lock()
+        active, overlaps = [], []
+
+        def slow(node):
+            def _propagateChange(evt_type):
+                with lock:
+                    active.append(node)
+                    overlaps.append(len(active))
+                threading.Event().wait(0.1)
+                with lock:
+                    active.remove(node)
+                _Node._propagateChange(node, evt_type)
+            node._propagateChange = _propagateChange
+        slow(a)
+        slow(b)
+        threads = [threading.Thread(target=propagator.markDirty,
+                                    args=(node, 0)) for node in (a, b)]
+        threads[0].start()
+        threading.Event().wait(0.05)
+        threads[1].start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(overlaps, [1, 1])
+        self.assertEqual(log, ['a', 'b', 'c', 'd'])
+
+    def test_asynchronous(self):
+        """Check the propagation from the worker thread"""
+        propagator = EvaluationPropagator(minInterval=0.05)
+        log, (a, b, c, d) = self._diamond(propagator)
+        done = threading.Event()
+        d._propagateChange = lambda evt_type: (log.append('d'), done.set())
+        propagator.markDirty(b, 0)
+        propagator.markDirty(a, 0)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(sorted(log[:2]), ['a', 'b'])
+        self.assertEqual(log[2:], ['c', 'd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,7 +26,7 @@
 """This module contains all basic tango enumerations"""
 
 __all__ = ["TangoObjectType", "EVENT_TO_POLLING_EXCEPTIONS",
-           "FROM_TANGO_TO_NUMPY_TYPE", "FROM_TANGO_TO_STR_TYPE", "DevState"]
+           "CONNECTION_EXCEPTIONS", "FROM_TANGO_TO_NUMPY_TYPE", "FROM_TANGO_TO_STR_TYPE", "DevState"]
 
 __docformat__ = "restructuredtext"
 
@@ -68,6 +68,20 @@ EVENT_TO_POLLING_EXCEPTIONS = ('API_AttributePollingNotStarted',
 )
 #                                   'API_BadConfigurationProperty')    
 
+# The exception reasons that mean that a device cannot be reached (as
+# opposed to errors of some of its attributes). Only these errors back off
+# the polling of the device
+CONNECTION_EXCEPTIONS = ('API_CantConnectToDevice',
+                         'API_CantConnectToDatabase',
+                         'API_DeviceNotExported',
+                         'API_DeviceNotDefined',
+                         'API_ServerNotRunning',
+                         'API_CorbaException',
+                         'API_CommunicationFailed',
+                         'API_DeviceTimedOut',
+                         'API_AsynReplyNotArrived',
+)
+
 FROM_TANGO_TO_NUMPY_TYPE = {
    PyTango.DevBoolean : numpy.bool8,
    PyTango.DevUChar : numpy.ubyte,
@@ -30,16 +30,36 @@ These methods have been borrowed from fandango modules.
 """
 
 import re
+import weakref
 import taurus
 
+from array import array
+from bisect import bisect_left
+
 ###############################################################################
 # Utils
 
+# compiled regular expressions (regexp -> pattern object)
+_REGEXP_CACHE = {}
+_REGEXP_CACHE_SIZE = 1000
+
+def compile_regexp(regexp):
+    """Returns the compiled pattern of the given regular expression. The
+    patterns are cached, so that filtering many names with the same
+    expressions (e.g. while typing a filter) does not compile them again"""
+    try:
+        return _REGEXP_CACHE[regexp]
+    except KeyError:
+        if len(_REGEXP_CACHE) >= _REGEXP_CACHE_SIZE:
+            _REGEXP_CACHE.clear()
+        pattern = _REGEXP_CACHE[regexp] = re.compile(regexp)
+        return pattern
+
 def searchCl(regexp,target): 
-    return re.search(extend_regexp(regexp).lower(),target.lower())
+    return compile_regexp(extend_regexp(regexp).lower()).search(target.lower())
 
 def matchCl(regexp,target): 
-    return re.match(extend_regexp(regexp).lower(),target.lower())
+    return compile_regexp(extend_regexp(regexp).lower()).match(target.lower())
 
 def is_regexp(s):
     return any(c in s for c in '.*[]()+?')
@@ -82,12 +102,198 @@ def split_model_list(modelNames):
         modelNames = [str(s) for s in modelNames]
     return modelNames 
     
+###############################################################################
+# Search index
+
+_REGEXP_META = '.^$*+?{}[]\\|()'
+
+def _literal_prefix(regexp):
+    """returns the literal text that any string matched (re.match) by the
+    given regular expression must start with"""
+    if '|' in regexp:
+        return ''
+    if regexp.startswith('^'):
+        regexp = regexp[1:]
+    for i, c in enumerate(regexp):
+        if c in _REGEXP_META:
+            # a quantifier makes the previous character optional
+            if c in '*?{':
+                i -= 1
+            return regexp[:max(i, 0)]
+    return regexp
+
+def _next_prefix(prefix):
+    """returns the smallest string greater than all the strings starting
+    with the given prefix"""
+    last = ord(prefix[-1]) + 1
+    return prefix[:-1] + (chr(last) if isinstance(prefix, str) else unichr(last))
+
+
+class TangoSearchIndex(object):
+    """An in-memory index of names (e.g. the device names of a Tango
+    database) for case insensitive searches with the expressions used by
+    :func:`get_matching_devices`: exact names, wildcards
+    (``sys/tg_test/*``, ``*/tg_test/*``) and regular expressions.
+
+    The names are kept sorted, so that expressions with a literal prefix only
+    check the names in the range of that prefix. Tango-style wildcards with
+    a literal family or member use indexes of the name parts.
+    """
+
+    def __init__(self, names):
+        """
+        :param names: (sequence<str>) the names to index
+        """
+        self._names = sorted(names, key=lambda name: name.lower())
+        self._keys = [name.lower() for name in self._names]
+        # built on demand (see _getPartIndexes)
+        self._parts = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def names(self):
+        """Returns the indexed names (sorted case insensitively)
+
+        :return: (sequence<str>)
+        """
+        return self._names
+
+    def get(self, name):
+        """Returns the indexed name equal (ignoring case) to the given name
+
+        :param name: (str) a name
+
+        :return: (str or None) the indexed name or None if it is not indexed
+        """
+        key, keys = name.lower(), self._keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return self._names[i]
+        return None
+
+    def _range(self, prefix):
+        """returns the positions of the keys starting with the prefix"""
+        keys = self._keys
+        if not prefix:
+            return xrange(len(keys))
+        start = bisect_left(keys, prefix)
+        return xrange(start, bisect_left(keys, _next_prefix(prefix), start))
+
+    def _getPartIndexes(self):
+        """returns the indexes of the families and members of the names
+        ({lower case part: array of positions}) and the positions of the
+        names which do not have 3 parts"""
+        if self._parts is None:
+            families, members, others = {}, {}, array('i')
+            for i, key in enumerate(self._keys):
+                parts = key.split('/')
+                if len(parts) != 3:
+                    others.append(i)
+                    continue
+                for index, part in ((families, parts[1]), (members, parts[2])):
+                    positions = index.get(part)
+                    if positions is None:
+                        positions = index[part] = array('i')
+                    positions.append(i)
+            self._parts = families, members, others
+        return self._parts
+
+    def _candidates(self, regexp):
+        """returns the positions of the keys which may match the given
+        (lower case) regular expression, or None if the part indexes cannot
+        reduce them (they are only used for Tango-style wildcards such as
+        ``^.*/tg_test/.*$``)"""
+        anchored = regexp.endswith('$')
+        wildcard = regexp[regexp.startswith('^'):len(regexp) - anchored]
+        wildcard = wildcard.replace('.*', '*')
+        if '*' not in wildcard or wildcard.count('/') != 2:
+            return None
+        if any(c in wildcard for c in _REGEXP_META.replace('*', '')):
+            return None
+        parts = wildcard.split('/')
+        families, members, others = self._getPartIndexes()
+        candidates = None
+        # without '$' the member is only matched from its beginning
+        for index, part in ((families, parts[1]), (members, parts[2])):
+            if '*' in part or (index is members and not anchored):
+                continue
+            positions = index.get(part, ())
+            if candidates is None:
+                candidates = positions
+            else:
+                positions = set(positions)
+                candidates = [i for i in candidates if i in positions]
+        if candidates is None or not others:
+            return candidates
+        return sorted(list(candidates) + list(others))
+
+    def search(self, regexp):
+        """Returns the names matched (from their beginning, ignoring case) by
+        the given regular expression
+
+        :param regexp: (str) a regular expression
+
+        :return: (sequence<str>) the matching names (sorted)
+        """
+        regexp = regexp.lower()
+        return self._filter(regexp, self._range(_literal_prefix(regexp)))
+
+    def find(self, expression):
+        """Returns the names matching the given expression, which may be a
+        name, a wildcard or a regular expression, i.e. the names for which
+        :func:`matchCl` (expression, name) is true
+
+        :param expression: (str) the expression
+
+        :return: (sequence<str>) the matching names (sorted)
+        """
+        regexp = extend_regexp(expression).lower()
+        candidates = self._candidates(regexp)
+        if candidates is None:
+            candidates = self._range(_literal_prefix(regexp))
+        return self._filter(regexp, candidates)
+
+    def _filter(self, regexp, positions):
+        match = compile_regexp(regexp).match
+        keys, names = self._keys, self._names
+        return [names[i] for i in positions if match(keys[i])]
+
+
+# device cache -> {exported: (device names, TangoSearchIndex)}
+_DEVICE_INDEXES = weakref.WeakKeyDictionary()
+
+def get_device_index(exported=False, db=None):
+    """Returns a :class:`TangoSearchIndex` of the device names of the given
+    Tango authority. The index is shared and only rebuilt when the device
+    names of the authority cache change
+
+    :param exported: (bool) if True only the exported devices are indexed
+    :param db: (TangoAuthority) the authority (default authority if None)
+
+    :return: (TangoSearchIndex)
+    """
+    if db is None:
+        db = taurus.Authority()
+    cache = db.cache()
+    if exported:
+        names = cache.getExportedDeviceNames()
+    else:
+        names = cache.getDeviceNames()
+    indexes = _DEVICE_INDEXES.get(cache)
+    if indexes is None:
+        indexes = _DEVICE_INDEXES[cache] = {}
+    source, index = indexes.get(exported, (None, None))
+    if source is not names:
+        index = TangoSearchIndex(names)
+        indexes[exported] = names, index
+    return index
+
 def get_matching_devices(expressions,limit=0,exported=False):
     """ 
     Searches for devices matching expressions, if exported is True only running devices are returned 
     """
-    db = taurus.Authority()
-    all_devs = [s.lower() for s in db.get_device_name('*','*')]
+    index = get_device_index(exported)
     #This code is used to get data from multiples hosts
     #if any(not fun.matchCl(rehost,expr) for expr in expressions): all_devs.extend(get_all_devices(exported))
     #for expr in expressions:
@@ -97,9 +303,14 @@ def get_matching_devices(expressions,limit=0,exported=False):
             #print 'get_matching_devices(%s): getting %s devices ...'%(expr,host)
             #odb = PyTango.Database(*host.split(':'))
             #all_devs.extend('%s/%s'%(host,d) for d in odb.get_device_name('*','*'))
-    result = [e for e in expressions if e.lower() in all_devs]
-    expressions = [extend_regexp(e) for e in expressions if e not in result]
-    result.extend(filter(lambda d: any(matchCl(extend_regexp(e),d) for e in expressions),all_devs))
+    result = [e for e in expressions if index.get(e) is not None]
+    matches = set()
+    for e in expressions:
+        if e not in result:
+            matches.update(d.lower() for d in index.find(extend_regexp(e)))
+    result.extend(sorted(matches))
+    if limit:
+        result = result[:limit]
     return result
 
 def get_device_for_alias(alias):
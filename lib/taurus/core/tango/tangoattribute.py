@@ -61,9 +61,55 @@ from .util.tango_taurus import (description_from_tango,
                                 str_2_obj, data_format_from_tango,
                                 data_type_from_tango)
 
+# caches of the decoded PyTango enumeration values (see TangoAttrValue)
+_QUALITY_CACHE = {}
+_DEVSTATE_CACHE = {}
+
+
+def _quality_from_tango(quality):
+    try:
+        return _QUALITY_CACHE[quality]
+    except KeyError:
+        ret = _QUALITY_CACHE[quality] = quality_from_tango(quality)
+        return ret
+
+
+def _devstate_from_tango(state):
+    try:
+        return _DEVSTATE_CACHE[state]
+    except KeyError:
+        ret = _DEVSTATE_CACHE[state] = DevState[str(state)]
+        return ret
+
+
+class _LazyField(object):
+    """Decorator turning a method of TangoAttrValue into a member which is
+    decoded on first access. The result is stored in the instance, which
+    then shadows this (non-data) descriptor: later reads and writes are
+    plain attribute accesses"""
+
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.name = decoder.__name__
+        self.__doc__ = decoder.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.decoder(obj)
+        return value
+
+
 class TangoAttrValue(TaurusAttrValue):
     '''A TaurusAttrValue specialization to decode PyTango.DeviceAttribute
-    objects'''
+    objects.
+
+    The PyTango.DeviceAttribute is kept and its members (rvalue, wvalue,
+    time, quality and error) are decoded only when first accessed, so
+    values which are never read (e.g. events for hidden widgets) are
+    cheap.'''
+
+    _lazy_members = ('rvalue', 'wvalue', 'time', 'quality', 'error')
 
     def __init__(self, attr=None, pytango_dev_attr=None, config=None):
         # config parameter is kept for backwards compatibility only
@@ -86,39 +132,68 @@ class TangoAttrValue(TaurusAttrValue):
         if self._attrRef is None:
             return
 
-        numerical = PyTango.is_numerical_type(self._attrRef._tango_data_type,
-                                              inc_array=True)
+        # drop the defaults so that the members get decoded on first access
+        d = self.__dict__
+        for name in self._lazy_members:
+            del d[name]
+        # the numerical check and the units (cached by the attribute) are
+        # taken now, so that the value decodes as configured when received
+        self._numerical = attr._is_numerical
+        self._units_container = attr._units_container
+
+    def _quantity(self, value):
+        if value is not None and self._numerical:
+            # passing the units container skips the units parsing and the
+            # magnitude (e.g. a numpy array) is referenced, not copied
+            return Quantity(value, self._units_container)
+        return value
+
+    @_LazyField
+    def error(self):
+        p = self._pytango_dev_attr
         if p.has_failed:
-            self.error = PyTango.DevFailed(*p.get_err_stack())
-        else:
-            if p.is_empty: # spectra and images can be empty without failing
-                dtype = FROM_TANGO_TO_NUMPY_TYPE.get(self._attrRef._tango_data_type)
-                if self._attrRef.data_format == DataFormat._1D:
-                    shape = (0,)
-                elif self._attrRef.data_format == DataFormat._2D:
-                    shape = (0, 0)
-                p.value = numpy.empty(shape, dtype=dtype)
-                if not (numerical or self._attrRef.type==DataType.Boolean):
-                    # generate a nested empty list of given shape
-                    p.value = []
-                    for _ in xrange(len(shape)-1):
-                        p.value = [p.value]
-
-        rvalue = p.value
-        wvalue = p.w_value
-        units = self._attrRef._units
-        if numerical:
-            if rvalue is not None:
-                rvalue = Quantity(rvalue, units=units)
-            if wvalue is not None:
-                wvalue = Quantity(wvalue, units=units)
-        if isinstance(rvalue, PyTango._PyTango.DevState):
-            rvalue = DevState[str(rvalue)]
-
-        self.rvalue = rvalue
-        self.wvalue = wvalue
-        self.time = p.time #TODO: decode this into a TaurusTimeVal
-        self.quality = quality_from_tango(p.quality)
+            return PyTango.DevFailed(*p.get_err_stack())
+        return None
+
+    @_LazyField
+    def rvalue(self):
+        p = self._pytango_dev_attr
+        value = p.value
+        if p.is_empty and not p.has_failed:
+            # spectra and images can be empty without failing
+            attr = self._attrRef
+            dtype = FROM_TANGO_TO_NUMPY_TYPE.get(attr._tango_data_type)
+            if attr.data_format == DataFormat._1D:
+                shape = (0,)
+            elif attr.data_format == DataFormat._2D:
+                shape = (0, 0)
+            value = numpy.empty(shape, dtype=dtype)
+            if not (self._numerical or attr.type==DataType.Boolean):
+                # generate a nested empty list of given shape
+                value = []
+                for _ in xrange(len(shape)-1):
+                    value = [value]
+        if isinstance(value, PyTango._PyTango.DevState):
+            return _devstate_from_tango(value)
+        return self._quantity(value)
+
+    @_LazyField
+    def wvalue(self):
+        return self._quantity(self._pytango_dev_attr.w_value)
+
+    @_LazyField
+    def time(self):
+        return self._pytango_dev_attr.time #TODO: decode this into a TaurusTimeVal
+
+    @_LazyField
+    def quality(self):
+        return _quality_from_tango(self._pytango_dev_attr.quality)
+
+    def __repr__(self):
+        # decode the pending members so that they are represented
+        for name in self._lazy_members:
+            getattr(self, name)
+        return TaurusAttrValue.__repr__(self)
 
     def __getattr__(self, name):
         try:
@@ -234,7 +309,32 @@ class TangoAttribute(TaurusAttribute):
     _scheme = 'tango'
     _description = 'A Tango Attribute'
 
+    # maximum time (s) to wait for a configuration which is being fetched
+    # asynchronously before encoding a value with the default configuration
+    ConfigTimeout = 3
+
     def __init__(self, name, parent, **kwargs):
+        """
+        :param name: (str) the attribute full name
+        :param parent: (TangoDevice) the device of the attribute
+        :param asyncConfig: (bool or None) if True, the configuration is
+                            queried (and its events subscribed) in a separate
+                            thread and a Config event is fired when done.
+                            Meanwhile the attribute has a default
+                            configuration. If None (default), the factory
+                            decides (see
+                            :meth:`TangoFactory.isAsyncAttributeConfig`)
+        :param attrInfo: (PyTango.AttributeInfoEx or None) the configuration
+                         of the attribute, if already known (e.g. when
+                         created in bulk by :meth:`TangoFactory.getAttributes`)
+        """
+        async_config = kwargs.pop('asyncConfig', None)
+        if async_config is None:
+            async_config = self.factory().isAsyncAttributeConfig()
+        attr_info = kwargs.pop('attrInfo', None)
+
+        # set once the configuration has been fetched
+        self.__config_ready = threading.Event()
 
         # the last attribute value
         self.__attr_value = None
@@ -256,8 +356,9 @@ class TangoAttribute(TaurusAttribute):
 
         self._events_working = False
 
-        attr_info = None
-        if parent:
+        if attr_info is not None:
+            async_config = False
+        elif parent and not async_config:
             attr_name = self.getSimpleName()
             try:
                 attr_info = parent.attribute_query(attr_name)
@@ -277,7 +378,11 @@ class TangoAttribute(TaurusAttribute):
 
         # subscribe to configuration events (unsubscription done at cleanup)
         self.__cfg_evt_id = None
-        self._subscribeConfEvents()
+        if async_config:
+            Manager().addJob(self._fetchConfig)
+        else:
+            self._subscribeConfEvents()
+            self.__config_ready.set()
 
     def cleanUp(self):
         self.trace("[TangoAttribute] cleanUp")
@@ -334,6 +439,8 @@ class TangoAttribute(TaurusAttribute):
         Raises `pint.DimensionalityError` if value is a Quantity and it
         cannot be expressed in the units of the attribute set in the DB
         """
+        if not self.__config_ready.is_set():
+            self.waitConfig(self.ConfigTimeout)
         if isinstance(value, Quantity):
             # convert to units of the attr in the DB (or raise an exception)
             magnitude = value.to(self._units).magnitude
@@ -609,6 +716,66 @@ class TangoAttribute(TaurusAttribute):
         self._deactivatePolling()
         self.__subscription_state = SubscriptionState.Unsubscribed
 
+    def isConfigReady(self):
+        """Tells if the configuration has been fetched. It is always True
+        unless the attribute was created with asyncConfig=True and the
+        configuration is still being fetched
+
+        :return: (bool)
+        """
+        return self.__config_ready.is_set()
+
+    def waitConfig(self, timeout=None):
+        """Waits until the configuration has been fetched
+
+        :param timeout: (float or None) maximum time to wait (in seconds).
+                        None means wait forever
+
+        :return: (bool) True if the configuration is ready, False if the
+                 timeout expired
+        """
+        self.__config_ready.wait(timeout)
+        return self.__config_ready.is_set()
+
+    def _fetchConfig(self):
+        """Queries the configuration and subscribes to the configuration
+        events of an attribute created with asyncConfig=True. Runs in a
+        separate thread and fires a Config event when done (or an Error
+        event if the configuration or the value cannot be obtained)"""
+        if self._listeners is None:
+            # cleaned up before the configuration could be fetched
+            self.__config_ready.set()
+            return
+        error = None
+        try:
+            parent = self.getParentObj()
+            if parent is not None:
+                try:
+                    attr_info = parent.attribute_query(self.getSimpleName())
+                    self._decodeAttrInfoEx(attr_info)
+                except (AttributeError, PyTango.DevFailed), e:
+                    # if PyTango could not connect to the dev
+                    self.debug("Error getting attribute configuration")
+                    error = e
+            self._subscribeConfEvents()
+        finally:
+            self.__config_ready.set()
+        # if subscribed, the first configuration event has already been
+        # sent to the listeners
+        if self.__cfg_evt_id is not None:
+            return
+        value = self.__attr_value
+        if error is None and value is None:
+            # make sure that there is a value (as in push_event)
+            try:
+                value = self.read(cache=False)
+            except Exception, e:
+                error = e
+        if error is None:
+            self.fireEvent(TaurusEventType.Config, value)
+        else:
+            self.fireEvent(TaurusEventType.Error, error)
+
     def _subscribeConfEvents(self):
         """ Enable subscription to the attribute configuration events."""
         self.trace("Subscribing to configuration events...")
@@ -681,14 +848,12 @@ class TangoAttribute(TaurusAttribute):
                 self.__subscription_event.set()
                 if not self.isPollingForced():
                     self._deactivatePolling()
-            # notify the listeners
-            listeners = tuple(self._listeners)
+            # notify the listeners (in concurrent mode, only the latest
+            # pending event of each type is kept by the manager)
             if sm == TaurusSerializationMode.Concurrent:
-                manager.addJob(self.fireEvent, None, event_type,
-                               self.__attr_value, listeners=listeners)
+                manager.dispatchEvent(self, event_type, self.__attr_value)
             else:
-                self.fireEvent(event_type, self.__attr_value,
-                               listeners=listeners)
+                self.fireEvent(event_type, self.__attr_value)
         elif event.errors[0].reason in EVENT_TO_POLLING_EXCEPTIONS:
             if self.isPollingActive():
                 return
@@ -700,13 +865,11 @@ class TangoAttribute(TaurusAttribute):
             self.__subscription_state = SubscriptionState.Subscribed
             self.__subscription_event.set()
             self._deactivatePolling()
-            listeners = tuple(self._listeners)
             if sm == TaurusSerializationMode.Concurrent:
-                manager.addJob(self.fireEvent, None, TaurusEventType.Error,
-                               self.__attr_err, listeners=listeners)
+                manager.dispatchEvent(self, TaurusEventType.Error,
+                                      self.__attr_err)
             else:
-                self.fireEvent(TaurusEventType.Error, self.__attr_err,
-                               listeners=listeners)
+                self.fireEvent(TaurusEventType.Error, self.__attr_err)
 
     def isWrite(self, cache=True):
         return self.getTangoWritable(cache) == PyTango.AttrWriteType.WRITE
@@ -858,6 +1021,10 @@ class TangoAttribute(TaurusAttribute):
             # TangoAttrValue for performance reasons. Do not rely on it in other
             # code
             self._units = units
+        # cached for TangoAttrValue, which decodes every read value with them
+        self._is_numerical = PyTango.is_numerical_type(self._tango_data_type,
+                                                       inc_array=True)
+        self._units_container = self._units._units
 
     @property
     def _tango_data_type(self):
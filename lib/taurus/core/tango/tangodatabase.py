@@ -32,19 +32,46 @@ __all__ = ["TangoInfo", "TangoAttrInfo", "TangoDevInfo", "TangoServInfo",
 __docformat__ = "restructuredtext"
 
 import os
+import re
+import time
+import zlib
+import json
 import operator
+import functools
 import weakref
+import threading
+
+from array import array
+from bisect import bisect_left
+from collections import Mapping
+
+from Queue import Queue
 
 from PyTango import (Database, DeviceProxy, DevFailed, ApiUtil)
 
+from taurus import tauruscustomsettings
 from taurus.core.taurusbasetypes import TaurusDevState, TaurusEventType
 from taurus.core.taurusauthority import TaurusAuthority
 from taurus.core.util.containers import CaselessDict
-from taurus.core.util.log import tep14_deprecation
+from taurus.core.util.log import tep14_deprecation, debug
+from taurus.core.util.threadpool import ThreadPool, Worker
 
 
 InvalidAlias = "nada"
 
+
+def _synchronized(method):
+    """decorator of the methods which access the containers of a
+    :class:`TangoDatabaseCache` (they may be patched by another thread).
+    The lock is not reentrant: the private methods which are called from
+    the decorated ones expect the lock to be held by the caller"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TangoInfo(object):
     def __init__(self, container, name=None, full_name=None):
         self._container = weakref.ref(container)
@@ -86,19 +113,27 @@ class TangoDevClassInfo(TangoInfo):
     def __init__(self, container, name=None, full_name=None):
         super(TangoDevClassInfo, self).__init__(container, name=name, 
                                                 full_name=full_name)
-        
-        self._devices = CaselessDict()
+        # rows of the devices in the container
+        self._devices = array('i')
 
     def devices(self):
-        return self._devices
+        return self.container()._getDevInfoMap(self._devices)
     
-    def addDevice(self, dev):
-        self._devices[dev.name()] = dev
+    def _addRow(self, row):
+        self._devices.append(row)
+        self.__dict__.pop('_device_name_list', None)
+
+    def _removeRow(self, row):
+        self._devices.remove(row)
+        self.__dict__.pop('_device_name_list', None)
           
     def getDeviceNames(self):
         if not hasattr(self, "_device_name_list"):
-            self._device_name_list = sorted(map(TangoDevInfo.name, 
-                                                self._devices.values()))
+            container = self.container()
+            with container._lock:
+                names = container._names
+                self._device_name_list = sorted(names[row] for row in
+                                                self._devices)
         return self._device_name_list
 
 
@@ -117,6 +152,7 @@ class TangoDevInfo(TangoInfo):
         self._domain, self._family, self._member = map(str.upper, 
                                                        name.split("/", 2))
         self._attributes = None
+        self._attributes_time = 0
         self._alivePending = False
 
     def domain(self):
@@ -171,9 +207,20 @@ class TangoDevInfo(TangoInfo):
         return self._host
     
     def attributes(self):
-        if self._attributes is None or len(self._attributes) == 0:
+        if not self.attributesCached():
             self.refreshAttributes()
         return self._attributes
+
+    def attributesCached(self):
+        """Returns True if the attribute list of the device is known and
+        has not expired (see :meth:`TangoDatabaseCache.getAttributesTTL`)
+
+        :return: (bool)
+        """
+        if not self._attributes:
+            return False
+        ttl = self.container().getAttributesTTL()
+        return ttl is None or time.time() - self._attributes_time < ttl
     
     def getAttribute(self, attrname):
         attrname= attrname.lower()
@@ -184,6 +231,7 @@ class TangoDevInfo(TangoInfo):
     
     def setAttributes(self, attributes):
         self._attributes = attributes
+        self._attributes_time = time.time()
 
     @tep14_deprecation(alt="getDeviceProxy()")
     def getHWObj(self):
@@ -201,53 +249,49 @@ class TangoDevInfo(TangoInfo):
         return dev
     
     def refreshAttributes(self):
-        attrs = []
-        try:
-            dev = self.getDeviceProxy()
-            if dev is None:
-                raise DevFailed() # @todo: check if this is the right exception to throw
-            attr_info_list = dev.attribute_list_query_ex()
-            for attr_info in attr_info_list:
-                full_name = "%s/%s" % (self.fullName(), attr_info.name)
-                attr_obj = TangoAttrInfo(self.container(), 
-                    name=attr_info.name.lower(), full_name=full_name.lower(),
-                    device=self, info=attr_info)
-                attrs.append(attr_obj)
-            attrs = sorted(attrs, key=lambda attr : attr.name())
-        except DevFailed as df:
-            self._state = TaurusDevState.NotReady
-        self.setAttributes(attrs)
+        self.container().refreshAttributes(self)
 
 
 class TangoServInfo(TangoInfo):
     def __init__(self, container, name=None, full_name=None):
         super(TangoServInfo, self).__init__(container, name=name, 
                                             full_name=full_name)
-        self._devices = {}
-        self._exported = False
+        # rows of the devices in the container
+        self._devices = array('i')
         self._alive = None
-        self._host = ""
         self._server_name, self._server_instance = name.split("/", 1)
         self._alivePending = False
         
     def devices(self):
-        return self._devices
+        return self.container()._getDevInfoMap(self._devices)
 
     def getDeviceNames(self):
         if not hasattr(self, "_device_name_list"):
-            self._device_name_list = sorted(map(TangoDevInfo.name, 
-                                                self._devices.values()))
+            container = self.container()
+            with container._lock:
+                names = container._names
+                self._device_name_list = sorted(names[row] for row in
+                                                self._devices)
         return self._device_name_list
 
     def getClassNames(self):
         if not hasattr(self, "_klass_name_list"):
-            klasses = set(map(TangoDevInfo.klass, self._devices.values()))
-            self._klass_name_list = sorted(map(TangoDevClassInfo.name, 
-                                               klasses))
+            container = self.container()
+            with container._lock:
+                klasses = set(container._klass_col[row]
+                              for row in self._devices)
+                self._klass_name_list = sorted(
+                    container._klass_list[k].name() for k in klasses)
         return self._klass_name_list
 
     def exported(self):
-        return self._exported
+        container = self.container()
+        with container._lock:
+            exported = container._exported_col
+            for row in self._devices:
+                if exported[row]:
+                    return True
+        return False
 
     def state(self):
         exported = self.exported()
@@ -256,7 +300,13 @@ class TangoServInfo(TangoInfo):
         return TaurusDevState.NotReady
     
     def host(self):
-        return self._host
+        if not self._devices:
+            return ""
+        # the host of the most recently registered device
+        container = self.container()
+        with container._lock:
+            row = max(self._devices)
+            return container._hosts[container._host_col[row]]
     
     def serverName(self):
         return self._server_name
@@ -264,10 +314,15 @@ class TangoServInfo(TangoInfo):
     def serverInstance(self):
         return self._server_instance
     
-    def addDevice(self, dev):
-        self._exported |= dev.exported()
-        self._host = dev.host()
-        self._devices[dev.name()] = dev
+    def _addRow(self, row):
+        self._devices.append(row)
+        self.__dict__.pop('_device_name_list', None)
+        self.__dict__.pop('_klass_name_list', None)
+
+    def _removeRow(self, row):
+        self._devices.remove(row)
+        self.__dict__.pop('_device_name_list', None)
+        self.__dict__.pop('_klass_name_list', None)
         
     def alive(self):
         if self._alive is None:
@@ -288,96 +343,660 @@ class TangoServInfo(TangoInfo):
         return self._alive
 
 
+class _DevInfoMap(Mapping):
+    """A read-only, case insensitive mapping of device names (or aliases) to
+    :class:`TangoDevInfo`. The TangoDevInfo objects are created by the
+    :class:`TangoDatabaseCache` when they are first accessed"""
+
+    def __init__(self, cache, index, keys):
+        self._cache = cache
+        self._index = index # lower case key -> row
+        self._keys = keys # row -> key
+
+    def __getitem__(self, key):
+        with self._cache._lock:
+            try:
+                row = self._index[key.lower()]
+            except (KeyError, AttributeError):
+                raise KeyError(key)
+            info = self._cache._getDevInfo(row)
+        if info is None: # the device was removed
+            raise KeyError(key)
+        return info
+
+    def __contains__(self, key):
+        try:
+            return key.lower() in self._index
+        except AttributeError:
+            return False
+
+    def __iter__(self):
+        with self._cache._lock:
+            keys = self._keys
+            names = [keys[row] for row in self._index.itervalues()]
+        # skip the devices removed since the mapping was created
+        return (name for name in names if name is not None)
+
+    def items(self):
+        """returns the (key, TangoDevInfo) pairs (consistently, even if the
+        cache is patched meanwhile)"""
+        cache = self._cache
+        with cache._lock:
+            keys, items = self._keys, []
+            for row in self._index.itervalues():
+                info = cache._getDevInfo(row)
+                if info is not None:
+                    items.append((keys[row], info))
+        return items
+
+    def values(self):
+        return [info for _, info in self.items()]
+
+    def iteritems(self):
+        return iter(self.items())
+
+    def itervalues(self):
+        return iter(self.values())
+
+    def __len__(self):
+        return len(self._index)
+
+
+class _LiveDevInfoMap(_DevInfoMap):
+    """A :class:`_DevInfoMap` of all the devices (or aliases) of the
+    :class:`TangoDatabaseCache`, which follows its changes"""
+
+    def __init__(self, cache, index_name, keys_name):
+        self._cache = cache
+        self._index_name, self._keys_name = index_name, keys_name
+
+    @property
+    def _index(self):
+        return getattr(self._cache, self._index_name)
+
+    @property
+    def _keys(self):
+        return getattr(self._cache, self._keys_name)
+
+
+def _next_prefix(prefix):
+    """returns the smallest string greater than all the strings starting
+    with the given prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _snapshotStr(value):
+    """returns the str of a string loaded from a snapshot file. Raises
+    ValueError if it is not a string"""
+    if not isinstance(value, basestring):
+        raise ValueError("Unexpected value in snapshot: %r" % (value,))
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+    return value
+
+
+def _snapshotRow(row):
+    """returns the (normalized) DevicesQuery row of a row loaded from a
+    snapshot file. Raises ValueError if it is not a valid row"""
+    if not isinstance(row, list) or len(row) != 6:
+        raise ValueError("Unexpected row in snapshot: %r" % (row,))
+    name, alias, exported, host, server, klass = row
+    if exported not in (0, 1):
+        raise ValueError("Unexpected row in snapshot: %r" % (row,))
+    return (_snapshotStr(name), _snapshotStr(alias), exported,
+            _snapshotStr(host), _snapshotStr(server), _snapshotStr(klass))
+
+
 class TangoDatabaseCache(object):
+    """Cache of the device table of a Tango database.
+
+    The devices are stored in columns (one row per device): the names, and
+    integer indexes to the tables of servers, classes and hosts plus the
+    exported flags. The :class:`TangoDevInfo` objects are only created
+    when a device is accessed (e.g. with :meth:`getDevice`)"""
+
+    # query of the device table (the information of all the devices)
+    DevicesQuery = "SELECT name, alias, exported, host, server, class FROM device"
+
+    # a cheap query whose result changes whenever the result of DevicesQuery
+    # changes (only a checksum is transferred)
+    StampQuery = ("SELECT COUNT(*), SUM(CRC32(CONCAT_WS('|', name, alias, "
+                  "exported, host, server, class))) FROM device")
+
+    # version of the format of the snapshot files (zlib compressed json)
+    SnapshotVersion = 2
+
+    # time (in seconds) during which the attribute lists of the devices are
+    # cached (overridden by the TANGO_ATTR_LIST_TTL setting)
+    DefaultAttributesTTL = 300
+
+    # number of threads used to refresh the attributes of several devices
+    AttributesPoolSize = 10
+
+    # timeout (in seconds) of each device when the attributes of several
+    # devices are refreshed
+    AttributesTimeout = 3
     
     def __init__(self, db):
         self._db = weakref.ref(db)
-        self._device_tree = None
-        self._server_tree = None
-        self._servers = None
+        # the containers may be patched by the snapshot check thread while
+        # they are read (see _synchronized)
+        self._lock = threading.Lock()
         self._server_name_list = None
-        self._devices = None
         self._device_name_list = None
-        self._klasses = None
+        self._exported_name_list = None
         self._klass_name_list = None
-        self._aliases = None
         self._alias_name_list = None
-        self.refresh()
+        self._reset()
+        self._stamp = None
+        self._attributes_ttl = getattr(tauruscustomsettings,
+                                       'TANGO_ATTR_LIST_TTL',
+                                       self.DefaultAttributesTTL)
+        self._attributes_pool = None
+        self._attributes_inflight = {}
+        self._attributes_lock = threading.Lock()
+        # if a snapshot is available, use it and validate it in background
+        if self.loadSnapshot():
+            t = threading.Thread(name="TangoDatabaseSnapshotCheck",
+                                 target=self.checkSnapshot)
+            t.daemon = True
+            t.start()
+        else:
+            self.refresh()
     
     @property
     def db(self):
         return self._db()
 
-    def refresh(self):
-        db = self.db
-        
-        query = "SELECT name, alias, exported, host, server, class FROM device"
-        
-        r = db.command_inout("DbMySqlSelect", query)
+    def _query(self, query):
+        r = self.db.command_inout("DbMySqlSelect", query)
         row_nb, column_nb = r[0][-2], r[0][-1]
-        results, data = r[0][:-2], r[1]
+        data = r[1]
         assert row_nb == len(data) / column_nb
+        return [tuple(data[i:i+column_nb])
+                for i in xrange(0, len(data), column_nb)]
+
+    def _queryStamp(self):
+        """returns the change stamp of the device table (or None if it cannot
+        be obtained)"""
+        try:
+            return self._query(self.StampQuery)[0]
+        except Exception:
+            return None
+
+    def refresh(self):
+        # the stamp is only needed to validate the snapshots
+        if self.getSnapshotFileName() is None:
+            stamp = None
+        else:
+            stamp = self._queryStamp()
+        rows = self._query(self.DevicesQuery)
+        self._build(rows)
+        self._stamp = stamp
+        self.saveSnapshot()
+
+    def _reset(self):
+        # device columns (removed devices leave a None name behind)
+        self._names = []
+        self._keys = [] # lower case names
+        self._server_col = array('i')
+        self._klass_col = array('i')
+        self._host_col = array('i')
+        self._exported_col = bytearray()
+        self._alias_col = {} # row -> alias (most devices have no alias)
+        # lower case name (or alias) -> row
+        self._index = {}
+        self._alias_index = {}
+        # tables referenced by the columns
+        self._servers, self._server_ids, self._server_list = {}, {}, []
+        self._klasses, self._klass_ids, self._klass_list = {}, {}, []
+        self._host_ids, self._hosts = {}, []
+        self._server_tree = TangoServerTree()
+        # TangoDevInfo objects created so far (row -> TangoDevInfo)
+        self._dev_infos = {}
+        # built on demand
+        self._sorted_index = None
+        self._device_tree = None
+
+    @_synchronized
+    def _build(self, rows):
+        """(re)builds all the containers from the rows of DevicesQuery"""
+        self._reset()
+        for row in rows:
+            self._addDevice(row)
+        self._invalidateNameLists()
+
+    def _invalidateNameLists(self):
+        self._device_name_list = self._server_name_list = None
+        self._klass_name_list = self._alias_name_list = None
+        self._exported_name_list = None
+        # the same query provides all the aliases of the authority
+        alias_col = self._alias_col
+        self.db._setAliases((name, alias_col.get(row))
+                            for row, name in enumerate(self._names)
+                            if name is not None)
+
+    @staticmethod
+    def _isValidRow(row):
+        name, server = row[0], row[4]
+        return name.count("/") == 2 and server.count("/") == 1
+
+    @staticmethod
+    def _normalizeRow(row):
+        name, alias, exported, host, server, klass = row
+        return name, alias or '', int(bool(int(exported))), host, server, klass
+
+    def _getRow(self, row):
+        """returns the (normalized) DevicesQuery row of the given device row"""
+        return (self._names[row], self._alias_col.get(row, ''),
+                self._exported_col[row], self._hosts[self._host_col[row]],
+                self._server_list[self._server_col[row]].name(),
+                self._klass_list[self._klass_col[row]].name())
+
+    @_synchronized
+    def _getRows(self):
+        """returns the (normalized) DevicesQuery rows of all the devices"""
+        return [self._getRow(row) for row, name in enumerate(self._names)
+                if name is not None]
+
+    def _getServerId(self, server):
+        sid = self._server_ids.get(server)
+        if sid is None:
+            si = TangoServInfo(self, name=server, full_name=server)
+            self._servers[server] = si
+            self._server_tree.addServer(si)
+            sid = self._server_ids[server] = len(self._server_list)
+            self._server_list.append(si)
+        return sid
+
+    def _getKlassId(self, klass):
+        kid = self._klass_ids.get(klass)
+        if kid is None:
+            dc = TangoDevClassInfo(self, name=klass, full_name=klass)
+            self._klasses[klass] = dc
+            kid = self._klass_ids[klass] = len(self._klass_list)
+            self._klass_list.append(dc)
+        return kid
+
+    def _getHostId(self, host):
+        hid = self._host_ids.get(host)
+        if hid is None:
+            hid = self._host_ids[host] = len(self._hosts)
+            self._hosts.append(host)
+        return hid
+
+    def _addDevice(self, row):
+        if not self._isValidRow(row):
+            return # invalid/corrupted entry: just ignore it
+        name, alias, exported, host, server, klass = row
+        key = name.lower()
+        if key in self._index:
+            self._removeDevice(key)
+        if key == name:
+            key = name
         
-        CD = CaselessDict
-        #CD = dict
-        dev_dict, serv_dict, klass_dict, alias_dict = CD(), {}, {}, CD()
-
-        for i in xrange(0, len(data), column_nb):
-            name, alias, exported, host, server, klass = data[i:i+column_nb]
-            if name.count("/") != 2: continue # invalid/corrupted entry: just ignore it
-            if server.count("/") != 1: continue # invalid/corrupted entry: just ignore it
-            if not len(alias): alias = None
-
-            serv_dict[server] = si = serv_dict.get(server, 
-                                                   TangoServInfo(self, name=server,
-                                                                 full_name=server))
-            
-            klass_dict[klass] = dc = klass_dict.get(klass,
-                                                    TangoDevClassInfo(self,
-                                                                       name=klass,
-                                                                       full_name=klass))
-            
-            full_name = "%s/%s" % (db.getFullName(), name)  
-            dev_dict[name] = di = TangoDevInfo(self, name=name, full_name=full_name, 
-                                               alias=alias, server=si, klass=dc,
-                                               exported=exported, host=host)
-            
-            si.addDevice(di)
-            dc.addDevice(di)
-            if alias is not None:
-                alias_dict[alias] = di
-        
-        self._devices = dev_dict
-        self._device_tree = TangoDevTree(dev_dict)
-        self._server_tree = TangoServerTree(serv_dict)
-        self._servers = serv_dict
-        self._klasses = klass_dict
-        self._aliases = alias_dict
+        r = len(self._names)
+        self._names.append(name)
+        self._keys.append(key)
+        self._index[key] = r
+        sid, kid = self._getServerId(server), self._getKlassId(klass)
+        self._server_col.append(sid)
+        self._klass_col.append(kid)
+        self._host_col.append(self._getHostId(host))
+        self._exported_col.append(bool(int(exported)))
+        if alias:
+            self._alias_col[r] = alias
+            self._alias_index[alias.lower()] = r
+        self._server_list[sid]._addRow(r)
+        self._klass_list[kid]._addRow(r)
+        self._sorted_index = self._device_tree = None
+
+    def _removeDevice(self, name):
+        r = self._index.pop(name.lower(), None)
+        if r is None:
+            return
+        alias = self._alias_col.pop(r, None)
+        if alias is not None:
+            self._alias_index.pop(alias.lower(), None)
+        sid, kid = self._server_col[r], self._klass_col[r]
+        si, dc = self._server_list[sid], self._klass_list[kid]
+        si._removeRow(r)
+        if not si._devices:
+            del self._servers[si.name()], self._server_ids[si.name()]
+            self._server_list[sid] = None
+            self._server_tree.removeServer(si)
+        dc._removeRow(r)
+        if not dc._devices:
+            del self._klasses[dc.name()], self._klass_ids[dc.name()]
+            self._klass_list[kid] = None
+        self._names[r] = self._keys[r] = None
+        self._dev_infos.pop(r, None)
+        self._sorted_index = self._device_tree = None
+
+    def _patch(self, rows):
+        """updates the containers so that they match the given rows of
+        DevicesQuery, only touching the devices which changed
+
+        :return: (int) number of devices added, removed or changed
+        """
+        new_rows = {}
+        for row in rows:
+            if self._isValidRow(row):
+                new_rows[row[0].lower()] = self._normalizeRow(row)
+        with self._lock:
+            return self._applyPatch(new_rows)
+
+    def _applyPatch(self, new_rows):
+        index = self._index
+        removed = [k for k in index if k not in new_rows]
+        changed = [k for k, row in new_rows.iteritems()
+                   if k in index and self._getRow(index[k]) != row]
+        added = [k for k in new_rows if k not in index]
+        for key in removed + changed:
+            self._removeDevice(key)
+        for key in changed + added:
+            self._addDevice(new_rows[key])
+        if removed or changed or added:
+            self._invalidateNameLists()
+        return len(removed) + len(changed) + len(added)
+
+    def _getDevInfo(self, row):
+        """returns the TangoDevInfo of the given device row (it is created
+        the first time), or None if the device was removed. The caller must
+        hold the lock"""
+        info = self._dev_infos.get(row)
+        if info is None:
+            name = self._names[row]
+            if name is None:
+                return None
+            full_name = "%s/%s" % (self.db.getFullName(), name)
+            info = TangoDevInfo(self, name=name, full_name=full_name,
+                                alias=self._alias_col.get(row),
+                                server=self._server_list[self._server_col[row]],
+                                klass=self._klass_list[self._klass_col[row]],
+                                exported=self._exported_col[row],
+                                host=self._hosts[self._host_col[row]])
+            self._dev_infos[row] = info
+        return info
+
+    @_synchronized
+    def _getDevInfoMap(self, rows):
+        """returns a mapping of device names to TangoDevInfo of the given
+        device rows"""
+        keys = self._keys
+        return _DevInfoMap(self, dict((keys[row], row) for row in rows),
+                           self._names)
+
+    def _getSortedIndex(self):
+        """returns the sorted lower case device names and their rows. The
+        caller must hold the lock"""
+        sorted_index = self._sorted_index
+        if sorted_index is None:
+            index = self._index
+            keys = sorted(index)
+            rows = array('i', [index[k] for k in keys])
+            self._sorted_index = sorted_index = keys, rows
+        return sorted_index
+
+    def _getPrefixRange(self, prefix):
+        """returns the sorted lower case device names, their rows and the
+        range of those which start with the given (lower case) prefix"""
+        keys, rows = self._getSortedIndex()
+        if not prefix:
+            return keys, rows, 0, len(keys)
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, _next_prefix(prefix), start)
+        return keys, rows, start, end
+
+    @_synchronized
+    def _getNextLevelNames(self, prefix):
+        """returns the different names found after the given prefix (up to
+        the next '/') in the device names"""
+        keys, _, i, end = self._getPrefixRange(prefix)
+        n, names = len(prefix), []
+        while i < end:
+            name = keys[i][n:].split("/", 1)[0]
+            names.append(name)
+            i = bisect_left(keys, prefix + name + "0", i, end)
+        return names
+
+    #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
+    # Persistent snapshot
+    #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
+
+    def getSnapshotFileName(self):
+        """Returns the name of the file where the snapshot of this database is
+        stored, or None if the snapshots are disabled (i.e.
+        TANGO_DB_SNAPSHOT_DIR is not set in :mod:`taurus.tauruscustomsettings`)
+
+        :return: (str or None)
+        """
+        path = getattr(tauruscustomsettings, 'TANGO_DB_SNAPSHOT_DIR', None)
+        if not path:
+            return None
+        host = self.db.getFullName().split('://', 1)[-1]
+        fname = re.sub(r'[^\w.-]', '_', host) + '.snapshot'
+        return os.path.join(os.path.expanduser(path), fname)
+
+    def saveSnapshot(self):
+        """Stores the current contents in the snapshot file (if enabled)
+
+        :return: (bool) True if the snapshot was saved
+        """
+        fname = self.getSnapshotFileName()
+        if fname is None or self._stamp is None:
+            return False
+        data = self.SnapshotVersion, self._stamp, self._getRows()
+        try:
+            dirname = os.path.dirname(fname)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            # write and rename, so that a reader never sees a partial file
+            tmp = "%s.%d" % (fname, os.getpid())
+            with open(tmp, 'wb') as f:
+                f.write(zlib.compress(json.dumps(data)))
+            os.rename(tmp, fname)
+        except Exception:
+            debug("Cannot save the database snapshot %s", fname, exc_info=1)
+            return False
+        return True
+
+    def loadSnapshot(self):
+        """Builds the contents from the snapshot file (if any)
+
+        :return: (bool) True if the snapshot could be loaded
+        """
+        fname = self.getSnapshotFileName()
+        if fname is None or not os.path.isfile(fname):
+            return False
+        try:
+            with open(fname, 'rb') as f:
+                version, stamp, rows = json.loads(zlib.decompress(f.read()))
+            if version != self.SnapshotVersion:
+                return False
+            # the snapshot directory may be shared: check what was loaded
+            stamp = tuple(map(_snapshotStr, stamp))
+            rows = map(_snapshotRow, rows)
+            self._build(rows)
+        except Exception:
+            debug("Cannot load the database snapshot %s", fname, exc_info=1)
+            return False
+        self._stamp = stamp
+        return True
+
+    def checkSnapshot(self):
+        """Checks the contents (e.g. loaded from a snapshot) against the
+        change stamp of the database. If they differ, the device table is
+        queried, the changes are applied incrementally and the snapshot is
+        updated
+
+        :return: (int) number of devices added, removed or changed
+        """
+        stamp = self._queryStamp()
+        if stamp is not None and stamp == self._stamp:
+            return 0
+        try:
+            n = self._patch(self._query(self.DevicesQuery))
+        except Exception:
+            debug("Cannot check the database snapshot", exc_info=1)
+            return 0
+        self._stamp = stamp
+        self.saveSnapshot()
+        return n
         
-    def refreshAttributes(self, device):
+    def getAttributesTTL(self):
+        """Returns the time during which the attribute lists of the devices
+        are cached
+
+        :return: (float or None) time in seconds (None means forever)
+        """
+        return self._attributes_ttl
+
+    def setAttributesTTL(self, ttl):
+        """Sets the time during which the attribute lists of the devices are
+        cached
+
+        :param ttl: (float or None) time in seconds (None means forever)
+        """
+        self._attributes_ttl = ttl
+
+    def _queryAttributes(self, device, timeout=None):
+        """returns the sorted list of TangoAttrInfo of the given device (empty
+        if the device cannot be reached)"""
         attrs = []
         try:
-            db = self.db
-            name = device.name()
-            full_name = db.getFullName() + "/" + name
-            taurus_dev = db.factory().getDevice(full_name, 
-                                                create_if_needed=False)
-            if taurus_dev is None:
-                dev = DeviceProxy(full_name)
+            full_name = device.fullName()
+            if timeout is None:
+                taurus_dev = self.db.factory().getDevice(full_name, 
+                                                         create_if_needed=False)
+                if taurus_dev is None:
+                    dev = DeviceProxy(full_name)
+                else:
+                    dev = taurus_dev.getDeviceProxy()
             else:
-                dev = taurus_dev.getDeviceProxy()
+                # a private proxy, so that its timeout does not affect others
+                dev = DeviceProxy(full_name)
+                dev.set_timeout_millis(int(timeout * 1000))
             attr_info_list = dev.attribute_list_query_ex()
             for attr_info in attr_info_list:
                 full_attr_name = "%s/%s" % (full_name, attr_info.name)
-                attr_obj = TangoAttrInfo(self, name=attr_info.name,
-                                          full_name=full_attr_name,
+                attr_obj = TangoAttrInfo(self, name=attr_info.name.lower(),
+                                          full_name=full_attr_name.lower(),
                                           device=device, info=attr_info) 
                 attrs.append(attr_obj)
-            attrs = sorted(attrs, key=lambda attr : attr.name().lower())
+            attrs = sorted(attrs, key=lambda attr : attr.name())
         except DevFailed as df:
-            pass
+            device._state = TaurusDevState.NotReady
+        return attrs
+
+    def _refreshDeviceAttributes(self, device, timeout):
+        """refreshes the attributes of a device registered as being refreshed
+        and calls the callbacks waiting for it"""
+        try:
+            attrs = self._queryAttributes(device, timeout)
+        except Exception:
+            debug("Cannot get the attributes of %s", device.name(), exc_info=1)
+            attrs = []
         device.setAttributes(attrs)
+        with self._attributes_lock:
+            callbacks = self._attributes_inflight.pop(device, ())
+        for callback in callbacks:
+            try:
+                callback(device)
+            except Exception:
+                debug("Error notifying the attributes of %s", device.name(),
+                      exc_info=1)
+
+    def _getAttributesPool(self):
+        with self._attributes_lock:
+            if self._attributes_pool is None:
+                self._attributes_pool = ThreadPool(name="TangoAttrListTP",
+                                                   Psize=self.AttributesPoolSize,
+                                                   Qsize=0)
+            return self._attributes_pool
+
+    def isRefreshingAttributes(self, device):
+        """Returns True if the attributes of the given device are being
+        refreshed (see :meth:`refreshAttributes`)
+
+        :param device: (TangoDevInfo) the device
+
+        :return: (bool)
+        """
+        with self._attributes_lock:
+            return device in self._attributes_inflight
+
+    def _inAttributesPool(self):
+        """returns True if called from a worker of the attributes pool"""
+        thread = threading.currentThread()
+        return (isinstance(thread, Worker) and
+                thread.pool is self._attributes_pool)
+
+    def refreshAttributes(self, devices, callback=None, timeout=None):
+        """Refreshes the attribute lists of the given devices.
+
+        The attributes of a single device are refreshed synchronously. Those
+        of a sequence of devices are refreshed in parallel by a pool of
+        :attr:`AttributesPoolSize` threads, with a timeout per device.
+
+        A device whose attributes are already being refreshed (e.g. by a
+        previous call with a callback) is not queried again: the call waits
+        for (or is notified of) the refresh in progress.
+
+        :param devices: (TangoDevInfo or sequence<TangoDevInfo>) device(s)
+        :param callback: (callable) for a sequence of devices, if given, the
+                         method returns immediately and callback(device) is
+                         called (from a worker thread) as soon as the
+                         attributes of each device are refreshed
+        :param timeout: (float) timeout of each device in seconds (default is
+                        :attr:`AttributesTimeout` for a sequence of devices
+                        and the device proxy timeout for a single device)
+
+        :return: (sequence<TangoDevInfo> or None) for a sequence of devices
+                 without callback, the devices in the order their attributes
+                 were refreshed (the method waits for all of them)
+        """
+        single = isinstance(devices, TangoDevInfo)
+        if single:
+            devices = [devices]
+            callback = None
+        else:
+            devices = list(devices)
+            if timeout is None:
+                timeout = self.AttributesTimeout
+        done = None
+        if callback is None:
+            if self._inAttributesPool():
+                # the pool may be busy with the jobs waiting for it: do not
+                # wait for the pool from one of its workers
+                for device in devices:
+                    device.setAttributes(self._queryAttributes(device,
+                                                               timeout))
+                return None if single else devices
+            done = Queue()
+            callback = done.put
+        new = []
+        with self._attributes_lock:
+            for device in devices:
+                callbacks = self._attributes_inflight.get(device)
+                if callbacks is None:
+                    self._attributes_inflight[device] = [callback]
+                    new.append(device)
+                else:
+                    callbacks.append(callback)
+        if single:
+            if new:
+                self._refreshDeviceAttributes(new[0], timeout)
+        elif new:
+            pool = self._getAttributesPool()
+            for device in new:
+                pool.add(self._refreshDeviceAttributes, None, device, timeout)
+        if done is None:
+            return None
+        refreshed = [done.get() for _ in devices]
+        return None if single else refreshed
     
+    @_synchronized
     def getDevice(self, name):
         """Returns a :class:`TangoDevInfo` object with information 
         about the given device name
@@ -385,83 +1004,119 @@ class TangoDatabaseCache(object):
         :param name: (str) the device name
         
         :return: (TangoDevInfo) information about the device"""
-        return self._devices.get(name)
+        row = self._index.get(name.lower())
+        if row is None:
+            return None
+        return self._getDevInfo(row)
     
+    @_synchronized
     def getDeviceNames(self):
         """Returns a list of registered device names
         
         :return: (sequence<str>) a sequence with all registered device names"""
         if self._device_name_list is None:
-            self._device_name_list = sorted(map(TangoDevInfo.name, self.devices().values()))
+            self._device_name_list = sorted(name for name in self._names 
+                                            if name is not None)
         return self._device_name_list
 
+    @_synchronized
+    def getExportedDeviceNames(self):
+        """Returns a list of the registered device names which are exported
+        
+        :return: (sequence<str>) a sequence with the exported device names"""
+        if self._exported_name_list is None:
+            exported = self._exported_col
+            self._exported_name_list = sorted(
+                name for row, name in enumerate(self._names)
+                if name is not None and exported[row])
+        return self._exported_name_list
+
+    @_synchronized
     def getAliasNames(self):
         if self._alias_name_list is None:
-            self._alias_name_list = sorted(map(TangoDevInfo.alias, self.aliases().values()))
+            self._alias_name_list = sorted(self._alias_col.itervalues())
         return self._alias_name_list
     
+    @_synchronized
     def getServerNames(self):
         """Returns a list of registered server names
         
         :return: (sequence<str>) a sequence with all registered server names"""
         if self._server_name_list is None:
-            self._server_name_list = sorted(map(TangoServInfo.name, self.servers().values()))
+            self._server_name_list = sorted(self._servers)
         return self._server_name_list
 
+    @_synchronized
     def getClassNames(self):
         """Returns a list of registered device classes
         
         :return: (sequence<str>) a sequence with all registered device classes"""
         if self._klass_name_list is None:
-            self._klass_name_list = sorted(map(TangoDevClassInfo.name, self.klasses().values()))
+            self._klass_name_list = sorted(self._klasses)
         return self._klass_name_list
 
+    @_synchronized
     def deviceTree(self):
         """Returns a tree container with all devices in three levels: domain,
            family and member
            
            :return: (TangoDevTree) a tree containning all devices"""
+        if self._device_tree is None:
+            self._device_tree = TangoDevTree(
+                [self._getDevInfo(row) for row in self._index.itervalues()])
         return self._device_tree
     
+    @_synchronized
     def serverTree(self):
         """Returns a tree container with all servers in two levels: server name
         and server instance
            
            :return: (TangoServerTree) a tree containning all servers"""
-        return self._server_tree
+        # a copy, since the cache may be patched while it is iterated
+        return TangoServerTree(self._servers)
     
+    @_synchronized
     def servers(self):
-        return self._servers
+        # a copy, since the cache may be patched while it is iterated
+        return dict(self._servers)
     
     def devices(self):
-        return self._devices
+        return _LiveDevInfoMap(self, '_index', '_names')
+
+    def aliases(self):
+        return _LiveDevInfoMap(self, '_alias_index', '_alias_col')
     
+    @_synchronized
     def klasses(self):
-        return self._klasses
+        return dict(self._klasses)
     
     def getDeviceDomainNames(self):
-        return self._device_tree.keys()
+        return self._getNextLevelNames("")
     
     def getDeviceFamilyNames(self, domain):
-        families = self._device_tree.get(domain)
-        if families is None: return []
-        return families.keys()
+        return self._getNextLevelNames("%s/" % domain.lower())
     
+    @_synchronized
     def getDeviceMemberNames(self, domain, family):
-        families = self._device_tree.get(domain)
-        if families is None: return []
-        members = families.get(family)
-        if members is None: return []
-        return members.keys()
+        prefix = "%s/%s/" % (domain.lower(), family.lower())
+        keys, _, start, end = self._getPrefixRange(prefix)
+        n = len(prefix)
+        return [key[n:] for key in keys[start:end]]
     
+    @_synchronized
     def getDomainDevices(self, domain):
-        return self.deviceTree().getDomainDevices(domain)
+        _, rows, start, end = self._getPrefixRange("%s/" % domain.lower())
+        return map(self._getDevInfo, rows[start:end])
     
+    @_synchronized
     def getFamilyDevices(self, domain, family):
-        return self.deviceTree().getFamilyDevices(domain, family)
+        prefix = "%s/%s/" % (domain.lower(), family.lower())
+        _, rows, start, end = self._getPrefixRange(prefix)
+        return map(self._getDevInfo, rows[start:end])
 
+    @_synchronized
     def getServerNameInstances(self, serverName):
-        return self.serverTree().getServerNameInstances(serverName)
+        return self._server_tree.getServerNameInstances(serverName)
 
 
 class TangoDevTree(CaselessDict):
@@ -535,6 +1190,15 @@ class TangoServerTree(dict):
         
         serverInstances[serverInstance] = serv_info
 
+    def removeServer(self, serv_info):
+        serverName, serverInstance = serv_info.serverName(), serv_info.serverInstance()
+        serverInstances = self.get(serverName)
+        if serverInstances is None:
+            return
+        serverInstances.pop(serverInstance, None)
+        if not serverInstances:
+            del self[serverName]
+
     def getServerNameInstances(self, serverName):
         """Returns all servers under the given serverName. Returns empty list if
         the server name doesn't exist or doesn't contain any instances"""
@@ -619,6 +1283,10 @@ class TangoAuthority(TaurusAuthority):
     _scheme = 'tango'
     _description = 'A Tango Authority'
 
+    # time (in seconds) during which a device name <-> alias correspondence
+    # is trusted without asking the database
+    DefaultAliasTTL = 300
+
     def __init__(self,host=None,port=None,parent=None):
         pars = ()
         if host is None or port is None:
@@ -632,6 +1300,12 @@ class TangoAuthority(TaurusAuthority):
         self.dbObj = Database(*pars)
         self._dbProxy = None
         self._dbCache = None
+        # device name -> (alias, expiry) and alias -> (device name, expiry).
+        # Filled in bulk by refreshAliases (on the first lookup)
+        self._alias_ttl = getattr(tauruscustomsettings, 'TANGO_ALIAS_TTL',
+                                  self.DefaultAliasTTL)
+        self._aliases = None
+        self._alias_names = None
         
         complete_name = "tango://%s:%s" % (host, port)
         self.call__init__(TaurusAuthority, complete_name, parent)
@@ -719,6 +1393,13 @@ class TangoAuthority(TaurusAuthority):
         :return: (sequence<str>) a sequence with all registered tango device names"""
         return self.cache().getDeviceNames()
 
+    def getExportedDeviceNames(self):
+        """Returns a list of the registered tango device names which are
+        exported
+        
+        :return: (sequence<str>) a sequence with the exported device names"""
+        return self.cache().getExportedDeviceNames()
+
     def getAliasNames(self):
         """Returns a list of registered tango device alias
         
@@ -762,27 +1443,83 @@ class TangoAuthority(TaurusAuthority):
            :return: (TangoDevTree) a tree containning all devices"""
         return self.cache().deviceTree()
      
+    def refreshAliases(self):
+        """Reloads the device name <-> alias correspondences of all the
+        devices with a single query to the database. It is done
+        automatically on the first call to :meth:`getElementAlias` or
+        :meth:`getElementFullName`, and whenever the cache is refreshed
+        (see :meth:`refreshCache`)"""
+        query = "SELECT name, alias FROM device"
+        try:
+            r = self.command_inout("DbMySqlSelect", query)
+        except Exception:
+            # e.g. old databases (the lookups will query each alias)
+            self.debug("Cannot query the aliases in bulk", exc_info=1)
+            self._setAliases(())
+            return
+        column_nb, data = r[0][-1], r[1]
+        pairs = [(data[i], data[i+1] or None)
+                 for i in xrange(0, len(data), column_nb)]
+        self._setAliases(pairs)
+
+    def _setAliases(self, pairs):
+        """replaces the cached correspondences with the given (device name,
+        alias) pairs (alias is None for the devices without alias)"""
+        expiry = time.time() + self._alias_ttl
+        aliases, alias_names = CaselessDict(), CaselessDict()
+        for name, alias in pairs:
+            aliases[name] = alias, expiry
+            if alias is not None:
+                alias_names[alias] = name, expiry
+        self._aliases, self._alias_names = aliases, alias_names
+
+    def _cacheAlias(self, full_name, alias):
+        expiry = time.time() + self._alias_ttl
+        if full_name is not None:
+            self._aliases[full_name] = alias, expiry
+        if alias is not None:
+            self._alias_names[alias] = full_name, expiry
+
     def getElementAlias(self, full_name):
-        '''return the alias of an element from its full name'''
+        '''return the alias of an element from its full name. The answer
+        is cached (see :meth:`refreshAliases`)'''
+        if self._aliases is None:
+            self.refreshAliases()
+        entry = self._aliases.get(full_name)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
         try:
             alias = self.getTangoDB().get_alias(full_name)
             if alias and alias.lower() == InvalidAlias:
                 alias = None 
         except:
             alias = None
+        self._cacheAlias(full_name, alias)
         return alias
         
     def getElementFullName(self, alias):
-        '''return the full name of an element from its alias'''
+        '''return the full name of an element from its alias. The answer is
+        cached (see :meth:`refreshAliases`)'''
+        if self._alias_names is None:
+            self.refreshAliases()
+        entry = self._alias_names.get(alias)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
         try: # PyTango v>=8.1.0
-            return self.getTangoDB().get_device_from_alias(alias)
+            full_name = self.getTangoDB().get_device_from_alias(alias)
         except AttributeError:
             try: # PyTango v<8.1.0
-                return self.getTangoDB().get_device_alias(alias)
+                full_name = self.getTangoDB().get_device_alias(alias)
             except:
-                return None
+                full_name = None
         except:
-            return None
+            full_name = None
+        if full_name is None:
+            # remember that the alias does not exist
+            self._alias_names[alias] = None, time.time() + self._alias_ttl
+        else:
+            self._cacheAlias(full_name, alias)
+        return full_name
 
     @tep14_deprecation(alt=".description")
     def getDescription(self, cache=True):
@@ -30,12 +30,50 @@ __all__ = ["TangoDevice"]
 __docformat__ = "restructuredtext"
 
 import time
-from PyTango import (DeviceProxy, DevFailed, LockerInfo, DevState)
+from PyTango import (DeviceProxy, DevFailed, LockerInfo, DevState,
+                     AsynReplyNotArrived)
 
 from taurus.core.taurusdevice import TaurusDevice
+from taurus.core.tauruspollingtimer import TaurusPollingBackoff
 from taurus.core.taurusbasetypes import (TaurusDevState, TaurusLockInfo,
                                          LockStatus, TaurusEventType)
 from taurus.core.util.log import tep14_deprecation
+from taurus.core.tango.enums import CONNECTION_EXCEPTIONS
+
+
+def _isConnectionError(error):
+    """tells if the given polling error means that the device cannot be
+    reached (errors without a Tango error stack are assumed to be so)"""
+    if not isinstance(error, DevFailed):
+        return True
+    try:
+        return any(err.reason in CONNECTION_EXCEPTIONS for err in error.args)
+    except AttributeError:
+        return True
+
+
+def _replyTimeout(timeout):
+    """converts a poll reply timeout (seconds or None) to the milliseconds
+    expected by PyTango"""
+    if timeout is None:
+        return 0
+    # 0 means "wait forever" for PyTango
+    return max(1, int(timeout*1000))
+
+
+class _PollRequest(object):
+    """An asynchronous poll of a device (see :meth:`TangoDevice.poll`): the
+    request of the attributes read together and the requests of the failed
+    attributes which are probed one by one"""
+
+    def __init__(self, ts):
+        self.ts = ts
+        self.names = () # attributes read together
+        self.req_id = None
+        self.error = None # error sending the request
+        self.done = True # the reply of req_id has been processed
+        self.ret = True
+        self.probes = {} # attribute name -> request id (or error)
 
 
 class _TangoInfo(object):
@@ -58,6 +96,11 @@ class TangoDevice(TaurusDevice):
 
     def __init__(self, name, **kw):
         """Object initialization."""
+        # circuit breaker for the polling when the device is unreachable
+        self._poll_backoff = TaurusPollingBackoff()
+        # attribute name -> circuit breaker of the attributes which are left
+        # out of the polling request because they made it fail
+        self._poll_failed = {}
         self.call__init__(TaurusDevice, name, **kw)
         self._deviceObj = self._createHWObject()
         self._lock_info = TaurusLockInfo()
@@ -307,11 +350,44 @@ class TangoDevice(TaurusDevice):
         value.rvalue = new_state
         return value
 
-    def __pollResult(self, attrs, ts, result, error=False):
-        if error:
+    def __pollNames(self, attrs):
+        """returns the names of the attributes to be read together"""
+        failed = self._poll_failed
+        return [name for name in attrs if name not in failed]
+
+    def __pollProbes(self, attrs, ts):
+        """returns the names of the failed attributes to be probed now"""
+        failed = self._poll_failed
+        return [name for name in attrs
+                if name in failed and failed[name].allowPoll(ts)]
+
+    def __pollResult(self, attrs, names, ts, result, error=False):
+        """notifies the result of reading the given attributes together.
+        Returns False if the device is unreachable"""
+        if error and _isConnectionError(result):
+            # notify only the first error while the device is unreachable
+            if not self._poll_backoff.failure(result, ts):
+                self.debug("Still unreachable. Next poll probe in %gs",
+                           self._poll_backoff.interval)
+                return False
+            self.info("Unreachable. Backing off its polling")
             for attr in attrs.values():
                 attr.poll(single=False, value=None, error=result, time=ts)
-            return
+            return False
+
+        if self._poll_backoff.success():
+            self.info("Reachable again. Resuming its polling")
+
+        if error:
+            # the device is reachable but the request failed as a whole
+            # (e.g. because of a wrong attribute): the attributes are probed
+            # one by one from now on, and those which keep failing are left
+            # out of the request
+            self.debug("Reading %d attributes failed. Probing them one by one",
+                       len(names))
+            for name in names:
+                self._poll_failed.setdefault(name, TaurusPollingBackoff())
+            return True
 
         for da in result:
             if da.has_failed:
@@ -320,44 +396,158 @@ class TangoDevice(TaurusDevice):
                 v, err = da, None
             attr = attrs[da.name]
             attr.poll(single=False, value=v, error=err, time=ts)
+        return True
+
+    def __probeResult(self, attrs, name, ts, result, error=False):
+        """notifies the result of reading a failed attribute on its own"""
+        if not error and result.has_failed:
+            result, error = DevFailed(*result.get_err_stack()), True
+        if error:
+            backoff = self._poll_failed.get(name)
+            # notify only the first error while the attribute keeps failing
+            if backoff is not None and not backoff.failure(result, ts):
+                return
+            value = None
+        else:
+            self._poll_failed.pop(name, None)
+            value, result = result, None
+        attrs[name].poll(single=False, value=value, error=result, time=ts)
 
     def __pollAsynch(self, attrs):
-        ts = time.time()
+        request = _PollRequest(time.time())
+        if not self._poll_backoff.allowPoll(request.ts):
+            return request
+        request.names = names = self.__pollNames(attrs)
+        if names:
+            request.done = False
+            try:
+                request.req_id = self.read_attributes_asynch(names)
+            except DevFailed as e:
+                request.error = e
+                if _isConnectionError(e):
+                    return request
+        for name in self.__pollProbes(attrs, request.ts):
+            try:
+                request.probes[name] = self.read_attribute_asynch(name)
+            except DevFailed as e:
+                request.probes[name] = e
+        return request
+
+    def __pollReply(self, attrs, request, timeout=None):
+        if not request.done:
+            ret = self.__pollGroupReply(attrs, request, timeout)
+            if ret is None:
+                return None
+            request.done, request.ret = True, ret
+        ts, probes = request.ts, request.probes
+        for name, req_id in probes.items():
+            if isinstance(req_id, DevFailed):
+                del probes[name]
+                self.__probeResult(attrs, name, ts, req_id, error=True)
+                continue
+            try:
+                if timeout == 0:
+                    result = self.read_attribute_reply(req_id)
+                else:
+                    result = self.read_attribute_reply(req_id,
+                                                       _replyTimeout(timeout))
+            except AsynReplyNotArrived as e:
+                if timeout == 0:
+                    continue
+                try:
+                    self.cancel_asynch_request(req_id)
+                except (AttributeError, DevFailed):
+                    pass
+                result, error = e, True
+            except DevFailed as e:
+                result, error = e, True
+            else:
+                error = False
+            del probes[name]
+            self.__probeResult(attrs, name, ts, result, error=error)
+        if probes:
+            return None
+        return request.ret
+
+    def __pollGroupReply(self, attrs, request, timeout):
+        names, ts = request.names, request.ts
+        if request.error is not None:
+            self.__pollResult(attrs, names, ts, request.error, error=True)
+            return True
+
+        if timeout == 0:
+            # just check if the reply has arrived
+            try:
+                result = self.read_attributes_reply(request.req_id)
+            except AsynReplyNotArrived:
+                return None
+            except DevFailed as e:
+                self.__pollResult(attrs, names, ts, e, error=True)
+                return True
+            self.__pollResult(attrs, names, ts, result)
+            return True
+
+        timeout = _replyTimeout(timeout)
         try:
-            req_id = self.read_attributes_asynch(attrs.keys())
+            result = self.read_attributes_reply(request.req_id, timeout)
+        except AsynReplyNotArrived as e:
+            self.debug("Poll reply not arrived after %dms", timeout)
+            try:
+                self.cancel_asynch_request(request.req_id)
+            except (AttributeError, DevFailed):
+                pass
+            self.__pollResult(attrs, names, ts, e, error=True)
+            return False
         except DevFailed as e:
-            return False, e, ts
-        return True, req_id, ts
-
-    def __pollReply(self, attrs, req_id, timeout=None):
-        ok, req_id, ts = req_id
-        if not ok:
-            self.__pollResult(attrs, ts, req_id, error=True)
-            return
-
-        if timeout is None:
-            timeout = 0
-        timeout = int(timeout*1000)
-        result = self.read_attributes_reply(req_id, timeout)
-        self.__pollResult(attrs, ts, result)
-
-    def poll(self, attrs, asynch=False, req_id=None):
-        '''optimized by reading of multiple attributes in one go'''
+            self.__pollResult(attrs, names, ts, e, error=True)
+            return True
+        self.__pollResult(attrs, names, ts, result)
+        return True
+
+    def poll(self, attrs, asynch=False, req_id=None, timeout=None):
+        '''optimized by reading of multiple attributes in one go.
+        See :meth:`TaurusDevice.poll`.
+
+        If the device is unreachable, its polling is backed off (see
+        :meth:`getPollingBackoff`): only periodic probes are done and the
+        attributes are notified of the error only once. Other errors (see
+        :data:`taurus.core.tango.enums.CONNECTION_EXCEPTIONS`) do not back
+        off the device: the attributes of the failed request are read one by
+        one (asynchronously if asynch is True) in the next polls, and those
+        which keep failing are left out of the request and backed off on
+        their own'''
         if req_id is not None:
-            return self.__pollReply(attrs, req_id)
+            return self.__pollReply(attrs, req_id, timeout=timeout)
 
         if asynch:
             return self.__pollAsynch(attrs)
 
-        error = False
         ts = time.time()
-        try:
-            result = self.read_attributes(attrs.keys())
-        except DevFailed as e:
-            error = True
-            result = e
-        self.__pollResult(attrs, ts, result, error=error)
+        if not self._poll_backoff.allowPoll(ts):
+            return True
+        names = self.__pollNames(attrs)
+        if names:
+            try:
+                result, error = self.read_attributes(names), False
+            except DevFailed as e:
+                result, error = e, True
+            if not self.__pollResult(attrs, names, ts, result, error=error):
+                return True
+        for name in self.__pollProbes(attrs, ts):
+            try:
+                result, error = self.read_attribute(name), False
+            except DevFailed as e:
+                result, error = e, True
+            self.__probeResult(attrs, name, ts, result, error=error)
+        return True
     
+    def getPollingBackoff(self):
+        """Returns the circuit breaker of the polling of this device
+
+        :return: (taurus.core.tauruspollingtimer.TaurusPollingBackoff)
+        """
+        return self._poll_backoff
+
     def _repr_html_(self):
         try:
             info = self.getDeviceProxy().info()
@@ -39,14 +39,21 @@ except ImportError:
     debug(msg)
     raise
 
+import threading
+import collections
+from Queue import Queue
+
+from taurus import tauruscustomsettings
 from taurus.core.taurusbasetypes import TaurusElementType
 from taurus.core.taurusfactory import TaurusFactory
 from taurus.core.taurusbasetypes import OperationMode
 from taurus.core.taurusexception import TaurusException, DoubleRegistration
 from taurus.core.tauruspollingtimer import TaurusPollingTimer
+from taurus.core.taurusvalidator import clearUriGroupsCache
 from taurus.core.util.log import Logger, tep14_deprecation
 from taurus.core.util.singleton import Singleton
 from taurus.core.util.containers import CaselessWeakValueDict, CaselessDict
+from taurus.core.util.threadpool import ThreadPool, Worker
 
 from .tangodatabase import TangoAuthority
 from .tangoattribute import TangoAttribute
@@ -92,6 +99,9 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
                        TaurusElementType.Attribute: TangoAttribute
                        }
     
+    #: maximum number of devices processed concurrently by getAttributes
+    AttributesPoolSize = 10
+
     def __init__(self):
         """ Initialization. Nothing to be done here for now."""
         pass
@@ -103,6 +113,11 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
         self.call__init__(Logger, name)
         self.call__init__(TaurusFactory)
         self._polling_enabled = True
+        self._async_attr_config = getattr(tauruscustomsettings,
+                                          'TANGO_ASYNC_ATTR_CONFIG', False)
+        # pool used by getAttributes (created on first use)
+        self._attributes_pool = None
+        self._attributes_lock = threading.Lock()
         self.reInit()
         self.scheme = 'tango'
 
@@ -163,6 +178,8 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
         """
         self._default_tango_host = tango_host
         self.dft_db = None
+        # parsed names may depend on the default tango host
+        clearUriGroupsCache()
 
     def registerAttributeClass(self, attr_name, attr_klass):
         """Registers a new attribute class for the attribute name.
@@ -365,6 +382,110 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
                 raise
         return attr
 
+    def getAttributes(self, attr_names, **kwargs):
+        """Obtain the objects corresponding to the given attribute names.
+        It is equivalent to calling :meth:`getAttribute` for each name, but
+        the attributes which do not exist yet are created in bulk: their
+        configuration is obtained with a single get_attribute_config_ex
+        call per device, and different devices are processed concurrently
+        by a pool of :attr:`AttributesPoolSize` threads.
+
+        Unlike :meth:`getAttribute`, it does not raise: the names which are
+        not valid attribute names and the attributes which cannot be created
+        get None in the returned list.
+
+           :param attr_names: (seq<str>) attribute name URIs
+           :param kwargs: keyword arguments passed to the attribute
+                          constructor (see :meth:`getAttribute`)
+           :return: (list<TangoAttribute or None>) the attributes, in the
+                    same order as the given names
+        """
+        attrs = self.tango_attrs
+        ret = [attrs.get(name) for name in attr_names]
+        # group the attributes to be created by device
+        validator = _Attribute.getNameValidator()
+        full_names, groups = {}, collections.OrderedDict()
+        for i, name in enumerate(attr_names):
+            if ret[i] is not None:
+                continue
+            names = validator.getNames(name)
+            if not names or names[0] is None:
+                self.debug("Invalid Tango attribute name '%s'", name)
+                continue
+            full_attr_name = full_names[i] = names[0]
+            attr = ret[i] = attrs.get(full_attr_name)
+            if attr is None:
+                dev_name = full_attr_name.rsplit('/', 1)[0]
+                groups.setdefault(dev_name, []).append(full_attr_name)
+
+        created = {}
+        if len(groups) == 1 or self._inAttributesPool():
+            # do not wait for the pool from one of its workers
+            for dev_name, dev_attr_names in groups.iteritems():
+                created.update(self.__createDeviceAttributes(
+                                        dev_name, dev_attr_names, kwargs))
+        elif groups:
+            done = Queue()
+            pool = self._getAttributesPool()
+            for dev_name, dev_attr_names in groups.iteritems():
+                pool.add(self.__createDeviceAttributes, done.put, dev_name,
+                         dev_attr_names, kwargs)
+            for _ in groups:
+                created.update(done.get())
+
+        for i, full_attr_name in full_names.iteritems():
+            if ret[i] is None:
+                ret[i] = created.get(full_attr_name)
+        return ret
+
+    def _getAttributesPool(self):
+        with self._attributes_lock:
+            if self._attributes_pool is None:
+                self._attributes_pool = ThreadPool(
+                    name="TangoAttributesTP", parent=self,
+                    Psize=self.AttributesPoolSize, Qsize=0)
+            return self._attributes_pool
+
+    def _inAttributesPool(self):
+        """returns True if called from a worker of the getAttributes pool"""
+        thread = threading.currentThread()
+        return (isinstance(thread, Worker) and
+                thread.pool is self._attributes_pool)
+
+    def __createDeviceAttributes(self, dev_name, attr_names, kwargs):
+        """Creates the given attributes of a device (see getAttributes)
+
+           :param dev_name: (str) the device full name
+           :param attr_names: (seq<str>) full names of attributes of dev_name
+           :param kwargs: (dict) keyword arguments for getAttribute
+           :return: (dict<str, TangoAttribute>) the created attributes
+        """
+        ret = {}
+        try:
+            dev = self.getDevice(dev_name)
+        except Exception:
+            self.debug("Error creating device %s", dev_name, exc_info=1)
+            return ret
+        if dev is None:
+            return ret
+        # one query of the configuration of all the attributes. If it fails
+        # (e.g. one attribute does not exist) each attribute queries its own
+        infos = {}
+        try:
+            simple_names = [name.rsplit('/', 1)[1] for name in attr_names]
+            infos = dict(zip(attr_names,
+                             dev.get_attribute_config_ex(simple_names)))
+        except Exception:
+            self.debug("Cannot get the configuration of %s attributes",
+                       dev_name, exc_info=1)
+        for name in attr_names:
+            try:
+                ret[name] = self.getAttribute(name, attrInfo=infos.get(name),
+                                              **kwargs)
+            except Exception:
+                self.debug("Error creating attribute %s", name, exc_info=1)
+        return ret
+
     def getAttributeInfo(self,full_attr_name):
         """Deprecated: Use :meth:`taurus.core.tango.TangoFactory.getConfiguration` instead.
 
@@ -535,6 +656,57 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
             timer.start()
         self._polling_enabled = True
 
+    def isAsyncAttributeConfig(self):
+        """Tells if the new attributes fetch their configuration
+        asynchronously (see :meth:`setAsyncAttributeConfig`)
+
+           :return: (bool)
+        """
+        return self._async_attr_config
+
+    def setAsyncAttributeConfig(self, enable):
+        """Sets whether the new attributes fetch their configuration
+        asynchronously. If enabled, creating an attribute does not access the
+        device: the attribute has a default configuration until the real one
+        is received (in a separate thread), at which point a Config event is
+        fired. It can be overridden per attribute with the asyncConfig
+        keyword argument of :meth:`getAttribute`.
+        The initial value is given by TANGO_ASYNC_ATTR_CONFIG in
+        :mod:`taurus.tauruscustomsettings` (False by default)
+
+           :param enable: (bool)
+        """
+        self._async_attr_config = bool(enable)
+
+    def getPollingBackoff(self):
+        """Returns the state of the polling back off of the devices which are
+        currently considered unreachable.
+        See :class:`taurus.core.tauruspollingtimer.TaurusPollingBackoff`
+
+           :return: (dict<str, dict>) a dictionary whose keys are the device
+                    full names and whose values are dictionaries with the
+                    back off state
+        """
+        ret = {}
+        for name, dev in self.tango_devs.items():
+            backoff = dev.getPollingBackoff()
+            if backoff.isOpen():
+                ret[name] = backoff.getState()
+        return ret
+
+    def resetPollingBackoff(self, dev_name=None):
+        """Resets the polling back off of the given device (or of all the
+        devices if dev_name is None) so that it is polled in the next cycle
+
+           :param dev_name: (str or None) device name
+        """
+        if dev_name is None:
+            devs = self.tango_devs.values()
+        else:
+            devs = [self.getDevice(dev_name)]
+        for dev in devs:
+            dev.getPollingBackoff().reset()
+
     def getDatabaseNameValidator(self):
         """Deprecated"""
         self.warning(('getDatabaseNameValidator is deprecated.' +  
@@ -89,6 +89,7 @@ class TangoDeviceNameValidator(TaurusDeviceNameValidator):
         groups = self.getUriGroups(fullname)
         if groups is None:
             return None
+        groups = dict(groups)
 
         import PyTango
         default_authority = '//' + PyTango.ApiUtil.get_env_var('TANGO_HOST')
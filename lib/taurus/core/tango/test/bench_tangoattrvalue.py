@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+##
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Micro-benchmark of the decoding of PyTango.DeviceAttribute objects into
+TangoAttrValue objects. It compares the decoding done before caching the
+numerical check and the units (legacy) with the current (lazy) decoding,
+both for values which are never read (unread) and for values whose
+members are all read (read).
+
+No Tango device is needed. Run it as::
+
+    python -m taurus.core.tango.test.bench_tangoattrvalue [repeat]
+"""
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import timeit
+import numpy
+import PyTango
+
+from taurus.external.pint import Quantity
+from taurus.core.taurusbasetypes import DataFormat, DataType, TaurusAttrValue
+from taurus.core.tango.enums import DevState
+from taurus.core.tango.tangoattribute import TangoAttrValue
+from taurus.core.tango.util.tango_taurus import (unit_from_tango,
+                                                 quality_from_tango)
+
+
+class _FakeAttr(object):
+    """Provides the members of TangoAttribute used by TangoAttrValue"""
+
+    def __init__(self, tango_type, data_format, taurus_type, unit):
+        self._tango_data_type = tango_type
+        self.data_format = data_format
+        self.type = taurus_type
+        self._units = unit_from_tango(unit)
+        self._is_numerical = PyTango.is_numerical_type(tango_type,
+                                                       inc_array=True)
+        self._units_container = self._units._units
+
+
+def _legacy_decode(attr, p):
+    """the per event work done by TangoAttrValue before the caches"""
+    numerical = PyTango.is_numerical_type(attr._tango_data_type,
+                                          inc_array=True)
+    rvalue = p.value
+    wvalue = p.w_value
+    units = attr._units
+    if numerical:
+        if rvalue is not None:
+            rvalue = Quantity(rvalue, units=units)
+        if wvalue is not None:
+            wvalue = Quantity(wvalue, units=units)
+    if isinstance(rvalue, PyTango._PyTango.DevState):
+        rvalue = DevState[str(rvalue)]
+    v = TaurusAttrValue()
+    v.rvalue, v.wvalue = rvalue, wvalue
+    v.time, v.quality = p.time, quality_from_tango(p.quality)
+    return v
+
+
+def _dev_attr(value, w_value=None):
+    p = PyTango.DeviceAttribute()
+    p.value = value
+    p.w_value = w_value
+    p.quality = PyTango.AttrQuality.ATTR_VALID
+    p.time = PyTango.TimeVal.fromtimestamp(0)
+    return p
+
+
+CASES = (
+    ('double scalar',
+     _FakeAttr(PyTango.DevDouble, DataFormat._0D, DataType.Float, 'mm'),
+     _dev_attr(1.5, 2.5)),
+    ('double spectrum (1e4)',
+     _FakeAttr(PyTango.DevDouble, DataFormat._1D, DataType.Float, 'mm'),
+     _dev_attr(numpy.arange(1e4))),
+    ('short image (1e3x1e3)',
+     _FakeAttr(PyTango.DevShort, DataFormat._2D, DataType.Integer, 'mm'),
+     _dev_attr(numpy.zeros((1000, 1000), dtype='int16'))),
+    ('state scalar',
+     _FakeAttr(PyTango.DevState, DataFormat._0D, DataType.DevState,
+               PyTango.constants.UnitNotSpec),
+     _dev_attr(PyTango.DevState.ON)),
+)
+
+
+def _decode_and_read(attr, p):
+    v = TangoAttrValue(attr, p)
+    return v.rvalue, v.wvalue, v.time, v.quality, v.error
+
+
+def main(repeat=10000):
+    print '%-24s %12s %12s %12s' % ('case (us/event)', 'legacy',
+                                    'unread', 'read')
+    for name, attr, p in CASES:
+        row = []
+        for func in (_legacy_decode, TangoAttrValue, _decode_and_read):
+            t = min(timeit.repeat(lambda: func(attr, p), number=repeat,
+                                  repeat=3))
+            row.append(1e6 * t / repeat)
+        print '%-24s %12.2f %12.2f %12.2f' % tuple([name] + row)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+##
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the memory and time needed to build the
+:class:`TangoDatabaseCache` of a synthetic device table. It compares the
+structure used before the columnar store (one TangoDevInfo object per device
+indexed by several CaselessDict) with the current one.
+
+No Tango database is needed. Run it as::
+
+    python -m taurus.core.tango.test.bench_tangodatabase [devices]
+
+Each structure is built in a separate process, so that the memory of one
+does not hide the memory of the other.
+"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import time
+import subprocess
+
+from taurus.core.util.containers import CaselessDict
+from taurus.core.tango.tangodatabase import TangoDatabaseCache, TangoDevInfo
+
+
+class _FakeDb(object):
+    """Provides the members of TangoAuthority used by TangoDatabaseCache"""
+
+    def __init__(self, rows):
+        self._data = [col for row in rows for col in row]
+        self._nb = len(rows)
+
+    def command_inout(self, cmd, query):
+        if query != TangoDatabaseCache.DevicesQuery:
+            raise Exception('no stamp available')
+        return [self._nb, 6], self._data
+
+    def getFullName(self):
+        return 'tango://bench:10000'
+
+    def _setAliases(self, pairs):
+        for _ in pairs:
+            pass
+
+
+def _rows(nb):
+    """a synthetic device table: 20 devices per server, 50 classes, 100
+    hosts, a tenth of the devices with alias"""
+    rows = []
+    for i in xrange(nb):
+        name = 'Domain%02d/Family%03d/member%06d' % (i % 50, i % 300, i)
+        alias = 'alias%06d' % i if i % 10 == 0 else ''
+        server = 'Server%02d/instance%05d' % (i // 20 % 30, i // 20)
+        rows.append((name, alias, str(i % 2), 'host%03d' % (i % 100), server,
+                     'Class%02d' % (i % 50)))
+    return rows
+
+
+class _LegacyInfo(object):
+
+    def __init__(self, name):
+        self._name = name
+        self._devices = CaselessDict()
+
+    def addDevice(self, dev):
+        self._devices[dev.name()] = dev
+
+
+def _legacy_build(db):
+    """builds the per device objects and dictionaries of the cache before the
+    columnar store (devices, servers, classes, aliases and device tree)"""
+    r = db.command_inout("DbMySqlSelect", TangoDatabaseCache.DevicesQuery)
+    data, column_nb = r[1], r[0][-1]
+    dev_dict, serv_dict, klass_dict = CaselessDict(), {}, {}
+    alias_dict, tree = CaselessDict(), CaselessDict()
+    for i in xrange(0, len(data), column_nb):
+        name, alias, exported, host, server, klass = data[i:i+column_nb]
+        alias = alias or None
+        si = serv_dict.get(server)
+        if si is None:
+            si = serv_dict[server] = _LegacyInfo(server)
+        dc = klass_dict.get(klass)
+        if dc is None:
+            dc = klass_dict[klass] = _LegacyInfo(klass)
+        full_name = "%s/%s" % (db.getFullName(), name)
+        dev_dict[name] = di = TangoDevInfo(db, name=name, full_name=full_name,
+                                           alias=alias, server=si, klass=dc,
+                                           exported=exported, host=host)
+        si.addDevice(di)
+        dc.addDevice(di)
+        if alias is not None:
+            alias_dict[alias] = di
+        families = tree[di.domain()] = tree.get(di.domain(), CaselessDict())
+        members = families[di.family()] = families.get(di.family(),
+                                                       CaselessDict())
+        members[di.member()] = di
+    return dev_dict, serv_dict, klass_dict, alias_dict, tree
+
+
+def _legacy_lookup(cache, names):
+    devices = cache[0]
+    for name in names:
+        devices.get(name)
+
+
+def _columnar_build(db):
+    return TangoDatabaseCache(db)
+
+
+def _columnar_lookup(cache, names):
+    for name in names:
+        cache.getDevice(name)
+
+
+def _rss():
+    """resident memory of this process (in MB)"""
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2.**20
+
+
+_MODULE = 'taurus.core.tango.test.bench_tangodatabase'
+
+MODES = {
+    'legacy': (_legacy_build, _legacy_lookup),
+    'columnar': (_columnar_build, _columnar_lookup),
+}
+
+
+def run(mode, nb):
+    """builds the given structure and prints: build time (s), memory (MB) and
+    time of 10000 device lookups (ms), the first time (i.e. including the
+    creation of the TangoDevInfo objects, if done on demand) and the second
+    time"""
+    build, lookup = MODES[mode]
+    db = _FakeDb(_rows(nb))
+    names = ['domain%02d/family%03d/MEMBER%06d' % (i % 50, i % 300, i)
+             for i in xrange(0, nb, max(1, nb // 10000))]
+    rss = _rss()
+    t0 = time.time()
+    cache = build(db)
+    t1 = time.time()
+    mem = _rss() - rss
+    lookup(cache, names)
+    t2 = time.time()
+    lookup(cache, names)
+    t3 = time.time()
+    print '%-10s %12.2f %12.1f %12.2f %12.2f' % (mode, t1 - t0, mem,
+                                                 1e3 * (t2 - t1),
+                                                 1e3 * (t3 - t2))
+
+
+def main(nb=100000):
+    print '%d devices' % nb
+    print '%-10s %12s %12s %12s %12s' % ('structure', 'build (s)',
+                                         'memory (MB)', '1st lookup',
+                                         '2nd lookup')
+    sys.stdout.flush()
+    for mode in ('legacy', 'columnar'):
+        subprocess.call([sys.executable, '-m', _MODULE, mode, str(nb)])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        run(sys.argv[1], int(sys.argv[2]))
+    else:
+        main(*[int(a) for a in sys.argv[1:2]])
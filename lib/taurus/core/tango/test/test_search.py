@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.tango.search"""
+
+__docformat__ = 'restructuredtext'
+
+
+from taurus.external import unittest
+from taurus.core.tango.search import (TangoSearchIndex, extend_regexp,
+                                      matchCl)
+
+
+NAMES = ['sys/tg_test/1', 'sys/tg_test/2', 'Sys/Database/2',
+         'lab/tg_test/1', 'lab/motor/m01', 'lab/motor/m02', 'odd/name',
+         'a/b/c/d']
+
+
+class TangoSearchIndexTestCase(unittest.TestCase):
+    """Checks that the index gives the same results as matching every name"""
+
+    def setUp(self):
+        self.index = TangoSearchIndex(NAMES)
+
+    def _check(self, expression):
+        expected = sorted((n for n in NAMES if matchCl(expression, n)),
+                          key=str.lower)
+        self.assertEqual(self.index.find(expression), expected)
+
+    def test_names(self):
+        self.assertEqual(len(self.index), len(NAMES))
+        self.assertEqual(self.index.names(), sorted(NAMES, key=str.lower))
+
+    def test_get(self):
+        self.assertEqual(self.index.get('SYS/DATABASE/2'), 'Sys/Database/2')
+        self.assertEqual(self.index.get('sys/tg_test'), None)
+
+    def test_find(self):
+        for expression in ('sys/tg_test/1', 'SYS/TG*', 'sys/*', '*motor*',
+                           'motor', 'lab/motor m0', 'lab/mo.*', 'odd',
+                           '.*/tg_test/[12]', 'nothing/*'):
+            self._check(expression)
+
+    def test_find_wildcard(self):
+        for expression in ('*/tg_test/*', '*/*/1', '*/b/*', '*/tg_test/1',
+                           '*/unknown/*'):
+            self._check(expression)
+            self._check(extend_regexp(expression))
+
+    def test_search(self):
+        self.assertEqual(self.index.search('lab/mo'),
+                         ['lab/motor/m01', 'lab/motor/m02'])
+        self.assertEqual(self.index.search('^l.b/tg'), ['lab/tg_test/1'])
+        self.assertEqual(self.index.search('lab/motor/m0?1'),
+                         ['lab/motor/m01'])
+        self.assertEqual(self.index.search('x|sys/d'), ['Sys/Database/2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
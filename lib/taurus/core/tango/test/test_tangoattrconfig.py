@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for the asynchronous configuration of
+taurus.core.tango.tangoattribute.TangoAttribute"""
+
+__docformat__ = 'restructuredtext'
+
+import threading
+
+import PyTango
+
+from taurus.external import unittest
+from taurus.core.taurusbasetypes import TaurusEventType
+from taurus.core.util.log import Logger
+from taurus.core.tango.tangoattribute import TangoAttribute
+
+
+class FakeDevice(Logger):
+    """Provides the members of TangoDevice used to fetch the configuration
+    of an attribute. The queries wait for :attr:`gate` to be set"""
+
+    def __init__(self, fail=False):
+        Logger.__init__(self, 'FakeDevice')
+        self.fail = fail
+        self.gate = threading.Event()
+
+    def attribute_query(self, name):
+        self.gate.wait(5)
+        if self.fail:
+            raise PyTango.DevFailed()
+        return 'info of %s' % name
+
+    def read_attribute(self, name):
+        return 'value of %s' % name
+
+    def getDeviceProxy(self):
+        return None
+
+
+class _Attribute(TangoAttribute):
+    """A TangoAttribute which does not decode the (fake) Tango objects"""
+
+    def _decodeAttrInfoEx(self, info=None):
+        self.info = info
+
+    def decode(self, value):
+        return value
+
+
+class AsyncConfigTestCase(unittest.TestCase):
+    """Test case for the events fired when the configuration is fetched
+    asynchronously"""
+
+    def _fetch(self, dev):
+        events = []
+        done = threading.Event()
+
+        def listener(src, evt_type, evt_value):
+            events.append((evt_type, evt_value))
+            done.set()
+        attr = _Attribute('tango://fakehost:10000/a/b/c/attr', dev,
+                          asyncConfig=True)
+        self.assertFalse(attr.isConfigReady())
+        attr.addListener(listener)
+        dev.gate.set()
+        self.assertTrue(done.wait(5))
+        self.assertTrue(attr.waitConfig(5))
+        return attr, events
+
+    def test_config(self):
+        """check that a Config event with the value is fired"""
+        attr, events = self._fetch(FakeDevice())
+        self.assertEqual(attr.info, 'info of attr')
+        self.assertEqual(events, [(TaurusEventType.Config, 'value of attr')])
+
+    def test_error(self):
+        """check that an Error event is fired if the configuration cannot be
+        fetched"""
+        attr, events = self._fetch(FakeDevice(fail=True))
+        self.assertEqual(len(events), 1)
+        evt_type, evt_value = events[0]
+        self.assertEqual(evt_type, TaurusEventType.Error)
+        self.assertIsInstance(evt_value, PyTango.DevFailed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for the decoding of TangoAttrValue. No Tango device is needed"""
+
+__docformat__ = 'restructuredtext'
+
+import numpy
+import PyTango
+
+from taurus.external import unittest
+from taurus.external.pint import Quantity
+from taurus.core.taurusbasetypes import DataFormat, DataType, AttrQuality
+from taurus.core.tango.enums import DevState
+from taurus.core.tango.tangoattribute import TangoAttrValue
+from taurus.core.tango.util.tango_taurus import (unit_from_tango,
+                                                 quality_from_tango)
+
+
+class _FakeAttr(object):
+    """Provides the members of TangoAttribute used by TangoAttrValue"""
+
+    def __init__(self, tango_type, data_format, taurus_type, unit):
+        self._tango_data_type = tango_type
+        self.data_format = data_format
+        self.type = taurus_type
+        self.setUnits(unit)
+
+    def setUnits(self, unit):
+        self._units = unit_from_tango(unit)
+        self._is_numerical = PyTango.is_numerical_type(self._tango_data_type,
+                                                       inc_array=True)
+        self._units_container = self._units._units
+
+
+def _dev_attr(value, w_value=None, quality=PyTango.AttrQuality.ATTR_VALID):
+    p = PyTango.DeviceAttribute()
+    p.value = value
+    p.w_value = w_value
+    p.quality = quality
+    p.time = PyTango.TimeVal.fromtimestamp(0)
+    return p
+
+
+def _eager_decode(attr, p):
+    """returns the members of the decoded value as they were decoded before
+    caching the numerical check and the units"""
+    numerical = PyTango.is_numerical_type(attr._tango_data_type,
+                                          inc_array=True)
+    rvalue = p.value
+    wvalue = p.w_value
+    units = attr._units
+    if numerical:
+        if rvalue is not None:
+            rvalue = Quantity(rvalue, units=units)
+        if wvalue is not None:
+            wvalue = Quantity(wvalue, units=units)
+    if isinstance(rvalue, PyTango._PyTango.DevState):
+        rvalue = DevState[str(rvalue)]
+    return dict(rvalue=rvalue, wvalue=wvalue, time=p.time,
+                quality=quality_from_tango(p.quality), error=None)
+
+
+def _cases():
+    return (
+        (_FakeAttr(PyTango.DevDouble, DataFormat._0D, DataType.Float, 'mm'),
+         _dev_attr(1.5, 2.5)),
+        (_FakeAttr(PyTango.DevLong, DataFormat._0D, DataType.Integer,
+                   PyTango.constants.UnitNotSpec),
+         _dev_attr(3, quality=PyTango.AttrQuality.ATTR_ALARM)),
+        (_FakeAttr(PyTango.DevDouble, DataFormat._1D, DataType.Float, 'mm'),
+         _dev_attr(numpy.arange(10.), numpy.arange(10.) + 1)),
+        (_FakeAttr(PyTango.DevShort, DataFormat._2D, DataType.Integer, 'K'),
+         _dev_attr(numpy.ones((3, 2), dtype='int16'))),
+        (_FakeAttr(PyTango.DevString, DataFormat._0D, DataType.String,
+                   PyTango.constants.UnitNotSpec),
+         _dev_attr('foo', 'bar')),
+        (_FakeAttr(PyTango.DevState, DataFormat._0D, DataType.DevState,
+                   PyTango.constants.UnitNotSpec),
+         _dev_attr(PyTango.DevState.ON)),
+    )
+
+
+class TangoAttrValueTestCase(unittest.TestCase):
+    """Test case for the decoding of PyTango.DeviceAttribute objects"""
+
+    def assertSameMember(self, value, expected):
+        if isinstance(expected, Quantity):
+            self.assertIsInstance(value, Quantity)
+            self.assertEqual(value.units, expected.units)
+            self.assertTrue(numpy.array_equal(value.magnitude,
+                                              expected.magnitude))
+        elif isinstance(expected, numpy.ndarray):
+            self.assertTrue(numpy.array_equal(value, expected))
+        else:
+            self.assertEqual(value, expected)
+            self.assertEqual(type(value), type(expected))
+
+    def test_decode(self):
+        """check that the values decode as before caching the numerical
+        check and the units"""
+        for attr, p in _cases():
+            v = TangoAttrValue(attr, p)
+            expected = _eager_decode(attr, p)
+            self.assertEqual(v.time.totime(), expected.pop('time').totime())
+            for name, member in expected.items():
+                self.assertSameMember(getattr(v, name), member)
+
+    def test_reference(self):
+        """check that the read arrays are not copied"""
+        attr, p = _cases()[2]
+        v = TangoAttrValue(attr, p)
+        self.assertIs(v.rvalue.magnitude, p.value)
+
+    def test_enumerations(self):
+        """check the cached decoding of states and qualities"""
+        attr, p = _cases()[-1]
+        self.assertIs(TangoAttrValue(attr, p).rvalue, DevState.ON)
+        self.assertIs(TangoAttrValue(attr, p).rvalue, DevState.ON)
+        attr, p = _cases()[1]
+        for _ in range(2):
+            self.assertEqual(TangoAttrValue(attr, p).quality,
+                             AttrQuality.ATTR_ALARM)
+
+
+class LazyTangoAttrValueTestCase(unittest.TestCase):
+    """Test case for the decoding of the members of TangoAttrValue on first
+    access"""
+
+    def test_lazy(self):
+        """check that the members are decoded only when accessed (and only
+        once)"""
+        attr, p = _cases()[0]
+        v = TangoAttrValue(attr, p)
+        for name in TangoAttrValue._lazy_members:
+            self.assertNotIn(name, v.__dict__)
+        rvalue = v.rvalue
+        self.assertIs(v.__dict__['rvalue'], rvalue)
+        self.assertIs(v.rvalue, rvalue)
+        self.assertNotIn('wvalue', v.__dict__)
+
+    def test_all_members(self):
+        """check that accessing the members in any order gives the same
+        value as decoding them all at once"""
+        for attr, p in _cases():
+            v1, v2 = TangoAttrValue(attr, p), TangoAttrValue(attr, p)
+            repr(v1)  # decodes all the members
+            for name in reversed(TangoAttrValue._lazy_members):
+                m1, m2 = v1.__dict__[name], getattr(v2, name)
+                if name == 'time':
+                    self.assertEqual(m1.totime(), m2.totime())
+                elif isinstance(m1, (numpy.ndarray, Quantity)):
+                    self.assertTrue(numpy.all(m1 == m2))
+                else:
+                    self.assertEqual(m1, m2)
+
+    def test_set(self):
+        """check that the members can be set before being decoded"""
+        attr, p = _cases()[0]
+        v = TangoAttrValue(attr, p)
+        v.rvalue = 7
+        v.error = 'error'
+        self.assertEqual(v.rvalue, 7)
+        self.assertEqual(v.error, 'error')
+        self.assertEqual(v.wvalue, Quantity(2.5, 'mm'))
+
+    def test_config_change(self):
+        """check that a value decodes with the units of the attribute when it
+        was received"""
+        attr, p = _cases()[0]
+        v = TangoAttrValue(attr, p)
+        attr.setUnits('s')
+        self.assertEqual(v.rvalue, Quantity(1.5, 'mm'))
+        self.assertEqual(TangoAttrValue(attr, p).rvalue, Quantity(1.5, 's'))
+
+    def test_without_attribute(self):
+        """check the values not bound to an attribute"""
+        v = TangoAttrValue()
+        self.assertIsNone(v.rvalue)
+        self.assertIsNone(v.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
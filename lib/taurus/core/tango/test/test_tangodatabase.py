@@ -0,0 +1,549 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.tango.tangodatabase"""
+
+__docformat__ = 'restructuredtext'
+
+import time
+import zlib
+import json
+import shutil
+import tempfile
+import threading
+
+from PyTango import DevFailed
+
+from taurus.external import unittest
+from taurus import tauruscustomsettings
+from taurus.core.taurusbasetypes import TaurusDevState
+from taurus.core.tango import tangodatabase
+from taurus.core.util.log import Logger
+from taurus.core.tango.tangodatabase import TangoDatabaseCache, TangoAuthority
+
+
+ROWS = [('sys/tg_test/1', '', '1', 'host1', 'TangoTest/test', 'TangoTest'),
+        ('sys/tg_test/2', 'tg2', '0', 'host2', 'TangoTest/test',
+         'TangoTest'),
+        ('sys/database/2', '', '1', 'host1', 'DataBaseds/2', 'DataBase'),
+        ('lab/motor/m01', 'mot01', '1', 'host2', 'Motors/lab', 'Motor'),
+        ('lab/motor/m02', '', '1', 'host2', 'Motors/lab', 'Motor'),
+        ('not_a_device', '', '1', 'host1', 'Bad/1', 'Bad')]
+
+
+class FakeAttrInfo(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeDeviceProxy(object):
+    """Provides the members of DeviceProxy used to query the attributes.
+    The time each device takes to reply is given by :attr:`delays` and the
+    number of queries of each device is recorded in :attr:`queries`"""
+
+    delays = {}
+    queries = {}
+    lock = threading.Lock()
+
+    def __init__(self, full_name):
+        self.dev_name = full_name.split('/', 3)[-1]
+        self.timeout = 3
+
+    def set_timeout_millis(self, timeout):
+        self.timeout = timeout / 1000.
+
+    def attribute_list_query_ex(self):
+        with self.lock:
+            self.queries[self.dev_name] = self.queries.get(self.dev_name, 0) + 1
+        delay = self.delays.get(self.dev_name, 0)
+        if delay > self.timeout:
+            time.sleep(self.timeout)
+            raise DevFailed()
+        time.sleep(delay)
+        return [FakeAttrInfo('State'), FakeAttrInfo('Double_Scalar')]
+
+
+class FakeFactory(object):
+
+    def getDevice(self, name, create_if_needed=True):
+        return None
+
+
+class FakeDb(object):
+    """Provides the members of TangoAuthority used by TangoDatabaseCache.
+    The rows of the device table can be changed with :meth:`setRows`"""
+
+    def __init__(self, rows=ROWS, stamp=(1, 1)):
+        self.queries = []
+        self.aliases = {}
+        self.setRows(rows, stamp)
+
+    def setRows(self, rows, stamp):
+        self.rows, self.stamp = list(rows), stamp
+
+    def command_inout(self, cmd, query):
+        assert cmd == "DbMySqlSelect"
+        self.queries.append(query)
+        if query == TangoDatabaseCache.StampQuery:
+            rows = [self.stamp]
+        elif query == TangoDatabaseCache.DevicesQuery:
+            rows = self.rows
+        else:
+            raise Exception('unexpected query %r' % query)
+        data = [str(v) for row in rows for v in row]
+        return [len(rows), len(rows[0])], data
+
+    def getFullName(self):
+        return 'tango://fakehost:10000'
+
+    def factory(self):
+        return FakeFactory()
+
+    def _setAliases(self, pairs):
+        self.aliases = dict(pairs)
+
+
+class TangoDatabaseCacheTestCase(unittest.TestCase):
+    """Test case for the TangoDatabaseCache loading and its snapshots"""
+
+    def setUp(self):
+        self.snapshot_dir = tempfile.mkdtemp()
+        self._dir = getattr(tauruscustomsettings, 'TANGO_DB_SNAPSHOT_DIR',
+                            None)
+        tauruscustomsettings.TANGO_DB_SNAPSHOT_DIR = None
+
+    def tearDown(self):
+        tauruscustomsettings.TANGO_DB_SNAPSHOT_DIR = self._dir
+        shutil.rmtree(self.snapshot_dir)
+
+    def _enableSnapshots(self):
+        tauruscustomsettings.TANGO_DB_SNAPSHOT_DIR = self.snapshot_dir
+
+    def _waitCheck(self):
+        for t in threading.enumerate():
+            if t.name == "TangoDatabaseSnapshotCheck":
+                t.join(5)
+
+    def test_load(self):
+        """check the contents loaded from the device table"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        self.assertEqual(db.queries, [TangoDatabaseCache.DevicesQuery])
+        self.assertEqual(cache.getDeviceNames(),
+                         ['lab/motor/m01', 'lab/motor/m02', 'sys/database/2',
+                          'sys/tg_test/1', 'sys/tg_test/2'])
+        self.assertEqual(cache.getExportedDeviceNames(),
+                         ['lab/motor/m01', 'lab/motor/m02', 'sys/database/2',
+                          'sys/tg_test/1'])
+        self.assertEqual(cache.getAliasNames(), ['mot01', 'tg2'])
+        self.assertEqual(cache.getServerNames(),
+                         ['DataBaseds/2', 'Motors/lab', 'TangoTest/test'])
+        self.assertEqual(cache.getClassNames(),
+                         ['DataBase', 'Motor', 'TangoTest'])
+        dev = cache.getDevice('SYS/TG_TEST/2')
+        self.assertEqual(dev.name(), 'sys/tg_test/2')
+        self.assertEqual(dev.alias(), 'tg2')
+        self.assertEqual(dev.host(), 'host2')
+        self.assertFalse(dev.exported())
+        self.assertEqual(dev.server().name(), 'TangoTest/test')
+        self.assertEqual(dev.klass().name(), 'TangoTest')
+        self.assertIs(cache.getDevice('sys/tg_test/2'), dev)
+        self.assertIsNone(cache.getDevice('not_a_device'))
+        self.assertEqual(db.aliases['sys/tg_test/2'], 'tg2')
+        self.assertIsNone(db.aliases['sys/tg_test/1'])
+
+    def test_refresh_without_snapshots(self):
+        """check that the stamp is not queried if snapshots are disabled"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        cache.refresh()
+        self.assertNotIn(TangoDatabaseCache.StampQuery, db.queries)
+
+    def test_snapshot(self):
+        """check that a valid snapshot is used instead of the device table"""
+        self._enableSnapshots()
+        TangoDatabaseCache(FakeDb())
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        self._waitCheck()
+        self.assertEqual(db.queries, [TangoDatabaseCache.StampQuery])
+        self.assertEqual(len(cache.getDeviceNames()), 5)
+        self.assertEqual(cache.getDevice('lab/motor/m01').alias(), 'mot01')
+
+    def test_invalid_snapshot(self):
+        """check that the snapshots which are not valid are ignored"""
+        self._enableSnapshots()
+        db = FakeDb()
+        first = TangoDatabaseCache(db)
+        fname = first.getSnapshotFileName()
+        row = list(ROWS[0][:2]) + [1] + list(ROWS[0][3:])
+        for data in ('cos\nsystem\n(S"true"\ntR.',
+                     json.dumps([2, ['1', '1'], [row[:5]]]),
+                     json.dumps([2, ['1', '1'], [row[:2] + [2] + row[3:]]]),
+                     json.dumps([2, ['1', 1], [row]])):
+            with open(fname, 'wb') as f:
+                f.write(zlib.compress(data))
+            self.assertFalse(first.loadSnapshot())
+            other = FakeDb()
+            cache = TangoDatabaseCache(other)
+            self.assertIn(TangoDatabaseCache.DevicesQuery, other.queries)
+            self.assertEqual(len(cache.getDeviceNames()), 5)
+
+    def test_stamp_mismatch(self):
+        """check that an outdated snapshot is patched and saved again"""
+        self._enableSnapshots()
+        TangoDatabaseCache(FakeDb())
+        rows = ROWS[1:] + [('lab/motor/m03', '', '1', 'host3', 'Motors/new',
+                            'Motor')]
+        rows[0] = rows[0][:1] + ('tg2b',) + rows[0][2:]
+        db = FakeDb(rows, stamp=(2, 2))
+        cache = TangoDatabaseCache(db)
+        self._waitCheck()
+        self.assertEqual(db.queries, [TangoDatabaseCache.StampQuery,
+                                      TangoDatabaseCache.DevicesQuery])
+        self.assertIsNone(cache.getDevice('sys/tg_test/1'))
+        self.assertEqual(cache.getDevice('sys/tg_test/2').alias(), 'tg2b')
+        self.assertEqual(cache.getDevice('lab/motor/m03').server().name(),
+                         'Motors/new')
+        self.assertEqual(cache.getAliasNames(), ['mot01', 'tg2b'])
+        # the new snapshot is valid for the new stamp
+        db2 = FakeDb(rows, stamp=(2, 2))
+        cache2 = TangoDatabaseCache(db2)
+        self._waitCheck()
+        self.assertEqual(db2.queries, [TangoDatabaseCache.StampQuery])
+        self.assertEqual(cache2.getDeviceNames(), cache.getDeviceNames())
+
+    def test_patch(self):
+        """check that only the devices which changed are patched"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        unchanged = cache.getDevice('lab/motor/m02')
+        server = cache.servers()['DataBaseds/2']
+        rows = [r for r in ROWS if r[0] != 'sys/database/2']
+        rows.append(('lab/motor/m03', '', '0', 'host2', 'Motors/lab',
+                     'Motor'))
+        self.assertEqual(cache._patch(rows), 2)
+        self.assertIs(cache.getDevice('lab/motor/m02'), unchanged)
+        self.assertNotIn('DataBaseds/2', cache.servers())
+        self.assertNotIn('DataBase', cache.klasses())
+        self.assertEqual(server.devices().items(), [])
+        self.assertEqual(sorted(cache.servers()['Motors/lab'].getDeviceNames()),
+                         ['lab/motor/m01', 'lab/motor/m02', 'lab/motor/m03'])
+        self.assertEqual(cache.getDeviceMemberNames('lab', 'motor'),
+                         ['m01', 'm02', 'm03'])
+        self.assertEqual(cache._patch(rows), 0)
+
+    def test_levels(self):
+        """check the domain, family and member lookups"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        self.assertEqual(cache.getDeviceDomainNames(), ['lab', 'sys'])
+        self.assertEqual(cache.getDeviceFamilyNames('SYS'),
+                         ['database', 'tg_test'])
+        self.assertEqual(cache.getDeviceFamilyNames('other'), [])
+        self.assertEqual(cache.getDeviceMemberNames('sys', 'TG_Test'),
+                         ['1', '2'])
+        self.assertEqual(cache.getDeviceMemberNames('sys', 'tg'), [])
+        self.assertEqual([d.name() for d in cache.getDomainDevices('Lab')],
+                         ['lab/motor/m01', 'lab/motor/m02'])
+        self.assertEqual([d.name() for d in
+                          cache.getFamilyDevices('sys', 'database')],
+                         ['sys/database/2'])
+        self.assertEqual(cache.getFamilyDevices('sys', 'data'), [])
+
+    def test_servers(self):
+        """check the server and class lookups"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        servers = cache.servers()
+        self.assertEqual(sorted(servers),
+                         ['DataBaseds/2', 'Motors/lab', 'TangoTest/test'])
+        server = servers['TangoTest/test']
+        self.assertEqual(sorted(server.getDeviceNames()),
+                         ['sys/tg_test/1', 'sys/tg_test/2'])
+        self.assertEqual(server.getClassNames(), ['TangoTest'])
+        self.assertIs(cache.getDevice('sys/tg_test/1').server(), server)
+        klass = cache.klasses()['Motor']
+        self.assertEqual(sorted(klass.getDeviceNames()),
+                         ['lab/motor/m01', 'lab/motor/m02'])
+
+    def test_aliases(self):
+        """check the alias lookups, also after a patch"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        aliases = cache.aliases()
+        self.assertEqual(sorted(aliases), ['mot01', 'tg2'])
+        self.assertIn('TG2', aliases)
+        self.assertNotIn('sys/tg_test/2', aliases)
+        self.assertIs(aliases['tg2'], cache.getDevice('sys/tg_test/2'))
+        rows = [r for r in ROWS if r[0] != 'sys/tg_test/2']
+        rows.append(('lab/motor/m02', 'mot02', '1', 'host2', 'Motors/lab',
+                     'Motor'))
+        cache._patch(rows)
+        self.assertEqual(sorted(aliases), ['mot01', 'mot02'])
+        self.assertNotIn('tg2', aliases)
+        self.assertEqual(aliases['MOT02'].name(), 'lab/motor/m02')
+        self.assertEqual(cache.getAliasNames(), ['mot01', 'mot02'])
+
+    def test_concurrent_patch(self):
+        """check that the cache can be read while it is being patched"""
+        db = FakeDb()
+        cache = TangoDatabaseCache(db)
+        other = [r for r in ROWS if not r[0].startswith('lab/')]
+        errors, stop = [], threading.Event()
+
+        def patch():
+            try:
+                while not stop.is_set():
+                    cache._patch(other)
+                    cache._patch(ROWS)
+            except Exception, e:
+                errors.append(e)
+        t = threading.Thread(target=patch)
+        t.start()
+        try:
+            for _ in range(500):
+                for name in cache.devices():
+                    self.assertIsNotNone(name)
+                cache.getDeviceMemberNames('lab', 'motor')
+                cache.getDeviceDomainNames()
+                for server in cache.servers().values():
+                    server.getDeviceNames()
+                    dict(server.devices().items())
+        finally:
+            stop.set()
+            t.join()
+        self.assertEqual(errors, [])
+
+
+class TangoDatabaseCacheAttributesTestCase(unittest.TestCase):
+    """Test case for the refresh of the attribute lists of the devices"""
+
+    def setUp(self):
+        self._dir = getattr(tauruscustomsettings, 'TANGO_DB_SNAPSHOT_DIR',
+                            None)
+        tauruscustomsettings.TANGO_DB_SNAPSHOT_DIR = None
+        self._DeviceProxy = tangodatabase.DeviceProxy
+        tangodatabase.DeviceProxy = FakeDeviceProxy
+        FakeDeviceProxy.delays = {}
+        FakeDeviceProxy.queries = {}
+        self.db = FakeDb()
+        self.cache = TangoDatabaseCache(self.db)
+
+    def tearDown(self):
+        tangodatabase.DeviceProxy = self._DeviceProxy
+        tauruscustomsettings.TANGO_DB_SNAPSHOT_DIR = self._dir
+
+    def _devices(self, *names):
+        return [self.cache.getDevice(name) for name in names]
+
+    def test_callback(self):
+        """check that the devices are notified as soon as they complete"""
+        FakeDeviceProxy.delays['sys/tg_test/1'] = .3
+        devices = self._devices('sys/tg_test/1', 'lab/motor/m01',
+                                'lab/motor/m02')
+        notified, done = [], threading.Event()
+
+        def callback(device):
+            notified.append(device.name())
+            if len(notified) == len(devices):
+                done.set()
+        t0 = time.time()
+        self.assertIsNone(self.cache.refreshAttributes(devices,
+                                                       callback=callback))
+        self.assertLess(time.time() - t0, .2)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(notified[-1], 'sys/tg_test/1')
+        for device in devices:
+            self.assertTrue(device.attributesCached())
+            self.assertEqual([a.name() for a in device.attributes()],
+                             ['double_scalar', 'state'])
+        self.assertEqual(devices[0].getAttribute('State').fullName(),
+                         'tango://fakehost:10000/sys/tg_test/1/state')
+
+    def test_timeout(self):
+        """check that a hung device only delays itself"""
+        FakeDeviceProxy.delays['sys/tg_test/1'] = 10
+        devices = self._devices('sys/tg_test/1', 'lab/motor/m01')
+        t0 = time.time()
+        refreshed = self.cache.refreshAttributes(devices, timeout=.2)
+        self.assertLess(time.time() - t0, 1)
+        self.assertEqual(refreshed, devices[::-1])
+        self.assertEqual(devices[0].attributes(), [])
+        self.assertEqual(devices[0].state(), TaurusDevState.NotReady)
+        self.assertEqual(len(devices[1].attributes()), 2)
+
+    def test_ttl(self):
+        """check that the attribute lists expire after the TTL"""
+        self.cache.setAttributesTTL(.2)
+        device = self.cache.getDevice('lab/motor/m01')
+        self.assertFalse(device.attributesCached())
+        device.attributes()
+        device.attributes()
+        self.assertEqual(FakeDeviceProxy.queries['lab/motor/m01'], 1)
+        self.assertTrue(device.attributesCached())
+        time.sleep(.3)
+        self.assertFalse(device.attributesCached())
+        device.attributes()
+        self.assertEqual(FakeDeviceProxy.queries['lab/motor/m01'], 2)
+        self.cache.setAttributesTTL(None)
+        time.sleep(.3)
+        self.assertTrue(device.attributesCached())
+
+    def test_inflight(self):
+        """check that a device being refreshed is not queried again"""
+        FakeDeviceProxy.delays['lab/motor/m01'] = .3
+        device, = self._devices('lab/motor/m01')
+        self.cache.refreshAttributes([device], callback=lambda d: None)
+        self.assertTrue(self.cache.isRefreshingAttributes(device))
+        self.assertEqual(len(device.attributes()), 2)
+        self.assertEqual(self.cache.refreshAttributes([device]), [device])
+        self.assertEqual(FakeDeviceProxy.queries['lab/motor/m01'], 2)
+        self.assertFalse(self.cache.isRefreshingAttributes(device))
+
+    def test_nested(self):
+        """check that refreshing from a worker of the pool does not dead
+        lock"""
+        self.cache.AttributesPoolSize = 1
+        first, second = self._devices('lab/motor/m01', 'lab/motor/m02')
+        done = threading.Event()
+
+        def callback(device):
+            self.cache.refreshAttributes([second])
+            done.set()
+        self.cache.refreshAttributes([first], callback=callback)
+        self.assertTrue(done.wait(5))
+        self.assertTrue(second.attributesCached())
+
+
+class FakeAuthority(TangoAuthority):
+    """A TangoAuthority without database connection. The device name <->
+    alias correspondences are given by :attr:`pairs` and the queries are
+    recorded in :attr:`queries`. The bulk query fails if :attr:`bulk` is
+    False"""
+
+    def __init__(self, pairs):
+        Logger.__init__(self, 'FakeAuthority')
+        self.dbObj = None
+        self._alias_ttl = self.DefaultAliasTTL
+        self._aliases = self._alias_names = None
+        self.pairs = list(pairs)
+        self.queries = []
+        self.bulk = True
+
+    def getTangoDB(self):
+        return self
+
+    def command_inout(self, cmd, query):
+        self.queries.append(query)
+        if not self.bulk:
+            raise DevFailed()
+        data = [v or '' for pair in self.pairs for v in pair]
+        return [len(self.pairs), 2], data
+
+    def get_alias(self, full_name):
+        self.queries.append(('get_alias', full_name))
+        for name, alias in self.pairs:
+            if name.lower() == full_name.lower() and alias:
+                return alias
+        raise DevFailed()
+
+    def get_device_from_alias(self, alias):
+        self.queries.append(('get_device_from_alias', alias))
+        for name, a in self.pairs:
+            if a and a.lower() == alias.lower():
+                return name
+        raise DevFailed()
+
+
+class TangoAuthorityAliasesTestCase(unittest.TestCase):
+    """Test case for the cache of aliases of TangoAuthority"""
+
+    PAIRS = [('sys/tg_test/1', None), ('sys/tg_test/2', 'tg2'),
+             ('lab/motor/m01', 'mot01')]
+
+    def setUp(self):
+        self.db = FakeAuthority(self.PAIRS)
+
+    def test_bulk(self):
+        """check that the aliases are loaded with a single query"""
+        db = self.db
+        self.assertEqual(db.getElementAlias('sys/tg_test/2'), 'tg2')
+        self.assertEqual(db.getElementAlias('LAB/Motor/M01'), 'mot01')
+        self.assertEqual(db.getElementAlias('sys/tg_test/1'), None)
+        self.assertEqual(db.getElementFullName('TG2'), 'sys/tg_test/2')
+        self.assertEqual(db.getElementFullName('mot01'), 'lab/motor/m01')
+        self.assertEqual(db.queries, ["SELECT name, alias FROM device"])
+
+    def test_unknown(self):
+        """check that the unknown names are queried once"""
+        db = self.db
+        self.assertEqual(db.getElementAlias('a/b/c'), None)
+        self.assertEqual(db.getElementAlias('a/b/c'), None)
+        self.assertEqual(db.getElementFullName('nada'), None)
+        self.assertEqual(db.getElementFullName('nada'), None)
+        self.assertEqual(db.queries[1:], [('get_alias', 'a/b/c'),
+                                          ('get_device_from_alias', 'nada')])
+
+    def test_ttl(self):
+        """check that the expired correspondences are queried again"""
+        db = self.db
+        db._alias_ttl = .1
+        self.assertEqual(db.getElementAlias('sys/tg_test/2'), 'tg2')
+        db.pairs[1] = ('sys/tg_test/2', 'tg2bis')
+        self.assertEqual(db.getElementAlias('sys/tg_test/2'), 'tg2')
+        time.sleep(.2)
+        self.assertEqual(db.getElementAlias('sys/tg_test/2'), 'tg2bis')
+        self.assertEqual(db.getElementFullName('tg2bis'), 'sys/tg_test/2')
+        self.assertEqual(db.queries[1:], [('get_alias', 'sys/tg_test/2')])
+
+    def test_refresh(self):
+        """check that refreshAliases replaces the correspondences"""
+        db = self.db
+        self.assertEqual(db.getElementFullName('mot01'), 'lab/motor/m01')
+        db.pairs[2] = ('lab/motor/m01', 'm01')
+        db.refreshAliases()
+        self.assertEqual(db.getElementAlias('lab/motor/m01'), 'm01')
+        self.assertEqual(db.getElementFullName('m01'), 'lab/motor/m01')
+        self.assertEqual(db.getElementFullName('mot01'), None)
+        self.assertEqual(db.queries[2:],
+                         [('get_device_from_alias', 'mot01')])
+
+    def test_without_bulk(self):
+        """check that each alias is queried if the bulk query fails"""
+        db = self.db
+        db.bulk = False
+        self.assertEqual(db.getElementAlias('sys/tg_test/2'), 'tg2')
+        self.assertEqual(db.getElementAlias('sys/tg_test/2'), 'tg2')
+        self.assertEqual(db.getElementFullName('tg2'), 'sys/tg_test/2')
+        self.assertEqual(db.getElementFullName('mot01'), 'lab/motor/m01')
+        self.assertEqual(db.queries[1:],
+                         [('get_alias', 'sys/tg_test/2'),
+                          ('get_device_from_alias', 'mot01')])
+
+
+if __name__ == '__main__':
+    unittest.main()
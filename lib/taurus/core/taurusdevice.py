@@ -120,9 +120,17 @@ class TaurusDevice(TaurusModel):
         obj_name = "%s%s" % (self.getFullName(), child_name)
         return self.factory().findObject(obj_name)
 
-    def poll(self, attrs, asynch=False, req_id=None):
+    def poll(self, attrs, asynch=False, req_id=None, timeout=None):
         '''Polling certain attributes of the device. This default
-        implementation simply polls each attribute one by one'''
+        implementation simply polls each attribute one by one.
+
+        When collecting the reply of an asynchronous request (req_id is not
+        None), implementations supporting it wait at most `timeout` seconds
+        (None means forever) and return False if the reply did not arrive in
+        time (after notifying the attributes of the error). A timeout of 0
+        only checks the reply without waiting and returns None if it has not
+        arrived yet (the request stays pending). This default
+        implementation is synchronous and ignores the timeout'''
 
         # asynchronous requests are not supported. If asked to do it,
         # just return an ID of 1 and in the reply (req_id != None) we do a
@@ -131,6 +139,7 @@ class TaurusDevice(TaurusModel):
             return 1
         for attr in attrs.values():
             attr.poll()
+        return True
 
     @property
     def description(self):
@@ -168,6 +168,28 @@ class TaurusFactory(object):
         raise NotImplementedError("getAttribute cannot be called for abstract" \
                            " TaurusFactory")
 
+    def getAttributes(self, attr_names):
+        """Obtain the objects corresponding to the given attribute names.
+        The names which are not valid attribute names and the attributes
+        which cannot be created get None.
+
+        This default implementation calls :meth:`getAttribute` for each name.
+        Reimplement it if the scheme can create many attributes more
+        efficiently.
+
+        :param attr_names: (seq<str>) attribute names
+
+        :return: (list<TaurusAttribute or None>) the attributes, in the same
+                 order as the given names
+        """
+        ret = []
+        for name in attr_names:
+            try:
+                ret.append(self.getAttribute(name))
+            except Exception:
+                ret.append(None)
+        return ret
+
     def getAuthorityNameValidator(self):
         raise NotImplementedError("getAuthorityNameValidator cannot be called" \
                                   " for abstract TaurusFactory")
@@ -27,7 +27,8 @@
 
 __all__ = ['check_dependencies', 'log_dependencies', 'getSchemeFromName',
            'getValidTypesForName', 'isValidName', 'makeSchemeExplicit',
-           'Manager', 'Factory', 'Device', 'Attribute', 'Configuration',
+           'Manager', 'Factory', 'Device', 'Attribute', 'Attributes',
+           'Configuration',
            'Database', 'Authority', 'Object', 'Logger',
            'Critical', 'Error', 'Warning', 'Info', 'Debug', 'Trace',
            'setLogLevel', 'setLogFormat', 'getLogLevel', 'getLogFormat',
@@ -496,6 +497,36 @@ def Attribute(dev_or_attr_name, attr_name=None):
             dev = dev_or_attr_name
         return dev.getAttribute(attr_name)
 
+def Attributes(attr_names):
+    """Returns the taurus attributes for the given full attribute names.
+    The attributes of each scheme are obtained in bulk with
+    :meth:`TaurusFactory.getAttributes`, which is faster than calling
+    :func:`Attribute` for each name when many attributes have to be created.
+
+    Names which are not valid attribute names get None (no exception is
+    raised), so a list of arbitrary model names can be passed.
+
+    :param attr_names: (seq<str>) full attribute names
+    :return: (list<TaurusAttribute or None>) the attributes, in the same
+             order as the given names"""
+    ret = [None] * len(attr_names)
+    by_scheme = {}
+    for i, name in enumerate(attr_names):
+        try:
+            scheme = getSchemeFromName(name)
+        except Exception:
+            continue
+        by_scheme.setdefault(scheme, []).append(i)
+    for scheme, indexes in by_scheme.iteritems():
+        try:
+            factory = Factory(scheme=scheme)
+        except Exception:
+            continue
+        attrs = factory.getAttributes([attr_names[i] for i in indexes])
+        for i, attr in zip(indexes, attrs):
+            ret[i] = attr
+    return ret
+
 @tep14_deprecation( alt='Attribute')
 def Configuration(attr_or_conf_name, conf_name=None):
     """Returns the taurus configuration for either the pair (attribute name, conf name) 
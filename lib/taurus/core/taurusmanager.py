@@ -30,11 +30,13 @@ __all__ = ["TaurusManager"]
 __docformat__ = "restructuredtext"
 
 import os
+import time
 import atexit
+import threading
 
 from .util.singleton import Singleton
 from .util.log import Logger, tep14_deprecation
-from .util.threadpool import ThreadPool
+from .util.threadpool import ThreadPool, CoalescingThreadPool
 
 from .taurusbasetypes import OperationMode, ManagerState, TaurusSerializationMode
 from .taurusauthority import TaurusAuthority
@@ -60,6 +62,10 @@ class TaurusManager(Singleton, Logger):
     PLUGIN_KEY = "__taurus_plugin__"
     
     DefaultSerializationMode = TaurusSerializationMode.Concurrent
+    DefaultPoolSize = 5
+    DefaultEventQueueSize = 1000
+    #: minimum interval (seconds) between the warnings about dropped events
+    DroppedEventsWarningInterval = 10.0
     default_scheme = getattr(tauruscustomsettings, 'DEFAULT_SCHEME', "tango")
 
     def __init__(self):
@@ -83,14 +89,29 @@ class TaurusManager(Singleton, Logger):
         this_path = os.path.abspath(__file__)
         self._this_path = os.path.dirname(this_path)
         self._serialization_mode = self.DefaultSerializationMode
+        # events dropped since the last warning (see dispatchEvent)
+        self._drop_lock = threading.Lock()
+        self._drops = 0
+        self._next_drop_warning = 0
         if self._serialization_mode == TaurusSerializationMode.Concurrent:
+            pool_size = getattr(tauruscustomsettings, 'MANAGER_POOL_SIZE',
+                                self.DefaultPoolSize)
+            queue_size = getattr(tauruscustomsettings, 'EVENT_QUEUE_SIZE',
+                                 self.DefaultEventQueueSize)
             self._thread_pool = ThreadPool(name="TaurusTP",
                                            parent=self,
-                                           Psize=5,
+                                           Psize=pool_size,
                                            Qsize=1000)
+            self._event_pool = CoalescingThreadPool(name="TaurusEventTP",
+                                                    parent=self,
+                                                    Psize=pool_size,
+                                                    Qsize=queue_size)
         else:
             self._thread_pool = None
+            self._event_pool = None
         self._plugins = None
+        self._scheme_entries = None
+        self._unscanned_modules = None
         
         self._initial_default_scheme = self.default_scheme
         
@@ -109,6 +130,8 @@ class TaurusManager(Singleton, Logger):
         
         self._thread_pool.join()
         self._thread_pool = None
+        self._event_pool.join()
+        self._event_pool = None
         
         self._state = ManagerState.CLEANED
 
@@ -130,6 +153,63 @@ class TaurusManager(Singleton, Logger):
         else:
             job(*args, **kw)
     
+    def dispatchEvent(self, model, event_type, event_value, listeners=None):
+        """Sends an event of the given model to its listeners. In concurrent
+        mode the event is queued and sent by a separate thread. Only the
+        latest pending event of each (model, event_type) is kept: if an event
+        of the same model and type is still waiting to be sent, it is
+        replaced by the new one. This method never blocks (if the queue is
+        full the event is dropped and a warning is logged, see
+        :attr:`DroppedEventsWarningInterval`)
+
+        :param model: (taurus.core.taurusmodel.TaurusModel) the event source
+        :param event_type: (taurus.core.taurusbasetypes.TaurusEventType) type
+                           of event
+        :param event_value: (object) event value
+        :param listeners: (sequence or None) the listeners. If None, all
+                          listeners of the model
+        """
+        if self._serialization_mode == TaurusSerializationMode.Concurrent:
+            pool = getattr(self, "_event_pool", None)
+            if pool is None:
+                self.info("Event cannot be dispatched.")
+                self.debug("The requested event cannot be dispatched. Make sure this manager is initialized")
+                return
+            if not pool.add((model, event_type), model.fireEvent, None,
+                            event_type, event_value, listeners=listeners):
+                self._eventDropped(pool, model, event_type)
+        else:
+            model.fireEvent(event_type, event_value, listeners=listeners)
+
+    def _eventDropped(self, pool, model, event_type):
+        """warns that events are being dropped: on the first drop and then at
+        most once every :attr:`DroppedEventsWarningInterval` seconds (the
+        exact count is given by :meth:`getPoolStats`)"""
+        now = time.time()
+        with self._drop_lock:
+            self._drops += 1
+            if now < self._next_drop_warning:
+                return
+            drops, self._drops = self._drops, 0
+            self._next_drop_warning = now + self.DroppedEventsWarningInterval
+        self.warning("Event queue full (EVENT_QUEUE_SIZE=%d). %d event(s) "
+                     "dropped since the last warning (the latest, a %s "
+                     "event of %s)", pool.maxsize, drops, event_type, model)
+
+    def getPoolStats(self):
+        """Returns the metrics of the job and event dispatch thread pools.
+        See :meth:`taurus.core.util.threadpool.ThreadPool.getStats` and
+        :meth:`taurus.core.util.threadpool.CoalescingThreadPool.getStats`
+
+        :return: (dict) a dictionary with the keys 'jobs' and 'events' (whose
+                 values are None if the manager is not in concurrent mode)
+        """
+        ret = {}
+        for key, pool in (('jobs', getattr(self, "_thread_pool", None)),
+                          ('events', getattr(self, "_event_pool", None))):
+            ret[key] = pool and pool.getStats()
+        return ret
+
     def setSerializationMode(self, mode):
         """Sets the serialization mode for the system.
         
@@ -168,16 +248,32 @@ class TaurusManager(Singleton, Logger):
         
         :return: (taurus.core.taurusfactory.TaurusFactory) the default taurus factory
         """
-        return self.getPlugins().get(self.default_scheme, None)
+        return self.getFactory(self.default_scheme)
         
     def getPlugins(self):
-        """Gives the information about the existing plugins
+        """Gives the information about the existing plugins. Note that this
+        imports the modules of all the schemes (see :meth:`getFactory`)
         
         :return: (dict<str, class taurus.core.taurusfactory.TaurusFactory>)the list of plugins
         """
-        if self._plugins is None:
-            self._plugins = self._build_plugins()
-        return self._plugins
+        for scheme in self.getSchemeRegistry():
+            self._loadPlugin(scheme)
+        self._scanPluginModules()
+        return dict((k, v) for k, v in self._plugins.items() if v is not None)
+
+    def getSchemeRegistry(self):
+        """Gives the schemes declared by the taurus plugins (see the
+        __taurus_plugin__ files of the taurus.core subpackages). The registry
+        is built (without importing the scheme modules) the first time it is
+        needed
+
+        :return: (dict<str, str>) the entry point ("module:FactoryClass") of
+                 each scheme
+        """
+        if self._scheme_entries is None:
+            self._scheme_entries, self._unscanned_modules = \
+                self._read_scheme_registry()
+        return self._scheme_entries
         
     def getFactory(self, scheme=None):
         """Gives the factory class object supporting the given scheme
@@ -188,7 +284,7 @@ class TaurusManager(Singleton, Logger):
         """
         if scheme is None:
             return self.getDefaultFactory()
-        return self.getPlugins().get(scheme)
+        return self._loadPlugin(scheme)
 
     def getObject(self, cls, name):
         """Gives the object for the given class with the given name
@@ -265,7 +361,7 @@ class TaurusManager(Singleton, Logger):
         scheme = self.getScheme(name)
         if scheme is None: return
         try:
-            return self.getPlugins()[scheme]()
+            return self._loadPlugin(scheme)()
         except:
             raise TaurusException('Invalid scheme "%s"'%scheme)
 
@@ -301,6 +397,101 @@ class TaurusManager(Singleton, Logger):
         :return: (dic) plugins
         ''' 
         return self._build_plugins()
+
+    def _read_scheme_registry(self):
+        """Reads the __taurus_plugin__ files of the taurus.core subpackages.
+
+        :return: (tuple<dict, list>) the entry point of each declared scheme
+                 and the names of the plugin modules which do not declare
+                 their schemes (they have to be imported and inspected)
+        """
+        entries, modules = {}, []
+        for elem in sorted(os.listdir(self._this_path)):
+            if elem.startswith('.') or elem.startswith("_"):
+                continue
+            path = os.path.join(self._this_path, elem)
+            plugin_file = os.path.join(path, self.PLUGIN_KEY)
+            if not os.path.exists(plugin_file):
+                continue
+            if not os.path.exists(os.path.join(path, '__init__.py')):
+                continue
+            declared = False
+            with open(plugin_file) as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if not line:
+                        continue
+                    try:
+                        scheme, entry = [e.strip() for e in line.split('=')]
+                        entry.split(':')[1]
+                    except Exception:
+                        self.warning("Invalid line in %s: %r", plugin_file,
+                                     line)
+                        continue
+                    declared = True
+                    if scheme in entries:
+                        self.warning("Conflicting plugins: %s and %s both "
+                                     "implement scheme %s. Will keep using %s",
+                                     entries[scheme], entry, scheme,
+                                     entries[scheme])
+                    else:
+                        entries[scheme] = entry
+            if not declared:
+                modules.append('taurus.core.%s' % elem)
+        modules.extend(getattr(tauruscustomsettings, 'EXTRA_SCHEME_MODULES',
+                               []))
+        return entries, modules
+
+    def _loadPlugin(self, scheme):
+        """returns the factory class of the given scheme (or None), importing
+        its module the first time"""
+        if self._plugins is None:
+            self._plugins = {}
+        plugins = self._plugins
+        if scheme in plugins:
+            return plugins[scheme]
+        entry = self.getSchemeRegistry().get(scheme)
+        if entry is None:
+            # maybe provided by a module which does not declare its schemes
+            self._scanPluginModules()
+            return plugins.get(scheme)
+        module_name, class_name = entry.split(':')
+        try:
+            m = __import__(module_name, fromlist=[class_name], level=0)
+            plugin = getattr(m, class_name)
+        except Exception:
+            self.debug('Failed to load %s (scheme %s)', entry, scheme)
+            self.debug('Details:', exc_info=1)
+            plugin = None
+        plugins[scheme] = plugin
+        if plugin is not None:
+            # a factory usually implements several (declared) schemes
+            for s in plugin.schemes:
+                if self._scheme_entries.get(s) == entry:
+                    plugins.setdefault(s, plugin)
+        return plugin
+
+    def _scanPluginModules(self):
+        """imports and inspects the plugin modules which do not declare
+        their schemes (e.g. those in EXTRA_SCHEME_MODULES)"""
+        self.getSchemeRegistry()
+        modules, self._unscanned_modules = self._unscanned_modules, []
+        if not modules:
+            return
+        if self._plugins is None:
+            self._plugins = {}
+        plugins = self._plugins
+        for plugin_class in self._inspect_modules(modules):
+            for scheme in plugin_class.schemes:
+                if plugins.get(scheme) is plugin_class:
+                    continue
+                if scheme in self._scheme_entries or plugins.get(scheme):
+                    k = self._scheme_entries.get(scheme) or plugins[scheme]
+                    self.warning("Conflicting plugins: %s and %s both "
+                                 "implement scheme %s. Will keep using %s",
+                                 k, plugin_class.__name__, scheme, k)
+                else:
+                    plugins[scheme] = plugin_class
         
     def _get_plugin_classes(self):
         upgrade_classes = []
@@ -320,12 +511,13 @@ class TaurusManager(Singleton, Logger):
                 continue
             dirs.append(elem)
         
-        plugins = []
-        
         full_module_names = ['taurus.core.%s'%d.split(os.path.sep)[-1] for d in dirs]
         from taurus import tauruscustomsettings
         full_module_names.extend(getattr(tauruscustomsettings,'EXTRA_SCHEME_MODULES',[]))
-        
+        return self._inspect_modules(full_module_names)
+
+    def _inspect_modules(self, full_module_names):
+        plugins = []
         for full_module_name in full_module_names:
             try:
                 m = __import__(full_module_name, fromlist=['*'], level=0)
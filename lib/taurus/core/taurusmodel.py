@@ -32,6 +32,7 @@ __docformat__ = "restructuredtext"
 import weakref
 import operator
 import threading
+from collections import OrderedDict
 
 from .util.log import Logger
 from .util.event import CallableRef, BoundMethodWeakref
@@ -62,7 +63,10 @@ class TaurusModel(Logger):
             self._parentObj = weakref.ref(parent)
         except Exception:
             self._parentObj = None
-        self._listeners = []
+        # weak listener reference -> how to notify it (see addListener)
+        self._listeners = OrderedDict()
+        self._listeners_lock = threading.Lock()
+        self._listener_calls = None
 
     def __str__name__(self, name):
         return '{0}({1})'.format(self.__class__.__name__, name)
@@ -77,6 +81,7 @@ class TaurusModel(Logger):
         self.trace("[TaurusModel] cleanUp")
         #self._parentObj = None
         self._listeners = None
+        self._listener_calls = None
         Logger.cleanUp(self)
         
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
@@ -200,14 +205,44 @@ class TaurusModel(Logger):
     # API for listeners
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
     
+    # how a registered listener is notified: through its eventReceived
+    # method, by calling it or not at all (neither of both is available)
+    _NotifyMethod, _NotifyCall, _NotifyNone = range(3)
+
     def _listenerDied(self, weak_listener):
-        if self._listeners is None: 
-            return
-        try:
-            self._listeners.remove(weak_listener)
-        except Exception,e:
-            pass
-        
+        self._removeListenerRefs((weak_listener,))
+
+    def _removeListenerRefs(self, weak_listeners):
+        """Removes the given weak listener references from the registry.
+
+        :param weak_listeners: (seq<weakref>) weak listener references
+
+        :return: (bool) True if at least one reference was removed"""
+        removed = False
+        with self._listeners_lock:
+            listeners = self._listeners
+            if listeners is None:
+                return False
+            for weak_listener in weak_listeners:
+                if listeners.pop(weak_listener, None) is not None:
+                    removed = True
+            if removed:
+                self._listener_calls = None
+        return removed
+
+    def _getListenerCalls(self):
+        """Returns an immutable snapshot of the registered listeners as a
+        tuple of (weak reference, notify mode). The snapshot is rebuilt only
+        after the set of listeners changes."""
+        with self._listeners_lock:
+            calls = self._listener_calls
+            if calls is None:
+                listeners = self._listeners
+                if listeners is None:
+                    return ()
+                calls = self._listener_calls = tuple(listeners.items())
+        return calls
+
     def _getCallableRef(self, listener, cb = None):
         #return weakref.ref(listener, self._listenerDied)
         meth = getattr(listener, 'eventReceived', None)
@@ -215,27 +250,35 @@ class TaurusModel(Logger):
             return weakref.ref(listener, cb)
         else:
             return CallableRef(listener, cb)
-    
+
+    def _getNotifyMode(self, listener):
+        meth = getattr(listener, 'eventReceived', None)
+        if meth is not None and operator.isCallable(meth):
+            return self._NotifyMethod
+        elif operator.isCallable(listener):
+            return self._NotifyCall
+        return self._NotifyNone
+
     def addListener(self, listener):
         if self._listeners is None or listener is None: 
             return False
-        
+
         weak_listener = self._getCallableRef(listener, self._listenerDied)
-        if weak_listener in self._listeners:
-            return False
-        self._listeners.append(weak_listener)
+        mode = self._getNotifyMode(listener)
+        with self._listeners_lock:
+            listeners = self._listeners
+            if listeners is None or weak_listener in listeners:
+                return False
+            listeners[weak_listener] = mode
+            self._listener_calls = None
         return True
-    
+
     def removeListener(self, listener):
         if self._listeners is None: 
             return
         weak_listener = self._getCallableRef(listener)
-        try:
-            self._listeners.remove(weak_listener)
-        except Exception,e:
-            return False
-        return True
-                    
+        return self._removeListenerRefs((weak_listener,))
+
     def forceListening(self):
         class __DummyListener:
             def eventReceived(self, *args):
@@ -261,16 +304,29 @@ class TaurusModel(Logger):
         
     def fireEvent(self, event_type, event_value, listeners=None):
         """sends an event to all listeners or a specific one"""
-        
-        if listeners is None:
-            listeners = self._listeners
-        
+
         if listeners is None:
+            calls = self._listener_calls
+            if calls is None:
+                calls = self._getListenerCalls()
+            dead = None
+            for weak_listener, mode in calls:
+                l = weak_listener()
+                if l is None:
+                    if dead is None:
+                        dead = []
+                    dead.append(weak_listener)
+                elif mode == self._NotifyMethod:
+                    l.eventReceived(self, event_type, event_value)
+                elif mode == self._NotifyCall:
+                    l(self, event_type, event_value)
+            if dead is not None:
+                self._removeListenerRefs(dead)
             return
-        
+
         if not operator.isSequenceType(listeners):
             listeners = listeners,
-            
+
         for listener in listeners:
             if isinstance(listener, weakref.ref) or isinstance(listener, BoundMethodWeakref):
                 l = listener()
@@ -282,7 +338,7 @@ class TaurusModel(Logger):
                 l.eventReceived(self, event_type, event_value)
             elif operator.isCallable(l):
                 l(self, event_type, event_value)
-            
+
     def isWritable(self):
         return False
 
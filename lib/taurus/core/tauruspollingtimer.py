@@ -23,23 +23,483 @@
 ##
 #############################################################################
 
-"""This module contains the polling class"""
+"""This module contains the polling classes"""
 
-__all__ = ["TaurusPollingTimer"]
+__all__ = ["TaurusPollingTimer", "TaurusPollingScheduler",
+           "TaurusPollingBackoff"]
 
 __docformat__ = "restructuredtext"
 
+import math
 import time
+import atexit
+import heapq
+import weakref
+import itertools
 import threading
 
 from .util.log import Logger, DebugIt
 from .util.containers import CaselessDict
-from .util.timer import Timer
+from .util.singleton import Singleton
+from .util.threadpool import ThreadPool
+
+
+class TaurusPollingBackoff(object):
+    """A circuit breaker for the polling of a device.
+
+    After a failure of the device (e.g. it is unreachable) the breaker opens
+    and polling is only allowed for periodic probes, whose interval grows
+    exponentially (from :attr:`MinInterval` up to :attr:`MaxInterval`) while
+    the device keeps failing. The breaker closes again on the first
+    successful poll.
+
+    Usage::
+
+        if backoff.allowPoll():
+            try:
+                poll_the_device()
+            except Exception, e:
+                if backoff.failure(e):
+                    notify_listeners(e) # only done for the first failure
+            else:
+                backoff.success()
+    """
+
+    #: interval (seconds) between the first failure and the first probe
+    MinInterval = 1.0
+
+    #: maximum interval (seconds) between probes
+    MaxInterval = 60.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Closes the breaker so that the next poll is done normally"""
+        with self._lock:
+            self.failures = 0
+            self.interval = 0
+            self.next_probe = 0
+            self.since = None
+            self.error = None
+
+    def isOpen(self):
+        """Tells if the device is considered unreachable
+
+        :return: (bool) True if the breaker is open
+        """
+        return self.failures > 0
+
+    def allowPoll(self, now=None):
+        """Tells if the device should be polled now. When the breaker is open
+        this is only True once per probe interval
+
+        :param now: (float or None) the current time (default: time.time())
+
+        :return: (bool) True if the device should be polled
+        """
+        if not self.failures:
+            return True
+        if now is None:
+            now = time.time()
+        with self._lock:
+            if now < self.next_probe:
+                return False
+            # do not allow other polls until the probe fails or succeeds
+            self.next_probe = now + self.interval
+            return True
+
+    def success(self):
+        """Notifies a successful poll of the device
+
+        :return: (bool) True if the device was considered unreachable
+        """
+        if not self.failures:
+            return False
+        self.reset()
+        return True
+
+    def failure(self, error=None, now=None):
+        """Notifies a failed poll of the device
+
+        :param error: (Exception or None) the error of the device
+        :param now: (float or None) the current time (default: time.time())
+
+        :return: (bool) True if this is the first failure (i.e. if the error
+                 should be notified)
+        """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self.failures += 1
+            self.error = error
+            if self.failures == 1:
+                self.since = now
+                self.interval = self.MinInterval
+            else:
+                self.interval = min(2 * self.interval, self.MaxInterval)
+            self.next_probe = now + self.interval
+            return self.failures == 1
+
+    def getState(self):
+        """Returns the state of the breaker
+
+        :return: (dict) a dictionary with the keys 'failures' (number of
+                 consecutive failures), 'since' (time of the first
+                 failure), 'interval' (current probe interval in seconds),
+                 'next_probe' (time of the next probe) and 'error' (last
+                 error)
+        """
+        with self._lock:
+            return dict(failures=self.failures, since=self.since,
+                        interval=self.interval, next_probe=self.next_probe,
+                        error=self.error)
+
+
+class _PollingGroup(object):
+    """The attributes of one device polled with a given period. This is the
+    unit of scheduling of the :class:`TaurusPollingScheduler`"""
+
+    def __init__(self, timer, dev):
+        self.timer = timer
+        self.dev = dev
+        self.period = timer.getPeriod() / 1000.0
+        self.deadline = None
+        self.active = True
+        self.busy = False
+        self.cycles = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.overruns = 0
+        self.timeouts = 0
+
+    def getStats(self):
+        return dict(period=self.timer.getPeriod(), cycles=self.cycles,
+                    lag=self.lag, max_lag=self.max_lag,
+                    overruns=self.overruns, timeouts=self.timeouts)
+
+
+class _PendingReply(object):
+    """An asynchronous read of a device whose reply has not been collected
+    yet by the :class:`TaurusPollingScheduler`"""
+
+    def __init__(self, dev, attrs, req_id, groups, expiry, interval):
+        self.dev = dev
+        self.attrs = attrs
+        self.req_id = req_id
+        self.groups = groups
+        self.expiry = expiry
+        self.interval = interval
+
+
+class TaurusPollingScheduler(Singleton, Logger):
+    """A :class:`taurus.core.util.singleton.Singleton` which drives all the
+    :class:`TaurusPollingTimer` objects from a single thread.
+
+    The scheduler keeps a heap of deadlines of (device, period) groups.
+    Deadlines are aligned to multiples of the period so that groups of the
+    same device falling due at the same time are merged in a single
+    asynchronous read. The replies are collected by a small pool of worker
+    threads so that the scheduler thread never waits for a device. The
+    workers do not wait for the replies either: the pending requests are
+    checked without blocking (see :meth:`TaurusDevice.poll`) at increasing
+    intervals (from :attr:`ReplyCheckInterval` up to
+    :attr:`MaxReplyCheckInterval`) until the reply arrives or the
+    per-device deadline expires (see :meth:`setReplyTimeout`). This way
+    hung devices do not starve the pool. A device missing its deadline gets
+    an error for that cycle.
+
+    For each group the scheduler keeps track of the lag (how late the last
+    poll was dispatched), of the overruns (cycles skipped because the
+    previous poll of the group had not finished yet or because the
+    scheduler fell behind) and of the reply timeouts.
+    """
+
+    #: default number of threads collecting the poll replies
+    DefaultPoolSize = 5
+
+    #: default maximum time (seconds) to wait for the reply of a device
+    DefaultReplyTimeout = 3
+
+    #: time (seconds) to wait before checking a pending reply the first time
+    ReplyCheckInterval = 0.005
+
+    #: maximum time (seconds) between two checks of a pending reply
+    MaxReplyCheckInterval = 0.1
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization.
+           **For internal usage only**"""
+        name = self.__class__.__name__
+        self.call__init__(Logger, name)
+        from taurus import tauruscustomsettings
+        pool_size = getattr(tauruscustomsettings, 'POLLING_POOL_SIZE',
+                            self.DefaultPoolSize)
+        self._cond = threading.Condition()
+        self._heap = []
+        self._replies = []
+        self._groups = {}
+        self._seq = itertools.count()
+        self._thread = None
+        self._reply_timeouts = weakref.WeakKeyDictionary()
+        self._default_reply_timeout = getattr(tauruscustomsettings,
+                                              'POLLING_REPLY_TIMEOUT',
+                                              self.DefaultReplyTimeout)
+        self._pool = ThreadPool(name="TaurusPollingTP", parent=self,
+                                Psize=pool_size, Qsize=0)
+        atexit.register(self.cleanUp)
+
+    def cleanUp(self):
+        """Unschedules all the groups (which ends the scheduler thread)"""
+        self._cond.acquire()
+        try:
+            for group in self._groups.values():
+                group.active = False
+            self._groups.clear()
+            self._cond.notify()
+            thread = self._thread
+        finally:
+            self._cond.release()
+        if thread is not None and thread is not threading.currentThread():
+            thread.join(1)
+
+    def schedule(self, timer, dev):
+        """Starts polling the attributes of the given device registered in
+        the given timer.
+
+        :param timer: (TaurusPollingTimer) the polling timer
+        :param dev: (taurus.core.taurusdevice.TaurusDevice) the device
+        """
+        key = timer, dev
+        self._cond.acquire()
+        try:
+            if key in self._groups:
+                return
+            self._groups[key] = group = _PollingGroup(timer, dev)
+            # align the deadline to the period so that groups with the same
+            # (or a multiple) period fall due together
+            now = time.time()
+            deadline = math.ceil(now / group.period) * group.period
+            if deadline <= now:
+                deadline += group.period
+            self._push(group, deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run,
+                                                name="TaurusPollingScheduler")
+                self._thread.setDaemon(True)
+                self._thread.start()
+            self._cond.notify()
+        finally:
+            self._cond.release()
+
+    def unschedule(self, timer, dev=None):
+        """Stops polling the attributes of the given device registered in
+        the given timer. If dev is None, all devices of the timer are
+        unscheduled.
+
+        :param timer: (TaurusPollingTimer) the polling timer
+        :param dev: (taurus.core.taurusdevice.TaurusDevice or None) the device
+        """
+        self._cond.acquire()
+        try:
+            for key in self._groups.keys():
+                if key[0] is timer and (dev is None or key[1] is dev):
+                    # groups are removed from the heap lazily
+                    self._groups.pop(key).active = False
+            self._cond.notify()
+        finally:
+            self._cond.release()
+
+    def setReplyTimeout(self, dev, timeout):
+        """Sets the maximum time to wait for the poll reply of the given
+        device. If the reply does not arrive in time, the attributes of the
+        device get an error for that polling cycle
+
+        :param dev: (taurus.core.taurusdevice.TaurusDevice) the device
+        :param timeout: (float or None) the timeout (seconds). None resets
+                        the default timeout
+        """
+        if timeout is None:
+            self._reply_timeouts.pop(dev, None)
+        else:
+            self._reply_timeouts[dev] = timeout
+
+    def getReplyTimeout(self, dev):
+        """Returns the maximum time to wait for the poll reply of the given
+        device. See :meth:`setReplyTimeout`
+
+        :param dev: (taurus.core.taurusdevice.TaurusDevice) the device
+
+        :return: (float) the timeout (seconds)
+        """
+        return self._reply_timeouts.get(dev, self._default_reply_timeout)
+
+    def getStats(self, timer=None):
+        """Returns the statistics of the scheduled groups.
+
+        :param timer: (TaurusPollingTimer or None) if given, only the groups
+                      of this timer are considered
+
+        :return: (dict<tuple(int,str), dict>) a dictionary whose keys are
+                 (period, device full name) and whose values are dictionaries
+                 with the keys 'period', 'cycles', 'lag', 'max_lag' (in
+                 seconds), 'overruns' and 'timeouts'
+        """
+        self._cond.acquire()
+        try:
+            groups = self._groups.values()
+        finally:
+            self._cond.release()
+        ret = {}
+        for group in groups:
+            if timer is not None and group.timer is not timer:
+                continue
+            key = group.timer.getPeriod(), group.dev.getFullName()
+            ret[key] = group.getStats()
+        return ret
+
+    def _push(self, group, deadline):
+        group.deadline = deadline
+        heapq.heappush(self._heap, (deadline, self._seq.next(), group))
+
+    def _pushReply(self, reply, check_time):
+        heapq.heappush(self._replies, (check_time, self._seq.next(), reply))
+
+    def __run(self):
+        """ Private Thread Function """
+        cond, heap, replies = self._cond, self._heap, self._replies
+        while True:
+            cond.acquire()
+            try:
+                if not self._groups:
+                    # nothing to poll: end the thread (restarted on demand)
+                    del heap[:]
+                    del replies[:]
+                    self._thread = None
+                    return
+                now = time.time()
+                checks = []
+                while replies and replies[0][0] <= now:
+                    checks.append(heapq.heappop(replies)[2])
+                deadline = heap[0][0]
+                if deadline > now and not checks:
+                    if replies:
+                        deadline = min(deadline, replies[0][0])
+                    cond.wait(deadline - now)
+                    continue
+                due = []
+                while heap and heap[0][0] <= now:
+                    deadline, _, group = heapq.heappop(heap)
+                    if not group.active:
+                        continue
+                    due.append((deadline, group))
+                    next_deadline = deadline + group.period
+                    if next_deadline <= now:
+                        # we fell behind: skip the missed cycles
+                        missed = int((now - deadline) // group.period)
+                        group.overruns += missed
+                        next_deadline += missed * group.period
+                    self._push(group, next_deadline)
+            finally:
+                cond.release()
+            for reply in checks:
+                self._pool.add(self._checkReply, None, reply)
+            try:
+                self._dispatch(due, now)
+            except Exception:
+                self.error("Error dispatching polling")
+                self.debug("Details:", exc_info=1)
+
+    def _dispatch(self, due, now):
+        """Sends one asynchronous read per device for all the groups that are
+        due and queues the collection of the replies"""
+        devs = {}
+        for deadline, group in due:
+            if group.busy:
+                group.overruns += 1
+                self.debug("%s (%dms) is still being polled. Skipping cycle",
+                           group.dev.getFullName(), group.timer.getPeriod())
+                continue
+            group.lag = lag = now - deadline
+            group.max_lag = max(group.max_lag, lag)
+            group.cycles += 1
+            devs.setdefault(group.dev, []).append(group)
+
+        for dev, groups in devs.iteritems():
+            attrs = None
+            for group in groups:
+                group_attrs = group.timer.getAttributes(dev)
+                if not group_attrs:
+                    continue
+                if attrs is None:
+                    attrs = type(group_attrs)(group_attrs)
+                else:
+                    attrs.update(group_attrs)
+            if not attrs:
+                continue
+            try:
+                req_id = dev.poll(attrs, asynch=True)
+            except Exception:
+                self.error("poll_asynch error")
+                self.debug("Details:", exc_info=1)
+                continue
+            for group in groups:
+                group.busy = True
+            interval = self.ReplyCheckInterval
+            reply = _PendingReply(dev, attrs, req_id, groups,
+                                  now + self.getReplyTimeout(dev), interval)
+            self._cond.acquire()
+            try:
+                self._pushReply(reply, now + interval)
+            finally:
+                self._cond.release()
+
+    def _checkReply(self, reply):
+        """Checks (without waiting) if the reply of an asynchronous read has
+        arrived. If not, the check is scheduled again until the reply
+        deadline expires. Executed in the worker pool"""
+        dev = reply.dev
+        try:
+            now = time.time()
+            if now < reply.expiry:
+                ret = dev.poll(reply.attrs, req_id=reply.req_id, timeout=0)
+                if ret is None:
+                    reply.interval = min(2 * reply.interval,
+                                         self.MaxReplyCheckInterval)
+                    check_time = min(now + reply.interval, reply.expiry)
+                    self._cond.acquire()
+                    try:
+                        self._pushReply(reply, check_time)
+                        self._cond.notify()
+                    finally:
+                        self._cond.release()
+                    return
+            else:
+                # last chance: a (minimal) non-zero timeout makes the device
+                # give up the request and notify the error
+                ret = dev.poll(reply.attrs, req_id=reply.req_id,
+                               timeout=0.001)
+            if ret is False:
+                self.debug("%s missed its reply deadline (%gs)",
+                           dev.getFullName(), self.getReplyTimeout(dev))
+                for group in reply.groups:
+                    group.timeouts += 1
+        except Exception:
+            self.error("poll_reply error")
+            self.debug("Details:", exc_info=1)
+        for group in reply.groups:
+            group.busy = False
 
 
 class TaurusPollingTimer(Logger):
     """ Polling timer manages a list of attributes that have to be polled in
-    the same period """
+    the same period. The actual polling is driven by the
+    :class:`TaurusPollingScheduler`"""
     
     def __init__(self, period, parent=None):
         """Constructor
@@ -51,16 +511,88 @@ class TaurusPollingTimer(Logger):
         self.call__init__(Logger, name, parent)
         self.dev_dict = {}
         self.attr_nb = 0
-        self.timer = Timer(period/1000.0, self._pollAttributes, self)
+        self.period = period
+        self.scheduler = TaurusPollingScheduler()
         self.lock = threading.RLock()
+        self._started = False
         
     def start(self):
         """ Starts the polling timer """
-        self.timer.start()
+        self.lock.acquire()
+        try:
+            self._started = True
+            for dev in self.dev_dict:
+                self.scheduler.schedule(self, dev)
+        finally:
+            self.lock.release()
     
     def stop(self):
         """ Stop the polling timer"""
-        self.timer.stop()
+        self.lock.acquire()
+        try:
+            self._started = False
+            self.scheduler.unschedule(self)
+        finally:
+            self.lock.release()
+
+    def isStarted(self):
+        """Tells if the polling timer is started
+
+           :return: (bool) True if the timer is started or False otherwise
+        """
+        return self._started
+
+    def getPeriod(self):
+        """Returns the polling period
+
+           :return: (int) the polling period (miliseconds)
+        """
+        return self.period
+
+    def getAttributes(self, dev):
+        """Returns a copy of the attributes registered for the given device
+
+           :param dev: (taurus.core.taurusdevice.TaurusDevice) the device
+
+           :return: (dict) a dictionary of attribute objects with the
+                    attribute simple name as key (empty if the device is not
+                    registered)
+        """
+        self.lock.acquire()
+        try:
+            attr_dict = self.dev_dict.get(dev)
+            if attr_dict is None:
+                return {}
+            return type(attr_dict)(attr_dict)
+        finally:
+            self.lock.release()
+
+    def getStats(self):
+        """Returns the polling statistics of this timer.
+        See :meth:`TaurusPollingScheduler.getStats`
+
+           :return: (dict<str, dict>) a dictionary whose keys are the device
+                    full names and whose values are the statistics of the
+                    polling of that device
+        """
+        stats = self.scheduler.getStats(self)
+        return dict([(k[1], v) for k, v in stats.iteritems()])
+
+    def getSkippedCycles(self):
+        """Returns the number of polling cycles skipped by the devices of this
+        timer
+
+           :return: (int) the number of skipped cycles
+        """
+        return sum([v['overruns'] for v in self.getStats().itervalues()])
+
+    def getTimeouts(self):
+        """Returns the number of polling cycles in which a device of this
+        timer missed its reply deadline
+
+           :return: (int) the number of timeouts
+        """
+        return sum([v['timeouts'] for v in self.getStats().itervalues()])
     
     def containsAttribute(self,attribute):
         """Determines if the polling timer already contains this attribute
@@ -94,15 +626,21 @@ class TaurusPollingTimer(Logger):
                               one attribute registered.
         """
         dev, attr_name = attribute.getParentObj(), attribute.getSimpleName()
-        attr_dict = self.dev_dict.get(dev)
-        if attr_dict is None:
-            if attribute.factory().caseSensitive:
-                self.dev_dict[dev] = attr_dict = {}
-            else:
-                self.dev_dict[dev] = attr_dict = CaselessDict()
-        if attr_name not in attr_dict:
-            attr_dict[attr_name] = attribute
-            self.attr_nb += 1
+        self.lock.acquire()
+        try:
+            attr_dict = self.dev_dict.get(dev)
+            if attr_dict is None:
+                if attribute.factory().caseSensitive:
+                    self.dev_dict[dev] = attr_dict = {}
+                else:
+                    self.dev_dict[dev] = attr_dict = CaselessDict()
+                if self._started:
+                    self.scheduler.schedule(self, dev)
+            if attr_name not in attr_dict:
+                attr_dict[attr_name] = attribute
+                self.attr_nb += 1
+        finally:
+            self.lock.release()
         if self.attr_nb == 1 and auto_start:
             self.start()
         else:
@@ -117,31 +655,18 @@ class TaurusPollingTimer(Logger):
            :param attribute: (taurus.core.taurusattribute.TaurusAttribute) the attribute to be added
         """
         dev, attr_name = attribute.getParentObj(), attribute.getSimpleName()
-        attr_dict = self.dev_dict.get(dev)
-        if attr_dict is None:
-            return
-        if attr_name in attr_dict:
-            del attr_dict[attr_name]
-            if not attr_dict:
-                del self.dev_dict[dev]
-            self.attr_nb -= 1
+        self.lock.acquire()
+        try:
+            attr_dict = self.dev_dict.get(dev)
+            if attr_dict is None:
+                return
+            if attr_name in attr_dict:
+                del attr_dict[attr_name]
+                if not attr_dict:
+                    del self.dev_dict[dev]
+                    self.scheduler.unschedule(self, dev)
+                self.attr_nb -= 1
+        finally:
+            self.lock.release()
         if self.attr_nb < 1:
             self.stop()
-        
-    def _pollAttributes(self):
-        """Polls the registered attributes. This method is called by the timer
-           when it is time to poll. Do not call this method directly
-        """
-        req_ids = {}
-        for dev, attrs in self.dev_dict.items():
-            try:
-                req_id = dev.poll(attrs, asynch=True)
-                req_ids[dev] = attrs, req_id
-            except Exception as e:
-                self.error("poll_asynch error")
-                self.debug("Details:", exc_info=1)
-        for dev, (attrs, req_id) in req_ids.items():
-            try:
-                dev.poll(attrs, req_id=req_id)
-            except Exception as e:
-                self.error("poll_reply error")
@@ -27,17 +27,100 @@
 
 
 __all__ = ["TaurusAuthorityNameValidator", "TaurusDeviceNameValidator", 
-           "TaurusAttributeNameValidator"]
+           "TaurusAttributeNameValidator", "getUriGroupsCacheStats",
+           "clearUriGroupsCache"]
 
 
 __docformat__ = "restructuredtext"
 
 import re
+import threading
+from collections import OrderedDict
 from taurus import tauruscustomsettings
 from taurus.core.util.singleton import Singleton
 from taurus.core.taurushelper import makeSchemeExplicit
 
 
+class _UriGroups(dict):
+    """A read-only dict with the named groups of a URI (as returned by
+    getUriGroups). It is shared by all the callers asking for the same name,
+    so it cannot be modified: use dict(groups) to get a modifiable copy"""
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError('URI groups are read-only. Modify a copy instead')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = __readonly
+    setdefault = update = __readonly
+
+    def copy(self):
+        return dict(self)
+
+
+class _UriGroupsCache(object):
+    """Bounded LRU cache of the URI groups of the names parsed by all the
+    validators. The keys are (validator class, name, strict)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """returns the cached groups (or None if valid) for key. Raises
+        KeyError if not cached"""
+        with self._lock:
+            cache = self._cache
+            try:
+                groups = cache.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            cache[key] = groups
+            self.hits += 1
+            return groups
+
+    def put(self, key, groups):
+        with self._lock:
+            cache = self._cache
+            cache.pop(key, None)
+            cache[key] = groups
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def getStats(self):
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses,
+                        size=len(self._cache), maxsize=self.maxsize)
+
+
+_URI_GROUPS_CACHE = _UriGroupsCache(
+    getattr(tauruscustomsettings, 'URI_GROUPS_CACHE_SIZE', 10000))
+
+
+def getUriGroupsCacheStats():
+    """Returns the statistics of the cache of parsed names shared by all the
+    validators (see :meth:`TaurusAttributeNameValidator.getUriGroups`)
+
+    :return: (dict) with keys 'hits', 'misses', 'size' (number of cached
+             names) and 'maxsize'
+    """
+    return _URI_GROUPS_CACHE.getStats()
+
+
+def clearUriGroupsCache():
+    """Empties the cache of parsed names shared by all the validators (and
+    resets its statistics). Call it whenever a change (e.g. of a custom
+    setting or of the default TANGO_HOST) may alter how names are parsed
+    """
+    _URI_GROUPS_CACHE.clear()
+
+
 class _TaurusBaseValidator(Singleton):
     '''This is a private base class for taurus base validators. Do not derive
     from it if you are implementing a new scheme. Derive from the public 
@@ -105,9 +188,33 @@ class _TaurusBaseValidator(Singleton):
         '''returns the named groups dictionary from the URI regexp matching.
         If strict is False, it also tries to match against the non-strict regexp
         (It logs a warning if it matched only the non-strict alternative) 
+
+        The results are cached (see :func:`getUriGroupsCacheStats`), so the
+        returned dictionary is read-only.
         '''
         if strict is None:
             strict = getattr(tauruscustomsettings, 'STRICT_MODEL_NAMES', False)
+        cache = _URI_GROUPS_CACHE
+        if cache.maxsize <= 0:
+            return self._parseUriGroups(name, strict)
+        key = self.__class__, name, bool(strict)
+        try:
+            return cache.get(key)
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable name (e.g. a QString)
+            return self._parseUriGroups(name, strict)
+        groups = self._parseUriGroups(name, strict)
+        if groups is not None:
+            groups = _UriGroups(groups)
+        cache.put(key, groups)
+        return groups
+
+    def _parseUriGroups(self, name, strict):
+        '''does the actual matching for :meth:`getUriGroups` (uncached).
+        Reimplement it (instead of getUriGroups) to post-process the groups.
+        The returned dictionary can be modified by the reimplementations'''
         name = makeSchemeExplicit(name, default=self.scheme)
         m = self.name_re.match(name)
         #if it is strictly valid, return the groups
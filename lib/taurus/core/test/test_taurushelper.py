@@ -458,5 +458,19 @@ class AttributeTestCase(unittest.TestCase):
                 self.assertTrue(chk, msg)
   
 
+class AttributesTestCase(unittest.TestCase):
+    '''TestCase for the taurus.Attributes helper'''
+
+    def test_attributes(self):
+        '''check that Attributes returns the same objects as Attribute'''
+        names = ['eval:1', 'eval:Q(2, "mm")', 'eval:1', 'foo:1']
+        attrs = taurus.Attributes(names)
+        self.assertEqual(len(attrs), len(names))
+        for name, attr in zip(names[:3], attrs):
+            self.assertIs(attr, taurus.Attribute(name))
+        self.assertIs(attrs[0], attrs[2])
+        self.assertIsNone(attrs[3])
+
+
 if __name__ == '__main__':
     pass
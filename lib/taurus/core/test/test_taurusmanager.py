@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.taurusmanager"""
+
+__docformat__ = 'restructuredtext'
+
+from taurus.external import unittest
+import taurus
+from taurus.core.evaluation import EvaluationFactory
+from taurus.core.taurusbasetypes import TaurusEventType
+
+
+class SchemeRegistryTestCase(unittest.TestCase):
+
+    def test_registry(self):
+        """The schemes of the taurus.core plugins are declared"""
+        registry = taurus.Manager().getSchemeRegistry()
+        for scheme in ('tango', 'eval', 'evaluation', 'res', 'epics'):
+            self.assertIn(scheme, registry)
+        self.assertEqual(registry['eval'],
+                         'taurus.core.evaluation:EvaluationFactory')
+
+    def test_getFactory(self):
+        """Factories are resolved from the registry"""
+        manager = taurus.Manager()
+        self.assertIs(manager.getFactory('eval'), EvaluationFactory)
+        self.assertIs(manager.getFactory('evaluation'), EvaluationFactory)
+        self.assertIsNone(manager.getFactory('_unsupported_'))
+        self.assertIs(manager.getPlugins()['eval'], EvaluationFactory)
+
+
+
+class _FullPool(object):
+    """An event pool whose queue is always full"""
+
+    maxsize = 10
+
+    def add(self, key, job, callback, *args, **kw):
+        return False
+
+
+class DroppedEventsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = manager = taurus.Manager()
+        self._pool = manager._event_pool
+        manager._event_pool = _FullPool()
+        manager._next_drop_warning = manager._drops = 0
+        self.warnings = []
+        manager.warning = lambda *args: self.warnings.append(args)
+
+    def tearDown(self):
+        self.manager._event_pool = self._pool
+        del self.manager.warning
+
+    def test_warning(self):
+        """Dropped events are warned about, at most once per interval"""
+        manager = self.manager
+        attr = taurus.Attribute('eval:1')
+        for _ in range(5):
+            manager.dispatchEvent(attr, TaurusEventType.Change, None)
+        self.assertEqual(len(self.warnings), 1)
+        self.assertEqual(self.warnings[0][2], 1)
+        manager._next_drop_warning = 0 # the interval has elapsed
+        manager.dispatchEvent(attr, TaurusEventType.Change, None)
+        self.assertEqual(len(self.warnings), 2)
+        self.assertEqual(self.warnings[1][2], 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+
+"""Test for the listener API of taurus.core.taurusmodel"""
+
+__docformat__ = 'restructuredtext'
+
+import gc
+from taurus.external import unittest
+import taurus
+from taurus.core.taurusbasetypes import TaurusEventType
+
+
+class _Listener(object):
+
+    def __init__(self):
+        self.events = []
+
+    def eventReceived(self, src, evt_type, evt_value):
+        self.events.append(evt_value)
+
+    def callback(self, src, evt_type, evt_value):
+        self.events.append(evt_value)
+
+
+class TaurusModelListenersTestCase(unittest.TestCase):
+
+    # note: eval attributes send a register event (from a worker thread) to
+    # any listener other than the first one, so each model gets at most one
+    # listener at a time
+
+    def _fire(self, model, value):
+        model.fireEvent(TaurusEventType.Change, value)
+
+    def test_notify(self):
+        """Listeners and bound methods are registered and notified once"""
+        model = taurus.Attribute('eval:"listeners test 1"')
+        l1, l2 = _Listener(), _Listener()
+        self.assertTrue(model.addListener(l1))
+        self.assertFalse(model.addListener(l1))
+        self._fire(model, 1)
+        self.assertEqual(l1.events, [1])
+        self.assertTrue(model.removeListener(l1))
+        self.assertFalse(model.hasListeners())
+        self.assertTrue(model.addListener(l2.callback))
+        self.assertFalse(model.addListener(l2.callback))
+        self._fire(model, 2)
+        self.assertEqual(l1.events, [1])
+        self.assertEqual(l2.events, [2])
+        self.assertTrue(model.removeListener(l2.callback))
+        self.assertFalse(model.removeListener(l2.callback))
+        self.assertFalse(model.hasListeners())
+
+    def test_deadListener(self):
+        """Dead listeners are removed from the registry"""
+        for i, bound in enumerate((False, True)):
+            model = taurus.Attribute('eval:"listeners test %d"' % (i + 2))
+            listener = _Listener()
+            model.addListener(listener.callback if bound else listener)
+            del listener
+            gc.collect()
+            self._fire(model, 1)
+            self.assertFalse(model.hasListeners())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.tauruspollingtimer"""
+
+__docformat__ = 'restructuredtext'
+
+import time
+import threading
+from taurus.external import unittest
+from taurus.core.tauruspollingtimer import (TaurusPollingTimer,
+                                            TaurusPollingBackoff)
+
+
+class _FakeFactory(object):
+    caseSensitive = True
+
+
+class _FakeDevice(object):
+    '''A device-like object that records the polled attribute names'''
+
+    def __init__(self, name, reply_delay=0):
+        self.name = name
+        self.reply_delay = reply_delay
+        self.polls = []
+        self.lock = threading.Lock()
+
+    def getFullName(self):
+        return self.name
+
+    def poll(self, attrs, asynch=False, req_id=None, timeout=None):
+        if asynch:
+            return time.time(), sorted(attrs.keys())
+        sent, names = req_id
+        pending = sent + self.reply_delay - time.time()
+        if pending > 0:
+            if timeout == 0:
+                return None
+            if timeout is not None and pending > timeout:
+                time.sleep(timeout)
+                return False
+            time.sleep(pending)
+        with self.lock:
+            self.polls.append(names)
+        return True
+
+
+class _FakeAttribute(object):
+
+    def __init__(self, dev, name):
+        self.dev, self.name = dev, name
+
+    def getParentObj(self):
+        return self.dev
+
+    def getSimpleName(self):
+        return self.name
+
+    def factory(self):
+        return _FakeFactory()
+
+    def poll(self):
+        pass
+
+
+class TaurusPollingTimerTestCase(unittest.TestCase):
+    '''Test case for the polling timers driven by the polling scheduler'''
+
+    def setUp(self):
+        self.timers = []
+
+    def tearDown(self):
+        for timer in self.timers:
+            timer.stop()
+
+    def _timer(self, period):
+        timer = TaurusPollingTimer(period)
+        self.timers.append(timer)
+        return timer
+
+    def test_mergeGroups(self):
+        '''check that groups of the same device falling due together are
+        polled in a single request'''
+        dev = _FakeDevice('a/b/c')
+        self._timer(100).addAttribute(_FakeAttribute(dev, 'fast'))
+        self._timer(200).addAttribute(_FakeAttribute(dev, 'slow'))
+        time.sleep(0.75)
+        self.assertIn(['fast'], dev.polls)
+        self.assertIn(['fast', 'slow'], dev.polls)
+        self.assertNotIn(['slow'], dev.polls)
+
+    def test_slowDevice(self):
+        '''check that a slow device does not delay the polling of others'''
+        slow, fast = _FakeDevice('a/b/slow', .5), _FakeDevice('a/b/fast')
+        timer = self._timer(100)
+        timer.addAttribute(_FakeAttribute(slow, 'attr'))
+        timer.addAttribute(_FakeAttribute(fast, 'attr'))
+        time.sleep(0.75)
+        self.assertGreaterEqual(len(fast.polls), 5)
+        self.assertLessEqual(len(slow.polls), 2)
+        stats = timer.getStats()
+        self.assertGreater(stats['a/b/slow']['overruns'], 0)
+        self.assertEqual(stats['a/b/fast']['overruns'], 0)
+
+    def test_replyTimeout(self):
+        '''check that devices missing their reply deadline are accounted'''
+        hung, ok = _FakeDevice('a/b/hung', 10), _FakeDevice('a/b/ok')
+        timer = self._timer(100)
+        timer.scheduler.setReplyTimeout(hung, .05)
+        try:
+            timer.addAttribute(_FakeAttribute(hung, 'attr'))
+            timer.addAttribute(_FakeAttribute(ok, 'attr'))
+            time.sleep(0.55)
+        finally:
+            timer.scheduler.setReplyTimeout(hung, None)
+        self.assertEqual(hung.polls, [])
+        self.assertGreaterEqual(len(ok.polls), 4)
+        self.assertGreaterEqual(timer.getTimeouts(), 4)
+        self.assertEqual(timer.getSkippedCycles(), 0)
+
+    def test_hungDevices(self):
+        '''check that hung devices do not starve the collection of the
+        replies of the others'''
+        ok = _FakeDevice('a/b/ok')
+        timer = self._timer(100)
+        hung = [_FakeDevice('a/b/hung%d' % i, 10) for i in range(10)]
+        for dev in hung:
+            timer.addAttribute(_FakeAttribute(dev, 'attr'))
+        timer.addAttribute(_FakeAttribute(ok, 'attr'))
+        time.sleep(0.55)
+        self.assertGreaterEqual(len(ok.polls), 4)
+        for dev in hung:
+            self.assertEqual(dev.polls, [])
+
+    def test_stop(self):
+        '''check that no polling is done after stopping the timer'''
+        dev = _FakeDevice('a/b/c')
+        timer = self._timer(100)
+        timer.addAttribute(_FakeAttribute(dev, 'attr'))
+        time.sleep(0.25)
+        timer.stop()
+        time.sleep(0.15)
+        n = len(dev.polls)
+        self.assertGreater(n, 0)
+        time.sleep(0.3)
+        self.assertEqual(len(dev.polls), n)
+        self.assertEqual(timer.getStats(), {})
+
+
+class TaurusPollingBackoffTestCase(unittest.TestCase):
+    '''Test case for the polling circuit breaker'''
+
+    def test_backoff(self):
+        '''check the exponential back off of the probes'''
+        backoff = TaurusPollingBackoff()
+        self.assertTrue(backoff.allowPoll(0))
+        self.assertTrue(backoff.failure('err', 0))
+        self.assertTrue(backoff.isOpen())
+        self.assertFalse(backoff.allowPoll(0.5))
+        self.assertTrue(backoff.allowPoll(1))
+        self.assertFalse(backoff.allowPoll(1.5))
+        self.assertFalse(backoff.failure('err', 1.5))
+        self.assertEqual(backoff.getState()['interval'], 2)
+        self.assertFalse(backoff.allowPoll(3))
+        self.assertTrue(backoff.allowPoll(3.5))
+        for i in range(20):
+            backoff.failure('err', 3.5)
+        self.assertEqual(backoff.interval, backoff.MaxInterval)
+        self.assertEqual(backoff.getState()['failures'], 22)
+
+    def test_recovery(self):
+        '''check that the breaker closes after a successful poll'''
+        backoff = TaurusPollingBackoff()
+        self.assertFalse(backoff.success())
+        backoff.failure('err', 0)
+        self.assertTrue(backoff.success())
+        self.assertFalse(backoff.isOpen())
+        self.assertTrue(backoff.allowPoll(0))
+        self.assertTrue(backoff.failure('err', 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+
+"""Test for the cache of parsed names of taurus.core.taurusvalidator"""
+
+__docformat__ = 'restructuredtext'
+
+from taurus.external import unittest
+from taurus.core.taurusvalidator import (getUriGroupsCacheStats,
+                                         clearUriGroupsCache)
+from taurus.core.evaluation.evalvalidator import (
+    EvaluationDeviceNameValidator, EvaluationAttributeNameValidator)
+
+
+class UriGroupsCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        clearUriGroupsCache()
+
+    def tearDown(self):
+        clearUriGroupsCache()
+
+    def test_cache(self):
+        '''the groups are cached per validator, name and strictness'''
+        v = EvaluationAttributeNameValidator()
+        name = 'eval:@foo/1+2'
+        groups = v.getUriGroups(name, strict=True)
+        self.assertIs(v.getUriGroups(name, strict=True), groups)
+        self.assertIsNone(EvaluationDeviceNameValidator().getUriGroups(name))
+        self.assertIsNot(v.getUriGroups(name, strict=False), groups)
+        stats = getUriGroupsCacheStats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['size'], 3)
+
+    def test_readonly(self):
+        '''the cached groups cannot be modified'''
+        groups = EvaluationAttributeNameValidator().getUriGroups('eval:1')
+        self.assertRaises(TypeError, groups.__setitem__, 'attrname', '2')
+        self.assertRaises(TypeError, groups.update, attrname='2')
+        copy = dict(groups)
+        copy['attrname'] = '2'
+        self.assertEqual(groups['attrname'], '1')
+
+    def test_clear(self):
+        '''clearing the cache resets its contents and statistics'''
+        EvaluationAttributeNameValidator().getUriGroups('eval:1')
+        clearUriGroupsCache()
+        stats = getUriGroupsCacheStats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']),
+                         (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,7 +40,21 @@ import taurus.tauruscustomsettings
 
 LIGHTWEIGHT_IMPORTS = getattr(taurus.tauruscustomsettings, 'LIGHTWEIGHT_IMPORTS', False)
 
-if LIGHTWEIGHT_IMPORTS:
-    from init_lightweight import *
-else:
-    from init_bkcomp import *
\ No newline at end of file
+from init_lightweight import *
+
+if not LIGHTWEIGHT_IMPORTS:
+    # for backwards compatibility, the rest of the utility modules are
+    # still available from this package, but they are only imported on
+    # first use
+    def _etree():
+        try:
+            from lxml import etree
+        except:
+            etree = None
+        return etree
+
+    from .lazymodule import installLazyModule as _installLazyModule
+    _installLazyModule(__name__,
+                       imports=['codecs', 'colors', 'constant', 'timer',
+                                'safeeval', 'prop', 'threadpool', 'user'],
+                       attributes={'etree': _etree})
@@ -52,6 +52,12 @@ class BoundMethodWeakref(object):
         if cb:
             self.del_cb = CallableRef(del_cb)
         self.already_deleted = 0
+        # hash consistently with __cmp__ so equivalent references can be
+        # found in sets and dictionaries (the hash survives the referents)
+        try:
+            self._hash = hash((self.func_ref, self.obj_ref))
+        except TypeError:
+            self._hash = id(self)
 
     def _deleted(self, obj):
         if not self.already_deleted:
@@ -68,7 +74,7 @@ class BoundMethodWeakref(object):
                 return func.__get__(obj)
 
     def __hash__(self):
-        return id(self)
+        return self._hash
 
     def __cmp__(self, other):
         if other.__class__ == self.__class__:
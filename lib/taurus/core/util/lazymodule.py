@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides :class:`LazyModule`, a module type which delays the
+import of the (potentially expensive) sub-modules of a package until one of
+their members is actually used.
+
+Python 2 does not support module level ``__getattr__`` functions, so a package
+that wants lazy attributes replaces its own entry in :data:`sys.modules` with
+a :class:`LazyModule` at the end of its ``__init__``. Example::
+
+    # mypackage/__init__.py
+    from .light import *
+
+    from taurus.core.util.lazymodule import installLazyModule
+    installLazyModule(__name__, imports=['heavy', 'heavier'])
+
+After this, ``import mypackage`` only costs the import of ``mypackage.light``,
+while ``mypackage.HeavyClass`` (or ``from mypackage import HeavyClass``)
+imports ``mypackage.heavy`` (and, if needed, ``mypackage.heavier``) on
+first use, exactly as if they had been star-imported by the package.
+"""
+
+__all__ = ["LazyModule", "installLazyModule"]
+
+__docformat__ = "restructuredtext"
+
+import sys
+import imp
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A module whose missing attributes are resolved by importing, on demand
+    and in order, a list of sub-modules (as a ``from .sub import *`` would do)
+    and the sub-modules of the package itself.
+
+    The original module object is kept alive by the LazyModule since its
+    namespace is still used as the globals of the functions defined in it.
+
+    The lazy members are resolved holding the (reentrant) import lock of the
+    interpreter instead of a lock of their own: any other lock would be
+    taken in the opposite order by a thread importing a module which uses
+    this one at its top level, and both threads would deadlock.
+    """
+
+    def __init__(self, module, imports=(), attributes=None):
+        """
+        :param module: (module) the module being replaced
+        :param imports: (seq<str>) names of sub-modules (relative to `module`)
+                        whose public members are imported on demand
+        :param attributes: (dict<str,callable>) attributes whose value is
+                           computed (only once) by calling the given callable
+        """
+        types.ModuleType.__init__(self, module.__name__)
+        self.__dict__.update(module.__dict__)
+        self.__dict__['_LazyModule__module'] = module
+        self.__dict__['_LazyModule__imports'] = list(imports)
+        self.__dict__['_LazyModule__attributes'] = dict(attributes or {})
+
+    def __repr__(self):
+        return repr(self.__module).replace('<module', '<lazy module', 1)
+
+    def __dir__(self):
+        self.loadAll()
+        return sorted(self.__dict__)
+
+    def __getattr__(self, name):
+        if name == '__all__':
+            # "from module import *" asks for __all__: make sure the module
+            # namespace is complete and let python use it
+            self.loadAll()
+            raise AttributeError(name)
+        if name.startswith('__'):
+            raise AttributeError(name)
+        imp.acquire_lock()
+        try:
+            if name in self.__dict__:
+                return self.__dict__[name]
+            if name in self.__attributes:
+                value = self.__attributes.pop(name)()
+                setattr(self, name, value)
+                return value
+            if self.__isSubmodule(name):
+                return self.__importSubmodule(name)
+            while self.__imports:
+                self.__importAll(self.__imports[0])
+                if name in self.__dict__:
+                    return self.__dict__[name]
+        finally:
+            imp.release_lock()
+        raise AttributeError("'module' object has no attribute '%s'" % name)
+
+    def __isSubmodule(self, name):
+        path = self.__dict__.get('__path__')
+        if path is None:
+            return False
+        try:
+            f = imp.find_module(name, path)[0]
+        except ImportError:
+            return False
+        if f is not None:
+            f.close()
+        return True
+
+    def __importSubmodule(self, name):
+        full_name = "%s.%s" % (self.__name__, name)
+        __import__(full_name)
+        return sys.modules[full_name]
+
+    def __importAll(self, name):
+        module = self.__importSubmodule(name)
+        names = getattr(module, '__all__', None)
+        if names is None:
+            names = [n for n in module.__dict__ if not n.startswith('_')]
+        for n in names:
+            self.__dict__[n] = getattr(module, n)
+        self.__imports.remove(name)
+
+    def isLoaded(self):
+        """Tells if all the lazy members of this module have been loaded
+
+        :return: (bool)"""
+        return not (self.__imports or self.__attributes)
+
+    def loadAll(self):
+        """Imports all the pending members of this module"""
+        imp.acquire_lock()
+        try:
+            for name in self.__attributes.keys():
+                getattr(self, name)
+            while self.__imports:
+                self.__importAll(self.__imports[0])
+        finally:
+            imp.release_lock()
+
+
+def installLazyModule(name, imports=(), attributes=None):
+    """Replaces the module registered in :data:`sys.modules` under the given
+    name by a :class:`LazyModule`. It is meant to be called at the end of
+    the ``__init__`` of a package, with ``__name__`` as argument.
+
+    If the module is already a LazyModule the given members are just added to
+    its pending list.
+
+    :param name: (str) full name of the module
+    :param imports: (seq<str>) names of sub-modules (relative to the module)
+                    whose public members are imported on demand
+    :param attributes: (dict<str,callable>) attributes whose value is
+                       computed by calling the given callable on first access
+
+    :return: (LazyModule) the lazy module
+    """
+    module = sys.modules[name]
+    if isinstance(module, LazyModule):
+        module._LazyModule__imports.extend(imports)
+        module._LazyModule__attributes.update(attributes or {})
+    else:
+        module = LazyModule(module, imports=imports, attributes=attributes)
+        sys.modules[name] = module
+    return module
@@ -27,10 +27,51 @@
 safeeval.py: Safe eval replacement with whitelist support
 """
 
-__all__ = ["SafeEvaluator"]
+__all__ = ["SafeEvaluator", "SafeNamespace"]
 
 __docformat__ = "restructuredtext"
 
+import ast
+import threading
+from collections import OrderedDict
+
+
+def _getRequiredNames(code):
+    """returns the set of names that an expression (given as an AST) reads
+    from its namespace. Names bound within the expression (e.g. in list
+    comprehensions or lambdas) are not included"""
+    loaded, bound = set(), set()
+    for node in ast.walk(code):
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                loaded.add(node.id)
+            else:
+                bound.add(node.id)
+    # None is a constant (not a name lookup)
+    loaded.discard('None')
+    return frozenset(loaded - bound)
+
+
+class SafeNamespace(dict):
+    """A local namespace for :meth:`SafeEvaluator.eval`. It holds its own
+    symbols and falls back (read-only) to the whitelist of the given evaluator
+    for any other name. This allows several users of the same evaluator to
+    keep their symbols apart without adding them to the (shared) whitelist.
+
+    :param evaluator: (SafeEvaluator) the evaluator providing the whitelist
+
+    Other args and kwargs are passed to the dict constructor.
+    """
+
+    __slots__ = ('_evaluator',)
+
+    def __init__(self, evaluator, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._evaluator = evaluator
+
+    def __missing__(self, name):
+        return self._evaluator.safe_dict[name]
+
 
 class SafeEvaluator(object):
     """This class provides a safe eval replacement. 
@@ -43,7 +84,15 @@ class SafeEvaluator(object):
     Functions can be removed by name using removeSafe()
     
     Note: In order to use variables defined outside, the user must explicitly declare them safe. 
+
+    The expressions are compiled only once: the code objects are kept (in a
+    LRU cache of up to :attr:`CodeCacheSize` expressions) and reused in the
+    following evaluations.
     """
+
+    #: maximum number of compiled expressions kept by each evaluator
+    CodeCacheSize = 1000
+
     def __init__(self, safedict=None, defaultSafe=True):
         self._default_numpy = ('abs', 'array', 'arange','arccos', 'arcsin', 'arctan', 'arctan2', 'average',
                                'ceil', 'cos', 'cosh', 'degrees', 'dot', 'e', 'exp', 'fabs', 'floor', 'fmod', 
@@ -77,10 +126,55 @@ class SafeEvaluator(object):
             self.safe_dict['Q'] = Quantity # Q() is an alias for Quantity() 
         
         self._originalSafeDict = self.safe_dict.copy()
+        self._code_cache = OrderedDict()
+        self._code_lock = threading.Lock()
         
-    def eval(self,expr):
-        """safe eval"""
-        return eval(expr, {"__builtins__":None}, self.safe_dict) 
+    def compile(self, expr, symbols=()):
+        """Returns the (cached) code object of the given expression. The names
+        it uses are checked against the whitelist and the given symbols
+        (also when the code is taken from the cache).
+
+        :param expr: (str) a python expression
+        :param symbols: (seq<str>) names (other than the whitelisted ones) that
+                        will be available when the expression is evaluated
+
+        :return: (code) the compiled expression
+
+        :raises: NameError if the expression uses names which are not
+                 whitelisted, SyntaxError if it is not a valid expression
+        """
+        cache = self._code_cache
+        with self._code_lock:
+            entry = cache.pop(expr, None)
+            if entry is not None:
+                cache[expr] = entry # most recently used
+        if entry is None:
+            tree = ast.parse(expr, '<safeeval>', 'eval')
+            entry = compile(tree, '<safeeval>', 'eval'), _getRequiredNames(tree)
+            with self._code_lock:
+                cache.pop(expr, None)
+                cache[expr] = entry
+                while len(cache) > self.CodeCacheSize:
+                    cache.popitem(last=False)
+        code, names = entry
+        for name in names:
+            if name not in self.safe_dict and name not in symbols:
+                raise NameError("name '%s' is not defined" % name)
+        return code
+
+    def eval(self, expr, symbols=None):
+        """safe eval
+
+        :param expr: (str or code) the expression to be evaluated
+        :param symbols: (SafeNamespace) a namespace with additional symbols
+                        for this evaluation. If None (default), only the
+                        whitelisted names are available
+        """
+        if symbols is None:
+            symbols = self.safe_dict
+        if isinstance(expr, basestring):
+            expr = self.compile(expr, symbols=symbols)
+        return eval(expr, {"__builtins__":None}, symbols)
     
     def addSafe(self,safedict):
         """The values in safedict will be evaluable (whitelisted)
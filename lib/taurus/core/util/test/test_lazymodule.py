@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.lazymodule"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import shutil
+import time
+import tempfile
+import threading
+from taurus.external import unittest
+from taurus.core.util.lazymodule import LazyModule
+
+_INIT = """
+from .light import *
+def _answer():
+    return 42
+from taurus.core.util.lazymodule import installLazyModule as _install
+_install(__name__, imports=['heavy'], attributes={'answer': _answer})
+"""
+
+_OTHER = """
+import time
+import _lazypkg
+time.sleep(.2)
+OTHER_HEAVY = _lazypkg.HEAVY
+"""
+
+
+class LazyModuleTest(unittest.TestCase):
+    '''Test case for the taurus.core.util.lazymodule.LazyModule class'''
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        pkg = os.path.join(self.path, '_lazypkg')
+        os.mkdir(pkg)
+        files = {'__init__.py': _INIT,
+                 'light.py': 'LIGHT = 1\n',
+                 'heavy.py': '__all__ = ["HEAVY"]\nHEAVY = 2\nOTHER = 3\n',
+                 'sub.py': 'SUB = 4\n',
+                 'other.py': _OTHER}
+        for name, code in files.items():
+            with open(os.path.join(pkg, name), 'w') as f:
+                f.write(code)
+        sys.path.insert(0, self.path)
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        for name in sys.modules.keys():
+            if name.startswith('_lazypkg'):
+                del sys.modules[name]
+        shutil.rmtree(self.path)
+
+    def test_lazy(self):
+        '''check that the lazy members are imported only when used'''
+        import _lazypkg
+        self.assertIsInstance(_lazypkg, LazyModule)
+        self.assertEqual(_lazypkg.LIGHT, 1)
+        self.assertNotIn('_lazypkg.heavy', sys.modules)
+        self.assertEqual(_lazypkg.HEAVY, 2)
+        self.assertIn('_lazypkg.heavy', sys.modules)
+        self.assertFalse(hasattr(_lazypkg, 'OTHER'))
+        self.assertEqual(_lazypkg.answer, 42)
+        self.assertTrue(_lazypkg.isLoaded())
+
+    def test_submodule(self):
+        '''check that sub-modules are imported without loading the rest'''
+        import _lazypkg
+        from _lazypkg import sub
+        self.assertEqual(sub.SUB, 4)
+        self.assertIs(_lazypkg.sub, sub)
+        self.assertNotIn('_lazypkg.heavy', sys.modules)
+
+    def test_star_import(self):
+        '''check that "from module import *" imports all the lazy members'''
+        ns = {}
+        exec 'from _lazypkg import *' in ns
+        self.assertEqual((ns['LIGHT'], ns['HEAVY'], ns['answer']), (1, 2, 42))
+        self.assertNotIn('_answer', ns)
+
+    def test_threads(self):
+        '''check that resolving a lazy member while another thread imports a
+        module using it does not deadlock'''
+        import _lazypkg
+        results = {}
+        def importOther():
+            import _lazypkg.other
+            results['other'] = sys.modules['_lazypkg.other'].OTHER_HEAVY
+        def getHeavy():
+            results['heavy'] = _lazypkg.HEAVY
+        threads = [threading.Thread(target=importOther),
+                   threading.Thread(target=getHeavy)]
+        for t in threads:
+            t.daemon = True
+            t.start()
+            time.sleep(.1)
+        for t in threads:
+            t.join(2)
+        self.assertFalse(any(t.isAlive() for t in threads), 'deadlocked')
+        self.assertEqual(results, {'other': 2, 'heavy': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
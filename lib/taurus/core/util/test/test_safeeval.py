@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.safeeval"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+from taurus.external import unittest
+from taurus.core.util.safeeval import SafeEvaluator, SafeNamespace
+
+
+class SafeEvaluatorTest(unittest.TestCase):
+    '''Test case for the taurus.core.util.safeeval.SafeEvaluator class'''
+
+    def test_eval(self):
+        '''check the evaluation of whitelisted expressions'''
+        sev = SafeEvaluator({'x': 2})
+        self.assertEqual(sev.eval('x + pow(x, 3)'), 10)
+        self.assertEqual(sev.eval('[i * x for i in range(3)]'), [0, 2, 4])
+        self.assertEqual(sev.eval('"abs" if x is not None else 0'), 'abs')
+
+    def test_not_whitelisted(self):
+        '''check that names which are not whitelisted are rejected'''
+        sev = SafeEvaluator(defaultSafe=False)
+        self.assertRaises(NameError, sev.eval, 'open("/etc/passwd")')
+        self.assertRaises(NameError, sev.compile, 'x + 1')
+        sev.addSafe({'x': 1})
+        self.assertEqual(sev.eval('x + 1'), 2)
+
+    def test_code_cache(self):
+        '''check that expressions are compiled only once'''
+        sev = SafeEvaluator({'x': 1}, defaultSafe=False)
+        code = sev.compile('x * 2')
+        self.assertIs(sev.compile('x * 2'), code)
+        sev.addSafe({'x': 3})
+        self.assertEqual(sev.eval('x * 2'), 6)
+        sev.CodeCacheSize = 2
+        sev.compile('x * 3')
+        sev.compile('x * 4')
+        self.assertEqual(len(sev._code_cache), 2)
+
+    def test_code_cache_lru(self):
+        '''check that the least recently used expression is evicted'''
+        sev = SafeEvaluator({'x': 1}, defaultSafe=False)
+        sev.CodeCacheSize = 2
+        code = sev.compile('x * 2')
+        sev.compile('x * 3')
+        self.assertIs(sev.compile('x * 2'), code)
+        sev.compile('x * 4')
+        self.assertEqual(list(sev._code_cache), ['x * 2', 'x * 4'])
+        self.assertIs(sev.compile('x * 2'), code)
+
+    def test_code_cache_names(self):
+        '''check that the names of a cached expression are checked again'''
+        sev = SafeEvaluator({'x': 1}, defaultSafe=False)
+        code = sev.compile('x + y', symbols=('y',))
+        self.assertRaises(NameError, sev.compile, 'x + y')
+        self.assertIs(sev.compile('x + y', symbols=('y',)), code)
+        sev.removeSafe('x')
+        self.assertRaises(NameError, sev.compile, 'x + y', symbols=('y',))
+
+    def test_namespace(self):
+        '''check that the symbols of a namespace do not leak to the evaluator'''
+        sev = SafeEvaluator({'x': 1})
+        ns1 = SafeNamespace(sev, y=2)
+        ns2 = SafeNamespace(sev, y=3)
+        self.assertEqual(sev.eval('sqrt(x + y)', ns1), 3 ** .5)
+        self.assertEqual(sev.eval('sqrt(x + y)', ns2), 2)
+        self.assertRaises(NameError, sev.eval, 'x + y')
+        self.assertFalse('y' in sev.getSafe())
+        sev.addSafe({'x': 5})
+        self.assertEqual(sev.eval('x + y', ns1), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
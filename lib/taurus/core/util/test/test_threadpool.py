@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.util.threadpool"""
+
+__docformat__ = 'restructuredtext'
+
+import time
+import threading
+from taurus.external import unittest
+from taurus.core.util.threadpool import ThreadPool, CoalescingThreadPool
+
+
+class ThreadPoolTest(unittest.TestCase):
+    '''Test case for testing the taurus.core.util.threadpool.ThreadPool class'''
+
+    def setUp(self):
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.join()
+
+    def _pool(self, Psize=2, **kwargs):
+        pool = ThreadPool(name='TestTP', Psize=Psize, Qsize=0, **kwargs)
+        self.pools.append(pool)
+        return pool
+
+    def _wait(self, pool, n, timeout=2):
+        t0 = time.time()
+        while pool.getStats()['done'] < n and time.time() - t0 < timeout:
+            time.sleep(.01)
+
+    def test_stats(self):
+        '''check the metrics of the pool'''
+        pool = self._pool(debug=False)
+        for i in range(4):
+            pool.add(time.sleep, None, .05)
+        pool.add(self._badJob)
+        self._wait(pool, 5)
+        stats = pool.getStats()
+        self.assertEqual(stats['done'], 5)
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['qsize'], 0)
+        self.assertEqual(stats['workers'], 2)
+        self.assertGreaterEqual(stats['run_time'], .2)
+        self.assertGreaterEqual(stats['max_run_time'], .05)
+        self.assertGreater(stats['max_wait_time'], 0)
+        pool.resetStats()
+        self.assertEqual(pool.getStats()['done'], 0)
+
+    def test_dropped(self):
+        '''check that jobs added after joining are counted as dropped'''
+        pool = self._pool()
+        pool.join()
+        pool.add(time.sleep, None, 0)
+        self.assertEqual(pool.getStats()['dropped'], 1)
+
+    def test_debug(self):
+        '''check that the stack of the caller is only recorded in debug mode'''
+        for debug in (False, True):
+            pool = self._pool(Psize=0, debug=debug)
+            pool.add(time.sleep, None, 0)
+            stack = pool.jobs.get()[5]
+            self.assertEqual(stack is not None, debug)
+
+    def _badJob(self):
+        raise RuntimeError('expected failure')
+
+
+class CoalescingThreadPoolTest(unittest.TestCase):
+    '''Test case for testing the
+    taurus.core.util.threadpool.CoalescingThreadPool class'''
+
+    def setUp(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.pool = CoalescingThreadPool(name='TestCTP', Psize=1, Qsize=3)
+
+    def tearDown(self):
+        self.gate.set()
+        self.pool.join()
+
+    def _job(self, key, value):
+        self.gate.wait(2)
+        self.calls.append((key, value))
+
+    def _wait(self, n, timeout=2):
+        t0 = time.time()
+        while self.pool.getStats()['done'] < n and time.time() - t0 < timeout:
+            time.sleep(.01)
+
+    def test_coalesce(self):
+        '''check that only the latest pending job of each key is run'''
+        pool = self.pool
+        self.assertTrue(pool.add('a', self._job, None, 'a', 0))
+        time.sleep(.05) # let the worker block in the first job
+        for i in range(1, 4):
+            self.assertTrue(pool.add('a', self._job, None, 'a', i))
+            self.assertTrue(pool.add('b', self._job, None, 'b', i))
+        self.assertTrue(pool.add('c', self._job, None, 'c', 1))
+        self.assertFalse(pool.add('d', self._job, None, 'd', 1))
+        self.gate.set()
+        self._wait(4)
+        self.assertEqual(self.calls, [('a', 0), ('a', 3), ('b', 3), ('c', 1)])
+        stats = pool.getStats()
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['done'], 4)
+
+    def _join(self, pool, timeout=2):
+        '''joins the pool in another thread and returns True if it ended
+        before the timeout'''
+        joiner = threading.Thread(target=pool.join)
+        joiner.daemon = True
+        joiner.start()
+        joiner.join(timeout)
+        return not joiner.isAlive()
+
+    def test_join(self):
+        '''check that pending jobs are processed before ending the workers'''
+        pool = self.pool
+        pool.add('a', self._job, None, 'a', 0)
+        pool.add('b', self._job, None, 'b', 0)
+        threading.Timer(.1, self.gate.set).start()
+        t0 = time.time()
+        pool.join()
+        self.assertLess(time.time() - t0, 1)
+        self.assertEqual(self.calls, [('a', 0), ('b', 0)])
+        self.assertFalse(pool.add('c', self._job, None, 'c', 0))
+        self.assertEqual(pool.size, 0)
+
+    def test_join_same_key(self):
+        '''check that join ends when a job of a running key is pending'''
+        pool = CoalescingThreadPool(name='TestCTP3', Psize=3)
+        pool.add('a', self._job, None, 'a', 0)
+        time.sleep(.05) # let a worker block in the first job
+        pool.add('a', self._job, None, 'a', 1)
+        threading.Timer(.1, self.gate.set).start()
+        self.assertTrue(self._join(pool))
+        self.assertEqual(self.calls, [('a', 0), ('a', 1)])
+        self.assertEqual(pool.size, 0)
+
+
+if __name__ == '__main__':
+    pass
@@ -25,12 +25,14 @@
 
 """adapted from http://code.activestate.com/recipes/576576/"""
 
-__all__ = ["ThreadPool", "Worker"]
+__all__ = ["ThreadPool", "Worker", "CoalescingThreadPool"]
 
 __docformat__ = "restructuredtext"
 
-from threading import Thread, currentThread
+import os
+from threading import Thread, Lock, Condition, currentThread
 from Queue import Queue
+from collections import OrderedDict
 from time import sleep, time
 from traceback import extract_stack, format_list
 
@@ -39,13 +41,30 @@ from log import Logger, DebugIt, TraceIt
 
 
 class ThreadPool(Logger):
-    """"""
+    """A pool of worker threads processing the jobs of a queue.
+
+    By default only the name of the thread which queued a job is recorded
+    and logged if the job fails. In debug mode the whole stack of the caller
+    is also recorded (which is expensive). The debug mode can be enabled per
+    pool (see :attr:`debug`) or globally by setting the environment variable
+    TAURUS_THREADPOOL_DEBUG=1
+
+    The pool keeps some cheap metrics (see :meth:`getStats`)"""
     
-    NoJob = 6*(None,)
+    NoJob = 7*(None,)
+
+    #: default debug mode for new pools
+    Debug = os.environ.get('TAURUS_THREADPOOL_DEBUG', '0') not in ('', '0')
     
-    def __init__(self, name=None, parent=None, Psize=20, Qsize=20, daemons=True):
+    def __init__(self, name=None, parent=None, Psize=20, Qsize=20, daemons=True,
+                 debug=None):
         Logger.__init__(self, name, parent)
         self._daemons = daemons
+        if debug is None:
+            debug = self.Debug
+        self.debug_mode = debug
+        self._stats_lock = Lock()
+        self.resetStats()
         self.localThreadId = 0
         self.workers = []
         self.jobs = Queue(Qsize)
@@ -83,8 +102,56 @@ class ThreadPool(Logger):
         if self.accept:
             # first gather some information on the object which requested the
             # job in case the job throws an exception
-            th_id, stack = currentThread().name, extract_stack()[:-1]
-            self.jobs.put((job, args, kw, callback, th_id, stack))
+            th_id = currentThread().name
+            if self.debug_mode:
+                stack = extract_stack()[:-1]
+            else:
+                stack = None
+            self.jobs.put((job, args, kw, callback, th_id, stack, time()))
+        else:
+            with self._stats_lock:
+                self._dropped += 1
+
+    def resetStats(self):
+        """Resets the metrics of the pool"""
+        with self._stats_lock:
+            self._done = self._failed = self._dropped = 0
+            self._wait_time = self._max_wait_time = 0.0
+            self._run_time = self._max_run_time = 0.0
+
+    def _addJobStats(self, wait_time, run_time, failed):
+        with self._stats_lock:
+            self._done += 1
+            if failed:
+                self._failed += 1
+            self._wait_time += wait_time
+            self._run_time += run_time
+            if wait_time > self._max_wait_time:
+                self._max_wait_time = wait_time
+            if run_time > self._max_run_time:
+                self._max_run_time = run_time
+
+    def getStats(self):
+        """Returns the metrics of the pool
+
+        :return: (dict) a dictionary with the following keys: 'qsize' (jobs
+                 currently queued), 'workers', 'busy' (busy workers), 'done'
+                 (processed jobs), 'failed' (jobs which raised an exception),
+                 'dropped' (jobs rejected because the pool was not accepting
+                 jobs), 'wait_time' and 'max_wait_time' (total and maximum
+                 time in seconds that the jobs spent in the queue) and
+                 'run_time' and 'max_run_time' (total and maximum time in
+                 seconds that the jobs took to run)
+        """
+        with self._stats_lock:
+            stats = dict(done=self._done, failed=self._failed,
+                         dropped=self._dropped, wait_time=self._wait_time,
+                         max_wait_time=self._max_wait_time,
+                         run_time=self._run_time,
+                         max_run_time=self._max_run_time)
+        stats.update(qsize=self.qsize, workers=self.size,
+                     busy=self.getNumOfBusyWorkers())
+        return stats
             
     def join(self):
         self.accept=False
@@ -123,23 +190,33 @@ class Worker(Thread, Logger):
     def run(self):
         get = self.pool.jobs.get
         while True:
-            cmd, args, kw, callback, th_id, stack = get()
+            cmd, args, kw, callback, th_id, stack, t_queued = get()
             if cmd:
                 self.busy = True
                 self.cmd = cmd.__name__
+                failed = False
+                t_start = time()
                 try:
                     if callback:
                         callback(cmd(*args, **kw))
                     else:
                         cmd(*args, **kw)
                 except:
-                    orig_stack = "".join(format_list(stack))
+                    failed = True
+                    if stack is None:
+                        orig_stack = "(set TAURUS_THREADPOOL_DEBUG=1 to " \
+                                     "get the stack of the caller)"
+                    else:
+                        orig_stack = "".join(format_list(stack))
                     self.error("Uncaught exception running job '%s' called "
                                "from thread %s:\n%s",
                                self.cmd, th_id, orig_stack, exc_info=1)
                 finally:
                     self.busy = False
                     self.cmd = ''
+                    t_end = time()
+                    self.pool._addJobStats(t_start - t_queued, t_end - t_start,
+                                           failed)
             else:
                 self.pool.workers.remove(self)
                 return
@@ -147,6 +224,196 @@ class Worker(Thread, Logger):
     def isBusy(self):
         return self.busy
 
+
+class CoalescingThreadPool(Logger):
+    """A pool of worker threads processing keyed jobs where only the latest
+    pending job of each key is kept.
+
+    Adding a job never blocks the caller: if a job with the same key is
+    already pending it is replaced by the new one (coalesced) and if the
+    queue already holds Qsize keys the new job is dropped. Jobs with the same
+    key are never run concurrently, so they run in the order in which they
+    were added.
+
+    The pool keeps some cheap metrics (see :meth:`getStats`)"""
+
+    def __init__(self, name=None, parent=None, Psize=5, Qsize=1000,
+                 daemons=True):
+        Logger.__init__(self, name, parent)
+        self._daemons = daemons
+        self._cond = Condition()
+        self._pending = OrderedDict()
+        self._running = set()
+        self._to_stop = 0
+        self.maxsize = Qsize
+        self.resetStats()
+        self.accept = True
+        self.localThreadId = 0
+        self.workers = []
+        self.size = Psize
+
+    @propertx
+    def size():
+        def set(self, newSize):
+            """set method for the size property"""
+            with self._cond:
+                nb_workers = len(self.workers) - self._to_stop
+                for i in range(newSize - nb_workers):
+                    self.localThreadId += 1
+                    name = "%s.W%03i" % (self.log_name, self.localThreadId)
+                    new = _CoalescingWorker(self, name, self._daemons)
+                    self.workers.append(new)
+                    self.debug("Starting %s" % name)
+                    new.start()
+                if newSize < nb_workers:
+                    self._to_stop += nb_workers - newSize
+                    self._cond.notifyAll()
+
+        def get(self):
+            """get method for the size property"""
+            return len(self.workers) - self._to_stop
+
+        return get, set, None, "number of threads"
+
+    def add(self, key, job, callback=None, *args, **kw):
+        """Adds a job to the queue, replacing the pending job with the same
+        key (if any). It never blocks
+
+        :param key: (object) a hashable key
+        :param job: (callable) the job
+        :param callback: (callable or None) called with the result of the job
+        :param args: (list) list of arguments passed to the job
+        :param kw: (dict) keyword arguments passed to the job
+
+        :return: (bool) False if the job was dropped, True otherwise
+        """
+        with self._cond:
+            if not self.accept:
+                self._dropped += 1
+                return False
+            pending = self._pending
+            if key in pending:
+                # keep the queue position and the enqueue time of the key
+                t_queued = pending[key][-1]
+                pending[key] = job, args, kw, callback, t_queued
+                self._coalesced += 1
+                return True
+            if self.maxsize > 0 and len(pending) >= self.maxsize:
+                self._dropped += 1
+                return False
+            pending[key] = job, args, kw, callback, time()
+            self._cond.notify()
+            return True
+
+    def join(self):
+        """Stops accepting jobs and ends the workers once the pending jobs
+        have been processed"""
+        with self._cond:
+            self.accept = False
+            workers = list(self.workers)
+            self._to_stop = len(workers)
+            self._cond.notifyAll()
+        for w in workers:
+            if w is not currentThread():
+                w.join()
+
+    @property
+    def qsize(self):
+        return len(self._pending)
+
+    def getNumOfBusyWorkers(self):
+        """Get the number of workers that are in busy mode."""
+        return len(self._running)
+
+    def resetStats(self):
+        """Resets the metrics of the pool"""
+        with self._cond:
+            self._done = self._failed = self._dropped = self._coalesced = 0
+            self._wait_time = self._max_wait_time = 0.0
+            self._run_time = self._max_run_time = 0.0
+
+    def getStats(self):
+        """Returns the metrics of the pool
+
+        :return: (dict) the same metrics as :meth:`ThreadPool.getStats` plus
+                 'coalesced' (jobs which replaced a pending job with the
+                 same key). 'dropped' also counts the jobs rejected because
+                 the queue was full
+        """
+        with self._cond:
+            return dict(qsize=len(self._pending), workers=self.size,
+                        busy=len(self._running), done=self._done,
+                        failed=self._failed, dropped=self._dropped,
+                        coalesced=self._coalesced,
+                        wait_time=self._wait_time,
+                        max_wait_time=self._max_wait_time,
+                        run_time=self._run_time,
+                        max_run_time=self._max_run_time)
+
+    def _get(self, worker):
+        """Returns the next (key, job) whose key is not being run. Returns
+        None if the worker must end"""
+        with self._cond:
+            while True:
+                for key in self._pending:
+                    if key not in self._running:
+                        self._running.add(key)
+                        return key, self._pending.pop(key)
+                if self._to_stop > 0 and (self.accept or not self._pending):
+                    self._to_stop -= 1
+                    self.workers.remove(worker)
+                    return None
+                self._cond.wait()
+
+    def _jobDone(self, key, wait_time, run_time, failed):
+        with self._cond:
+            self._running.discard(key)
+            if not self.accept or not self._pending:
+                # the workers waiting to end must check again
+                self._cond.notifyAll()
+            elif key in self._pending:
+                self._cond.notify()
+            self._done += 1
+            if failed:
+                self._failed += 1
+            self._wait_time += wait_time
+            self._run_time += run_time
+            if wait_time > self._max_wait_time:
+                self._max_wait_time = wait_time
+            if run_time > self._max_run_time:
+                self._max_run_time = run_time
+
+
+class _CoalescingWorker(Thread, Logger):
+
+    def __init__(self, pool, name=None, daemon=True):
+        name = name or self.__class__.__name__
+        Thread.__init__(self, name=name)
+        Logger.__init__(self, name, pool)
+        self.daemon = daemon
+        self.pool = pool
+
+    def run(self):
+        while True:
+            item = self.pool._get(self)
+            if item is None:
+                return
+            key, (cmd, args, kw, callback, t_queued) = item
+            failed = False
+            t_start = time()
+            try:
+                if callback:
+                    callback(cmd(*args, **kw))
+                else:
+                    cmd(*args, **kw)
+            except:
+                failed = True
+                self.error("Uncaught exception running job '%s'",
+                           cmd.__name__, exc_info=1)
+            finally:
+                self.pool._jobDone(key, t_start - t_queued, time() - t_start,
+                                   failed)
+
 if __name__=='__main__':
 
     def easyJob(*arg, **kw):
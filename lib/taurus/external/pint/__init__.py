@@ -25,6 +25,15 @@
 
 from __future__ import absolute_import
 
+# pint_local is a bundled copy of pint with the following local changes
+# (marked with "taurus:" comments), to be kept when it is updated:
+#  - pint_local/__init__.py: pkg_resources is not imported to find the
+#    version of the copy (it is always "unknown")
+#  - pint_local/unit.py: the definition files are read directly from the
+#    package directory (pkg_resources is only imported if it is zipped)
+# Both avoid importing pkg_resources, which is slow, when the first
+# attribute is created (see taurus.test.test_importtime)
+
 try:
     from pint import __version__
     if __version__.split('.') < ['0','7']:
@@ -14,7 +14,6 @@
 from __future__ import with_statement
 import os
 import subprocess
-import pkg_resources
 from .formatting import formatter
 from .unit import (UnitRegistry, LazyRegistry)
 from .errors import (DimensionalityError, OffsetUnitCalculusError,
@@ -24,12 +23,9 @@ from .util import pi_theorem, logger
 from .context import Context
 
 
-try:                # pragma: no cover
-    __version__ = pkg_resources.get_distribution('pint').version
-except:             # pragma: no cover
-    # we seem to have a local copy not installed without setuptools
-    # so the reported version will be unknown
-    __version__ = "unknown"
+# taurus: this copy is only used when pint (>=0.7) is not installed, so
+# pkg_resources (slow to import) cannot tell its version
+__version__ = "unknown"
 
 
 #: A Registry with the default units and constants.
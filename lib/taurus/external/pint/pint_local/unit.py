@@ -16,7 +16,6 @@ import math
 import itertools
 import functools
 import operator
-import pkg_resources
 from decimal import Decimal
 from contextlib import contextmanager, closing
 from io import open, StringIO
@@ -593,8 +592,16 @@ class UnitRegistry(object):
         if isinstance(file, string_types):
             try:
                 if is_resource:
-                    with closing(pkg_resources.resource_stream(__name__, file)) as fp:
-                        rbytes = fp.read()
+                    # taurus: avoid importing pkg_resources (slow) unless
+                    # the package is not in the file system (e.g. zipped)
+                    path = os.path.join(os.path.dirname(__file__), file)
+                    if os.path.isfile(path):
+                        with open(path, 'rb') as fp:
+                            rbytes = fp.read()
+                    else:
+                        import pkg_resources
+                        with closing(pkg_resources.resource_stream(__name__, file)) as fp:
+                            rbytes = fp.read()
                     return self.load_definitions(StringIO(rbytes.decode('utf-8')), is_resource)
                 else:
                     with open(file, encoding='utf-8') as fp:
@@ -161,9 +161,17 @@ class TaurusTreeSimpleDeviceItem(TaurusTreeDbBaseItem):
         return ElemType.Device
 
 
+def _noop(*args):
+    pass
+
+
 class TaurusTreeDeviceItem(TaurusTreeDbBaseItem):
     """A node designed to represent a device"""
 
+    #: the attributes of the sibling devices are prefetched when the first
+    #: device is expanded only if there are at most this number of siblings
+    MaxPrefetch = 256
+
     def child(self, row):
         self.updateChilds()
         return super(TaurusTreeDeviceItem, self).child(row)
@@ -191,11 +199,36 @@ class TaurusTreeDeviceItem(TaurusTreeDbBaseItem):
     def updateChilds(self):
         if len(self._childItems) > 0:
             return
-        for attr in self._itemData.attributes():
+        data = self._itemData
+        if not data.attributesCached():
+            self.prefetchSiblings()
+        for attr in data.attributes():
             c = TaurusTreeAttributeItem(self._model, attr, self)
             self.appendChild(c)
         return
 
+    def prefetchSiblings(self):
+        """Starts refreshing (in background) the attributes of the sibling
+        devices, so that they are ready when the user expands them. The
+        devices already being refreshed are skipped"""
+        parent = self.parent()
+        if parent is None:
+            return
+        siblings = parent._childItems
+        if len(siblings) > self.MaxPrefetch:
+            return
+        cache = self._itemData.container()
+        devices = []
+        for item in siblings:
+            if item is self or not isinstance(item, TaurusTreeDeviceItem):
+                continue
+            data = item.itemData()
+            if not (data.attributesCached() or
+                    cache.isRefreshingAttributes(data)):
+                devices.append(data)
+        if devices:
+            cache.refreshAttributes(devices, callback=_noop)
+
     def data(self, index):
         column, model = index.column(), index.model()
         role = model.role(column, self.depth())
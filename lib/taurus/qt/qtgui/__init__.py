@@ -30,3 +30,8 @@ abstract model data."""
 
 __docformat__ = 'restructuredtext'
 
+
+# the widget sub-packages (taurus.qt.qtgui.display, taurus.qt.qtgui.plot,...)
+# are imported on first access to them
+from taurus.core.util.lazymodule import installLazyModule as _installLazyModule
+_installLazyModule(__name__)
@@ -27,9 +27,11 @@
 
 from __future__ import absolute_import
 
-__all__ = ["new_parser", "parse"]
+__all__ = ["new_parser", "parse", "clear_cache"]
 
 import os,re,traceback
+import threading
+from collections import OrderedDict
 
 from ply import lex
 from ply import yacc
@@ -129,10 +131,10 @@ def p_global(p):
 
 def p_element_list(p):
     '''element_list : element_list element '''
+    # (appending in place avoids copying the list for every element)
+    p[0] = p[1]
     if not p[2] is None:
-        p[0] = p[1] + [p[2]]
-    else:
-        p[0] = p[1]
+        p[0].append(p[2])
 
 def p_element(p):
     '''element_list : element '''
@@ -162,16 +164,21 @@ def p_single_element(p):
                 p[3]['name'] = name = model
                 break
     #print 'parser: %s => %s [%s]' % (org,name,p.parser.modelStack)
+    factory = p.parser.factory
     extension = p[3].get("extensions")     
     if p.parser.modelStack2:
         if extension is None:
             p[3]["extensions"]=p.parser.modelStack2[0]
         elif len(p.parser.modelStack2)==2:
-            extension.update(p.parser.modelStack2[0])
+            if isinstance(factory, _JDrawTree):
+                # done when the tree is built, as the inherited extensions
+                # may be changed by the creation of the previous objects
+                factory.inheritExtensions(extension, p.parser.modelStack2[0])
+            else:
+                extension.update(p.parser.modelStack2[0])
             p[3]["extensions"] = extension
 
     # create the corresponding element
-    factory = p.parser.factory
     #p.parser.log.debug('ret = factory.getObj(%s,%s)'% (str(p[1]),str(p[3])))
     ret = factory.getObj(p[1],p[3])
  
@@ -240,7 +247,8 @@ def p_param_value_number_list(p):
 
 def p_value_list(p):
     ''' value_list : value_list COMMA value '''
-    p[0] = p[1] + [p[3]]
+    p[0] = p[1]
+    p[0].append(p[3])
 
 def p_value_list_value(p):
     ''' value_list : value '''
@@ -276,27 +284,38 @@ def new_parser(optimize=None, debug=0, outputdir=None):
                          debug=debug, debuglog=debuglog, errorlog=log)
     
     # lex/yacc v<3.0 do not accept  debuglog or errorlog keyword args
-    if int(lex.__version__.split('.')[0]) < 3: 
+    old_ply = int(lex.__version__.split('.')[0]) < 3
+    if old_ply: 
         common_kwargs.pop('debuglog')
         common_kwargs.pop('errorlog')
+
+    # on read-only installations the tables cannot be written next to this
+    # module: avoid trying it (the yacc tables are pickled in the user
+    # directory instead)
+    writable = os.access(outputdir, os.W_OK)
+    lex_kwargs, yacc_kwargs = dict(common_kwargs), dict(write_tables=writable)
     
     try:
         from . import jdraw_lextab
     except ImportError:
         jdraw_lextab = 'jdraw_lextab'
+        if not writable:
+            lex_kwargs['optimize'] = 0
 
     try:
         from . import jdraw_yacctab
     except ImportError:
         jdraw_yacctab = 'jdraw_yacctab'
+        if not writable and not old_ply and optimize:
+            yacc_kwargs['picklefile'] = _get_user_picklefile()
 
     # Lexer
-    l = lex.lex(lextab=jdraw_lextab, **common_kwargs)
+    l = lex.lex(lextab=jdraw_lextab, **lex_kwargs)
 
     # Yacc
     try:
-        p = yacc.yacc(tabmodule=jdraw_yacctab, debugfile=None, write_tables=1,
-                      **common_kwargs)
+        p = yacc.yacc(tabmodule=jdraw_yacctab, debugfile=None,
+                      **dict(common_kwargs, **yacc_kwargs))
     except Exception, e:
         msg = ('Error while parsing. You may solve it by:\n' + \
                '  a) removing jdraw_lextab.* and jdraw_yacctab.* from\n' +\
@@ -305,23 +324,168 @@ def new_parser(optimize=None, debug=0, outputdir=None):
         raise RuntimeError(msg)
         
     return l, p
-    
+
+
+def _get_user_picklefile():
+    """returns the file where the yacc tables are stored when they cannot be
+    written in the taurus installation directory"""
+    path = os.path.join(os.path.expanduser('~'), '.taurus')
+    if not os.path.isdir(path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            return None
+    return os.path.join(path, 'jdraw_yacctab-%s.pickle' % yacc.__version__)
+
+
+#-------------------------------------------------------------------------------
+# Parser and parsed file caches
+#-------------------------------------------------------------------------------
+
+# the lexer and parser are built only once and reused for all the files
+_PARSER = None
+_PARSER_LOCK = threading.RLock()
+
+# maximum number of parsed files kept in memory
+CACHE_SIZE = 16
+_CACHE = OrderedDict()
+
+
+class _Element(object):
+    """Placeholder of a JDraw object in a parsed :class:`_JDrawTree`"""
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        self.index = index
+
+
+class _JDrawTree(object):
+    """The result of parsing a JDraw file, independent of the graphics
+    factory. It records the calls done by the parser to the factory, so
+    that they can be replayed (in the same order) on any factory.
+
+    It can be given as factory to the parser.
+    """
+
+    def __init__(self):
+        self.objs = []
+        self.items = None
+        self._inherited = None
+
+    def inheritExtensions(self, extensions, inherited):
+        """the next object extends its extensions with the inherited ones"""
+        self._inherited = extensions, inherited
+
+    def getObj(self, name, params):
+        element = _Element(len(self.objs))
+        self.objs.append((element, name, params, self._inherited))
+        self._inherited = None
+        return element
+
+    def getSceneObj(self, items):
+        self.items = items
+        return self
+
+    def build(self, factory):
+        """Creates the scene in the given factory
+
+        :param factory: (TaurusBaseGraphicsFactory) the graphics factory
+
+        :return: the scene returned by the factory
+        """
+        log = None
+        # the memo is shared by all the copies, so that the references
+        # between the parameters of different objects are kept
+        memo = {}
+        for element, name, params, inherited in self.objs:
+            params = _copy(params, memo)
+            if inherited is not None:
+                extensions, inherited = inherited
+                _copy(extensions, memo).update(_copy(inherited, memo))
+            obj = factory.getObj(name, params)
+            if obj is None:
+                log = log or Logger('JDraw Parser')
+                log.info("Unable to create obj '%s'" % name)
+            memo[id(element)] = obj
+        items = [item for item in _copy(self.items, memo) if item is not None]
+        return factory.getSceneObj(items)
+
+
+def _copy(value, memo):
+    """copies the lists and dicts of a parsed value (it is faster than
+    copy.deepcopy for the types created by the parser). The objects already
+    created are taken from the memo"""
+    klass = type(value)
+    if klass is list:
+        ret = memo.get(id(value))
+        if ret is None:
+            ret = memo[id(value)] = []
+            ret.extend([_copy(v, memo) for v in value])
+        return ret
+    elif klass is dict:
+        ret = memo.get(id(value))
+        if ret is None:
+            ret = memo[id(value)] = {}
+            for k, v in value.iteritems():
+                ret[k] = _copy(v, memo)
+        return ret
+    elif klass is _Element:
+        return memo[id(value)]
+    return value
+
+
+def _get_parser():
+    global _PARSER
+    with _PARSER_LOCK:
+        if _PARSER is None:
+            _PARSER = new_parser()
+        return _PARSER
+
+
+def _parse_tree(filename):
+    """returns the (cached) :class:`_JDrawTree` of the given file, or None
+    if it could not be parsed"""
+    st = os.stat(filename)
+    key = st.st_mtime, st.st_size
+    with _PARSER_LOCK:
+        cached = _CACHE.pop(filename, None)
+        if cached is not None and cached[0] == key:
+            _CACHE[filename] = cached
+            return cached[1]
+        l, p = _get_parser()
+        tree = _JDrawTree()
+        p.factory = tree
+        p.modelStack = []
+        p.modelStack2 = []
+        l.lineno = 1
+        with open(filename) as f:
+            res = p.parse(f.read(), lexer=l)
+        p.factory = None
+        if res is None:
+            return None
+        _CACHE[filename] = key, tree
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+        return tree
+
+
+def clear_cache():
+    """Forgets all the parsed JDraw files"""
+    with _PARSER_LOCK:
+        _CACHE.clear()
+
+
 def parse(filename=None, factory=None):
 
     if filename is None or factory is None:
         return
 
-    _, p = new_parser()
-
-    p.factory = factory
-    p.modelStack = []
-    p.modelStack2 = []
-
     res = None
     try:
         filename = os.path.realpath(filename)
-        f = open(filename)
-        res = yacc.parse(f.read())
+        tree = _parse_tree(filename)
+        if tree is not None:
+            res = tree.build(factory)
     except:
         log = Logger('JDraw Parser')
         log.warning("Failed to parse %s" % filename)
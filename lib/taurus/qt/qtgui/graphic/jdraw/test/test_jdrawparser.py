@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the cache of parsed files of the jdraw parser"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import copy
+import shutil
+import tempfile
+
+from taurus.external import unittest
+from taurus.qt.qtgui.graphic.jdraw import jdraw_parser
+
+RES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'res')
+
+
+class _RecordingFactory(object):
+    """A graphics factory which records the calls of the parser. The
+    created objects are their call numbers"""
+
+    def __init__(self):
+        self.calls = []
+
+    def getObj(self, name, params):
+        self.calls.append(('getObj', name, copy.deepcopy(params)))
+        return len(self.calls)
+
+    def getSceneObj(self, items):
+        self.calls.append(('getSceneObj', list(items)))
+        return self
+
+
+def _parse_direct(filename):
+    """parses the given file calling the factory directly from the
+    grammar (i.e. without the cache)"""
+    factory = _RecordingFactory()
+    l, p = jdraw_parser.new_parser()
+    p.factory = factory
+    p.modelStack = []
+    p.modelStack2 = []
+    with open(filename) as f:
+        p.parse(f.read(), lexer=l)
+    return factory.calls
+
+
+class JDrawParserCacheTestCase(unittest.TestCase):
+    """Test case for the cache of parsed files of the jdraw parser"""
+
+    def setUp(self):
+        jdraw_parser.clear_cache()
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        jdraw_parser.clear_cache()
+        shutil.rmtree(self.tmpdir)
+
+    def _parse(self, filename):
+        factory = _RecordingFactory()
+        self.assertIs(jdraw_parser.parse(filename, factory), factory)
+        return factory.calls
+
+    def test_replay(self):
+        """check that the cached files replay the factory calls of the
+        direct parsing"""
+        for name in sorted(os.listdir(RES_DIR)):
+            if not name.endswith('.jdw'):
+                continue
+            filename = os.path.join(RES_DIR, name)
+            expected = _parse_direct(filename)
+            self.assertTrue(expected)
+            # parsed (and cached)
+            self.assertEqual(self._parse(filename), expected)
+            # replayed from the cache
+            self.assertEqual(self._parse(filename), expected)
+
+    def test_mtime(self):
+        """check that a file is parsed again when it changes"""
+        filename = os.path.join(self.tmpdir, 'test.jdw')
+        shutil.copy(os.path.join(RES_DIR, 'SimpleScalarViewer.jdw'), filename)
+        tree = jdraw_parser._parse_tree(filename)
+        self.assertIs(jdraw_parser._parse_tree(filename), tree)
+        # same size, different contents and modification time
+        with open(filename) as f:
+            text = f.read()
+        with open(filename, 'w') as f:
+            f.write(text.replace('"big box"', '"BIG BOX"'))
+        st = os.stat(filename)
+        os.utime(filename, (st.st_atime, st.st_mtime + 10))
+        self.assertIsNot(jdraw_parser._parse_tree(filename), tree)
+        labels = [call[2].get('text') for call in self._parse(filename)
+                  if call[:2] == ('getObj', 'JDLabel')]
+        self.assertIn('BIG BOX', labels)
+        self.assertNotIn('big box', labels)
+
+
+if __name__ == '__main__':
+    unittest.main()
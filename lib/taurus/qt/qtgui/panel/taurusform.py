@@ -413,7 +413,15 @@ class TaurusForm(TaurusWidget):
             parent_model = self.getParentModelObj()
             if parent_model:
                 parent_name = parent_model.getFullName()
-        
+
+        # create the attributes in bulk. The factory only keeps weak
+        # references, so the list keeps them alive until the children hold
+        # them
+        models = [m for m in self.getModel() if m]
+        if parent_name:
+            models = ["%s/%s" % (parent_name, m) for m in models]
+        attrs = taurus.Attributes(models) if len(models) > 1 else None
+
         for i,model in enumerate(self.getModel()):
             if not model:
                 continue
@@ -435,6 +443,7 @@ class TaurusForm(TaurusWidget):
             widget.setObjectName("__item%i"%i)
             self.registerConfigDelegate(widget)
             self._children.append(widget)
+        del attrs # the children hold the attributes now
        
         frame.layout().addItem(Qt.QSpacerItem(0,0,Qt.QSizePolicy.Minimum,Qt.QSizePolicy.MinimumExpanding))
         self.scrollArea.setWidget(frame)
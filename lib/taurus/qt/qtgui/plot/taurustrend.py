@@ -1076,6 +1076,13 @@ class TaurusTrend(TaurusPlot):
             if len(del_sets) == len(self.trendSets):
                 self._curvePens.setCurrentIndex(0)
             
+            # create in bulk the attributes of the new trend sets. The factory
+            # only keeps weak references, so the list keeps them alive until
+            # the trend sets hold them
+            new_names = [n for n in map(str, names)
+                         if not (self.trendSets.has_key(n) or "scan://" in n)]
+            attrs = taurus.Attributes(new_names) if len(new_names) > 1 else None
+
             #update new/existing trendsets
             for name in names:
                 name = str(name)
@@ -1093,6 +1100,7 @@ class TaurusTrend(TaurusPlot):
                             tset.setForcedReadingPeriod(self._forcedReadingPeriod)
                     self.trendSets[name] = tset
                     tset.registerDataChanged(self, self.curveDataChanged)
+            del attrs # the trend sets hold the attributes now
             # Trend Sets to be removed
             for name in del_sets:
                 name = str(name)
@@ -85,7 +85,8 @@ def get_all_models(expressions,limit=1000):
         #self.trace( 'Using a simulated database ...')
         models = expressions
     else:
-        all_devs = taurus_db.get_device_exported('*')
+        from taurus.core.tango.search import get_device_index, compile_regexp
+        all_devs = get_device_index(exported=True, db=taurus_db)
         models = []
         for exp in expressions:
             #self.trace( 'evaluating exp = "%s"' % exp)
@@ -97,7 +98,7 @@ def get_all_models(expressions,limit=1000):
             
             if any(c in device for c in '.*[]()+?'):
                 if '*' in device and '.*' not in device: device = device.replace('*','.*')
-                devs = [s for s in all_devs if re_match_low(device,s)]
+                devs = all_devs.search(device)
             else:
                 devs = [device]
                 
@@ -110,7 +111,8 @@ def get_all_models(expressions,limit=1000):
                         #taurus_dp = taurus.core.taurusdevice.TaurusDevice(dev)
                         taurus_dp = taurus.core.taurusmanager.TaurusManager().getFactory()().getDevice(dev)
                         #self.debug( "taurus_dp = %s"%taurus_dp.getFullName())
-                        attrs = [att.name for att in taurus_dp.attribute_list_query() if re_match_low(attribute,att.name)]
+                        match = compile_regexp(attribute.lower()).match
+                        attrs = [att.name for att in taurus_dp.attribute_list_query() if match(att.name.lower())]
                         targets.extend(dev+'/'+att for att in attrs)
                     except Exception,e: 
                         #self.warning( 'ERROR! TaurusGrid.get_all_models(): Unable to get attributes for device %s: %s' % (dev,str(e)))
@@ -143,7 +145,8 @@ def get_readwrite_models(expressions,limit=1000):
     if 'SimulationAuthority' in str(type(taurus_db)):   # WHAAAT???? At least check instances...
       models = expressions
     else:
-      all_devs = taurus_db.get_device_exported('*')
+      from taurus.core.tango.search import get_device_index, compile_regexp
+      all_devs = get_device_index(exported=True, db=taurus_db)
       models = []
       for exp in expressions:
           exp = str(exp)
@@ -154,7 +157,7 @@ def get_readwrite_models(expressions,limit=1000):
           
           if any(c in device for c in '.*[]()+?'):
               if '*' in device and '.*' not in device: device = device.replace('*','.*')
-              devs = [s for s in all_devs if re_match_low(device,s)]
+              devs = all_devs.search(device)
           else:
               devs = [device]
               
@@ -163,7 +166,8 @@ def get_readwrite_models(expressions,limit=1000):
                   if '*' in attribute and '.*' not in attribute: attribute = attribute.replace('*','.*')
                   try: 
                       taurus_dp = taurus.core.taurusmanager.TaurusManager().getFactory()().getDevice(dev)
-                      attrs = [att.name for att in taurus_dp.attribute_list_query() if re_match_low(attribute,att.name) and att.isReadOnly()]
+                      match = compile_regexp(attribute.lower()).match
+                      attrs = [att.name for att in taurus_dp.attribute_list_query() if match(att.name.lower()) and att.isReadOnly()]
                       targets.extend(dev+'/'+att for att in attrs)
                   except Exception,e: 
                     pass
@@ -222,6 +226,7 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
         self.defineStyle()
         self.modelsQueue = Queue.Queue()
         self.__modelsThread = None
+        self._attributes = []
         if not designMode:
             self.modelsThread
 
@@ -397,6 +402,8 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
                 self.trace('In TaurusGrid.setModel(%s,load=True): modelNames are %d'%(str(model)[:100]+'...',len(self._modelNames)))#,self._modelNames)) 
                 if devsInRows:
                     self.setRowLabels(','.join(set(d.rsplit('/',1)[0] for d in self._modelNames)))
+                # create in bulk the attributes before the widgets get them
+                self.modelsQueue.put((MethodModel(self.createAttributes),self._modelNames))
                 self.create_widgets_table(self._modelNames)
                 self.modelsQueue.put((MethodModel(self.showRowFrame),self._show_row_frame))
                 self.modelsQueue.put((MethodModel(self.showColumnFrame),self._show_column_frame))
@@ -422,6 +429,12 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
             self.updateStyle()
         return
     
+    def createAttributes(self, models):
+        '''Creates in bulk the attributes of the given models (see
+        :func:`taurus.Attributes`) and keeps them until the next setModel, so
+        that they already exist when the widgets set their models'''
+        self._attributes = taurus.Attributes(list(models))
+
     def getModel(self):
         return self._modelNames
     
@@ -570,8 +570,9 @@ class TaurusDevTree(TaurusTreeNodeContainer,Qt.QTreeWidget, TaurusBaseWidget):
                 def expand_dict(d):
                     return [x for v in d.values() for x in (expand_dict(v) if hasattr(v,'values') else (v,))] 
                 targets = [t.upper() for t in get_matching_devices(['*%s*'%f if '*' not in f else f for f in expand_dict(filters)])]
+                index = TangoSearchIndex(targets)
                 def get_devs(f):
-                    return dict.fromkeys(t for t in targets if matchCl(f,t))
+                    return dict.fromkeys(index.find(f))
                 def expand_filter(f):
                     return dict((k,expand_filter(v) if hasattr(v,'values') else get_devs(v)) for k,v in f.items() if v)
                 dct = expand_filter(filters)
@@ -636,29 +637,55 @@ class TaurusDevTree(TaurusTreeNodeContainer,Qt.QTreeWidget, TaurusBaseWidget):
         result = {}
         filters = split_model_list(filters)
         targets = get_matching_devices(filters)
-        targets = [t.upper() for t in targets]
-        domains = set(t.split('/')[0] for t in targets)
-        for d in domains:
-            families = set(t.split('/')[1] for t in targets if t.startswith('%s/'%d))
-            result[d] = dict((f,dict.fromkeys(t for t in targets if t.startswith('%s/%s/'%(d,f)))) for f in families)
+        for t in targets:
+            t = t.upper()
+            d,f = t.split('/')[:2]
+            result.setdefault(d,{}).setdefault(f,{})[t] = None
         return result
     
-    def addAttrToDev(self,my_device,expert=False,allow_types=None):
+    def queryDevAttributes(self,my_device):
+        """ Returns the attribute info list of the given device (it raises an exception if the device is not reachable) """
+        proxy = PyTango.DeviceProxy(my_device)
+        timeout = proxy.get_timeout_millis()
+        proxy.set_timeout_millis(50)
+        proxy.ping()
+        list_attr = proxy.attribute_list_query()
+        proxy.set_timeout_millis(timeout)
+        return list_attr
+
+    def queryDevsAttributes(self,devices):
+        """ Queries the attribute info lists of several devices in parallel, using the pool of the database cache (see TangoDatabaseCache.refreshAttributes).
+        It returns a dictionary {device:attribute info list or exception} """
+        result,infos = {},{}
+        cache = self.db.cache()
+        for my_device in set(devices):
+            info = cache.getDevice(my_device)
+            if info is not None:
+                infos[info] = my_device
+                continue
+            try: result[my_device] = self.queryDevAttributes(my_device) #Not in the cache (e.g. a full name)
+            except Exception,e: result[my_device] = e
+        cache.refreshAttributes(infos.keys())
+        for info,my_device in infos.items():
+            if info.attributesCached(): result[my_device] = [a.info() for a in info.attributes()]
+            else: result[my_device] = Exception('%s not available'%my_device) #The query failed or timed out
+        return result
+    
+    def addAttrToDev(self,my_device,expert=False,allow_types=None,list_attr=None):
         """ This command returns the list of attributes of a given device applying display level and type filters.
         @argin expert If False only PyTango.DispLevel.OPERATOR attributes are displayed
         @argin allow_types Only those types included in the list will be displayed (e.g. may be restricted to numeric types only)
+        @argin list_attr The attribute info list of the device (or the exception got querying it) if already known (see queryDevsAttributes)
         """
         numeric_types = [PyTango.DevDouble,PyTango.DevFloat,PyTango.DevLong,PyTango.DevLong64,PyTango.DevULong,PyTango.DevShort,PyTango.DevUShort,PyTango.DevBoolean,PyTango.DevState]
         allow_types = allow_types or [PyTango.DevString]+numeric_types
         dct = {}
         self.trace('In addAttrToDev(%s)'%my_device)
         try:
-            proxy = PyTango.DeviceProxy(my_device)
-            timeout = proxy.get_timeout_millis()
-            proxy.set_timeout_millis(50)
-            proxy.ping()
-            list_attr = proxy.attribute_list_query()
-            proxy.set_timeout_millis(timeout)
+            if list_attr is None:
+                list_attr = self.queryDevAttributes(my_device)
+            elif isinstance(list_attr,Exception):
+                raise list_attr
 
             for aname,my_attr in sorted([(a.name,a) for a in list_attr]):
                 if allow_types and my_attr.data_type not in allow_types: continue
@@ -675,11 +702,19 @@ class TaurusDevTree(TaurusTreeNodeContainer,Qt.QTreeWidget, TaurusBaseWidget):
             qmsg.show()
         return dct
             
-    def addAttrToNode(self, node=None, full=False):
+    def addAttrToNodes(self, nodes, full=False):
+        """ Adds the attributes to several device nodes, querying the devices in parallel """
+        devs = [self.getNodeDeviceName(node) for node in nodes]
+        self.trace('In addAttrToNodes(%s)'%devs)
+        lists = self.queryDevsAttributes(devs)
+        for node,dev in zip(nodes,devs):
+            self.addAttrToNode(node,full=full,list_attr=lists[dev])
+            
+    def addAttrToNode(self, node=None, full=False, list_attr=None):
         node = node or self.currentItem()
         dev = self.getNodeDeviceName(node)
         self.trace('In addAttrToNode(%s)'%dev)
-        attrs = self.addAttrToDev(dev)
+        attrs = self.addAttrToDev(dev,list_attr=list_attr)
         children = [str(node.child(i).text(0)).lower() for i in range(node.childCount())]
         for aname in sorted(attrs):
             tag = aname.rsplit('/')[-1]
@@ -1115,7 +1150,7 @@ class TaurusDevTree(TaurusTreeNodeContainer,Qt.QTreeWidget, TaurusBaseWidget):
                 #node.ContextMenu.append(("Expand Node", self.expandNode))
                 #node.ContextMenu.append(("Collapse Node", self.collapseNode))
                 if node.isExpanded() and node.childCount()<10 and all(self.getNodeText(node.child(j)).count('/')==2 for j in range(node.childCount())):
-                    node.ContextMenu.append(("Show Attributes", lambda n=node,s=self: [s.addAttrToNode(n.child(j)) for j in range(n.childCount())]))
+                    node.ContextMenu.append(("Show Attributes", lambda n=node,s=self: s.addAttrToNodes([n.child(j) for j in range(n.childCount())])))
                 node.ContextMenu.append(("Search ...",\
                     lambda: self.findInTree(str(Qt.QInputDialog.getText(self,'Search ...','Write a part of the name',Qt.QLineEdit.Normal)[0]))
                     ))
@@ -33,9 +33,14 @@ __docformat__ = 'restructuredtext'
 
 import imp
 import os.path
+import json
+import threading
+from collections import Mapping
 
+from taurus import tauruscustomsettings
 from taurus.external.qt import Qt
 
+from taurus.core import release
 from taurus.core.util.log import Logger
 from taurus.core.util.singleton import Singleton
 
@@ -65,6 +70,52 @@ def getWidgetsOfType(widget, class_or_type_or_tuple):
     return widgets
 
 
+class _WidgetMap(Mapping):
+    """A read-only dict<str, tuple<str, class>> of widget name to (package,
+    widget class) which only imports the widget module when its class is
+    requested"""
+
+    def __init__(self, factory, names):
+        self._factory = factory
+        self._names = names
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        return self._factory._getWidgetInfo(name)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(list(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def discard(self, name):
+        self._names.discard(name)
+
+    def iteritems(self):
+        # the widgets whose module cannot be imported are skipped (and
+        # dropped from the map)
+        for name in self:
+            try:
+                yield name, self[name]
+            except KeyError:
+                pass
+
+    def itervalues(self):
+        for name, info in self.iteritems():
+            yield info
+
+    def items(self):
+        return list(self.iteritems())
+
+    def values(self):
+        return list(self.itervalues())
+
+
 class TaurusWidgetFactory(Singleton, Logger):
     """The TaurusWidgetFactory is a utility class that provides information
     about all Qt widgets (Taurus and non Taurus) that are found in the
@@ -80,6 +131,9 @@ class TaurusWidgetFactory(Singleton, Logger):
         
     skip_modules = ('widget', 'util', 'qtdesigner', 'uic')
 
+    #: version of the format of the widget catalogue file
+    CatalogueVersion = 1
+
     def __init__(self):
         """ Initialization. Nothing to be done here for now."""
 
@@ -87,11 +141,143 @@ class TaurusWidgetFactory(Singleton, Logger):
         """Singleton instance initialization."""
         name = self.__class__.__name__
         self.call__init__(Logger, name)
-        
+
         path = os.path.dirname(os.path.abspath(__file__))
-        path, tail = os.path.split(path)
-        self._taurus_widgets, self._qt_widgets = self._buildWidgets('taurus.qt.qtgui', path)
-        self._addExtraTaurusWidgets(self._taurus_widgets, self._qt_widgets)
+        self._path, tail = os.path.split(path)
+        self._lock = threading.RLock()
+        self._loadCatalogue()
+
+    def _loadCatalogue(self, rebuild=False):
+        """Fills the widget catalogue, either from the catalogue file (if
+        it is up to date) or by importing all the widget packages"""
+        signature = self._getSignature()
+        catalogue = None
+        if not rebuild:
+            catalogue = self._readCatalogue(signature)
+        classes = {}
+        if catalogue is None:
+            taurus_ret, qt_ret = self._buildWidgets('taurus.qt.qtgui',
+                                                    self._path)
+            catalogue = {}
+            for dir_name, (package, klass) in qt_ret.items():
+                catalogue[dir_name] = (package, klass.__module__,
+                                       klass.__name__, dir_name in taurus_ret)
+                classes[dir_name] = package, klass
+            self._writeCatalogue(signature, catalogue)
+        # extra widgets are not part of the catalogue (they are imported
+        # anyway to find them)
+        taurus_names = set(n for n, v in catalogue.items() if v[3])
+        extra_taurus = dict.fromkeys(taurus_names)
+        extra_qt = {}
+        self._addExtraTaurusWidgets(extra_taurus, extra_qt)
+        classes.update(extra_qt)
+        self._catalogue = catalogue
+        self._classes = classes
+        qt_names = set(catalogue)
+        qt_names.update(extra_qt)
+        taurus_names.update(extra_qt)
+        self._qt_widgets = _WidgetMap(self, qt_names)
+        self._taurus_widgets = _WidgetMap(self, taurus_names)
+
+    def _getWidgetInfo(self, name):
+        """Returns the (package, class) for the given widget name, importing
+        its module if necessary. If the module cannot be imported (e.g. an
+        optional dependency was uninstalled after the catalogue was built)
+        the widget is dropped and KeyError is raised"""
+        with self._lock:
+            info = self._classes.get(name)
+            if info is None:
+                package, module_name, klass_name, _ = self._catalogue[name]
+                try:
+                    module = __import__(module_name, fromlist=[klass_name],
+                                        level=0)
+                    klass = getattr(module, klass_name)
+                except (ImportError, AttributeError), e:
+                    self.warning("Cannot import widget %s from %s (%s). "
+                                 "Dropping it (see rebuildCatalogue)", name,
+                                 module_name, e)
+                    del self._catalogue[name]
+                    self._qt_widgets.discard(name)
+                    self._taurus_widgets.discard(name)
+                    raise KeyError(name)
+                info = package, klass
+                self._classes[name] = info
+            return info
+
+    def getCatalogueFileName(self):
+        """Returns the name of the file where the widget catalogue is kept,
+        or None if it is disabled (WIDGET_CATALOGUE_DIR is None in
+        :mod:`taurus.tauruscustomsettings`)
+
+        :return: (str or None)
+        """
+        path = getattr(tauruscustomsettings, 'WIDGET_CATALOGUE_DIR',
+                       '~/.taurus')
+        if not path:
+            return None
+        return os.path.join(os.path.expanduser(path), 'widgets.catalogue')
+
+    def _getSignature(self):
+        """Returns a value which changes whenever the taurus.qt.qtgui
+        package (or the Qt or taurus version) changes"""
+        nb, mtime = 0, 0
+        for dirpath, dirnames, filenames in os.walk(self._path):
+            if dirpath == self._path:
+                dirnames[:] = [d for d in dirnames
+                               if d not in self.skip_modules]
+            for fname in filenames:
+                if fname.endswith('.py'):
+                    nb += 1
+                    mtime = max(mtime, os.path.getmtime(
+                        os.path.join(dirpath, fname)))
+        return [release.version, getattr(Qt, 'QT_VERSION_STR', None),
+                getattr(Qt, 'PYQT_VERSION_STR', None), self._path, nb, mtime]
+
+    def _readCatalogue(self, signature):
+        fname = self.getCatalogueFileName()
+        if fname is None or not os.path.isfile(fname):
+            return None
+        try:
+            with open(fname) as f:
+                data = json.load(f)
+            if data['version'] != self.CatalogueVersion or \
+               data['signature'] != signature:
+                self.debug("Widget catalogue %s is outdated", fname)
+                return None
+            catalogue = {}
+            for name, info in data['widgets'].items():
+                # json gives unicode (but __import__ needs str)
+                info = [isinstance(i, unicode) and str(i) or i for i in info]
+                catalogue[str(name)] = tuple(info)
+            return catalogue
+        except Exception:
+            self.debug("Cannot read widget catalogue %s", fname, exc_info=1)
+            return None
+
+    def _writeCatalogue(self, signature, catalogue):
+        fname = self.getCatalogueFileName()
+        if fname is None:
+            return
+        data = dict(version=self.CatalogueVersion, signature=signature,
+                    widgets=catalogue)
+        try:
+            dirname = os.path.dirname(fname)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            # write and rename, so that a reader never sees a partial file
+            tmp = "%s.%d" % (fname, os.getpid())
+            with open(tmp, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.rename(tmp, fname)
+        except Exception:
+            self.debug("Cannot write widget catalogue %s", fname, exc_info=1)
+
+    def rebuildCatalogue(self):
+        """Rebuilds the widget catalogue by importing all the widget
+        packages (use it if optional dependencies of some widgets were
+        installed after the catalogue was built)"""
+        with self._lock:
+            self._loadCatalogue(rebuild=True)
 
     def _buildWidgets(self, module_name, path, recursive = True):
         import taurus.qt.qtgui.base
@@ -194,6 +380,7 @@ class TaurusWidgetFactory(Singleton, Logger):
         return self._qt_widgets.keys()
     
     def getWidgetClasses(self):
+        # note: this imports all the widget modules
         return [ klass for mod_name, klass in self._qt_widgets.values()]
     
     def getWidgetClass(self, name):
@@ -203,6 +390,7 @@ class TaurusWidgetFactory(Singleton, Logger):
         return self._taurus_widgets.keys()
     
     def getTaurusWidgetClasses(self):
+        # note: this imports all the taurus widget modules
         return [ klass for mod_name, klass in self._taurus_widgets.values()]
     
     def getTaurusWidgetClass(self, name):
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+## This file is part of Taurus
+## 
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+## 
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+## 
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+## 
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the widget catalogue of TaurusWidgetFactory"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import shutil
+import tempfile
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus import tauruscustomsettings
+from taurus.qt.qtgui.util import TaurusWidgetFactory
+
+_MODULE = """
+from taurus.external.qt import Qt
+
+class FakeCatalogueWidget(Qt.QWidget):
+    pass
+"""
+
+
+class TaurusWidgetFactoryTestCase(unittest.TestCase):
+    """Test case for the widget catalogue of TaurusWidgetFactory"""
+
+    def setUp(self):
+        if Qt.QApplication.instance() is None:
+            self._app = Qt.QApplication([])
+        self.tmpdir = tempfile.mkdtemp()
+        self._dir = getattr(tauruscustomsettings, 'WIDGET_CATALOGUE_DIR',
+                            '~/.taurus')
+        tauruscustomsettings.WIDGET_CATALOGUE_DIR = self.tmpdir
+        # a module (not imported yet) with a widget
+        self.module_name = 'taurus_test_catalogue_widgets'
+        with open(os.path.join(self.tmpdir, self.module_name + '.py'),
+                  'w') as f:
+            f.write(_MODULE)
+        sys.path.insert(0, self.tmpdir)
+        self.factory = TaurusWidgetFactory()
+        self.factory.rebuildCatalogue()
+
+    def tearDown(self):
+        sys.path.remove(self.tmpdir)
+        sys.modules.pop(self.module_name, None)
+        tauruscustomsettings.WIDGET_CATALOGUE_DIR = self._dir
+        self.factory._loadCatalogue()
+        shutil.rmtree(self.tmpdir)
+
+    def _addEntries(self, **entries):
+        """writes the current catalogue with the given extra entries and
+        loads it"""
+        factory = self.factory
+        catalogue = dict(factory._catalogue)
+        catalogue.update(entries)
+        factory._writeCatalogue(factory._getSignature(), catalogue)
+        factory._loadCatalogue()
+
+    def test_catalogue(self):
+        """check that the catalogue file is used while it is up to date"""
+        factory = self.factory
+        fname = factory.getCatalogueFileName()
+        self.assertTrue(fname.startswith(self.tmpdir))
+        self.assertTrue(os.path.isfile(fname))
+        signature = factory._getSignature()
+        self.assertEqual(factory._readCatalogue(signature),
+                         factory._catalogue)
+        self.assertIn('TaurusLabel', factory.getTaurusWidgetClassNames())
+        self.assertIn('TaurusLabel', factory.getWidgetClassNames())
+
+    def test_signature(self):
+        """check that the catalogue is invalidated when the files change"""
+        factory = self.factory
+        signature = factory._getSignature()
+        changed = signature[:-1] + [signature[-1] + 1]
+        self.assertIsNone(factory._readCatalogue(changed))
+        changed = signature[:-2] + [signature[-2] + 1, signature[-1]]
+        self.assertIsNone(factory._readCatalogue(changed))
+        self.assertIsNotNone(factory._readCatalogue(signature))
+
+    def test_lazy_import(self):
+        """check that the widget modules are imported only when needed"""
+        self._addEntries(FakeCatalogueWidget=(
+            'fake', self.module_name, 'FakeCatalogueWidget', False))
+        factory = self.factory
+        self.assertIn('FakeCatalogueWidget', factory.getWidgetClassNames())
+        self.assertNotIn(self.module_name, sys.modules)
+        klass = factory.getWidgetClass('FakeCatalogueWidget')
+        self.assertIn(self.module_name, sys.modules)
+        self.assertEqual(klass.__name__, 'FakeCatalogueWidget')
+        self.assertEqual(factory.getWidgets()['FakeCatalogueWidget'],
+                         ('fake', klass))
+
+    def test_missing_module(self):
+        """check that the widgets which cannot be imported are dropped"""
+        self._addEntries(MissingWidget=('fake', 'taurus_test_missing_module',
+                                        'MissingWidget', True),
+                         MissingClass=('fake', self.module_name,
+                                       'MissingClass', False))
+        factory = self.factory
+        self.assertIn('MissingWidget', factory.getTaurusWidgetClassNames())
+        self.assertRaises(KeyError, factory.getWidgetClass, 'MissingWidget')
+        self.assertNotIn('MissingWidget', factory.getWidgetClassNames())
+        self.assertNotIn('MissingWidget', factory.getTaurusWidgetClassNames())
+        classes = factory.getWidgetClasses()
+        self.assertEqual(len(classes), len(factory.getWidgetClassNames()))
+        self.assertNotIn('MissingClass', factory.getWidgetClassNames())
+
+    def test_rebuild(self):
+        """check that rebuilding drops the entries which do not exist"""
+        self._addEntries(FakeCatalogueWidget=(
+            'fake', self.module_name, 'FakeCatalogueWidget', False))
+        factory = self.factory
+        factory.rebuildCatalogue()
+        self.assertNotIn('FakeCatalogueWidget', factory.getWidgetClassNames())
+        self.assertNotIn('FakeCatalogueWidget',
+                         factory._readCatalogue(factory._getSignature()))
+        self.assertIn('TaurusLabel', factory.getWidgetClassNames())
+
+
+if __name__ == '__main__':
+    unittest.main()
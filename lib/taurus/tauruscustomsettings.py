@@ -68,6 +68,60 @@ DEFAULT_SCHEME = "tango"
 # providing support to new schemes
 # EXTRA_SCHEME_MODULES = ['myownschememodule']
 
+# Number of threads used by the polling scheduler to collect the replies of
+# the polled devices (if not defined, 5 is assumed)
+# POLLING_POOL_SIZE = 5
+
+# Maximum time (in seconds) to wait for the reply of a polled device. Devices
+# missing it get an error for that polling cycle (if not defined, 3 is assumed)
+# POLLING_REPLY_TIMEOUT = 3
+
+# Number of threads used by the taurus manager for processing jobs and for
+# dispatching events (if not defined, 5 is assumed)
+# MANAGER_POOL_SIZE = 5
+
+# Maximum number of (model, event type) pending to be dispatched by the taurus
+# manager. Only the latest pending event of each model and type is kept, and
+# new events are dropped when the queue is full (if not defined, 1000 is
+# assumed)
+# EVENT_QUEUE_SIZE = 1000
+
+# If True, new Tango attributes are created without accessing the device: the
+# configuration is queried in a separate thread and a Config event is sent
+# when it arrives (if not defined, False is assumed)
+# TANGO_ASYNC_ATTR_CONFIG = False
+
+# Maximum number of parsed model names cached by the name validators. 0
+# disables the cache (if not defined, 10000 is assumed)
+# URI_GROUPS_CACHE_SIZE = 10000
+
+# Time (in seconds) during which the Tango device name <-> alias
+# correspondences are cached by the authority (if not defined, 300 is assumed)
+# TANGO_ALIAS_TTL = 300
+
+# Directory where a snapshot of the device table of each Tango database is
+# stored, so that the next application start does not need to query it all
+# (the snapshot is validated in background against a checksum of the table).
+# If not defined (or None), no snapshot is used
+# TANGO_DB_SNAPSHOT_DIR = '~/.taurus/tangodb'
+
+# Time (in seconds) during which the attribute lists of the Tango devices
+# are cached by the database cache. None means forever (if not defined,
+# 300 is assumed)
+# TANGO_ATTR_LIST_TTL = 300
+
+# Minimum time (in seconds) between two recalculations of the evaluation
+# attributes when their references change (the changes received meanwhile
+# are coalesced). None recalculates them synchronously on each event (if not
+# defined, 0 is assumed)
+# EVAL_PROPAGATION_INTERVAL = 0
+
+# Directory where the catalogue of the taurus widgets is kept (so that the
+# widget modules are only imported when needed). It is rebuilt when the
+# taurus.qt.qtgui files change. None disables it (if not defined, '~/.taurus'
+# is assumed)
+# WIDGET_CATALOGUE_DIR = '~/.taurus'
+
 # ----------------------------------------------------------------------------
 # PLY (lex/yacc) optimization: 1=Active (default) , 0=disabled. 
 # Set PLY_OPTIMIZE = 0 if you are getting yacc exceptions while loading 
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#############################################################################
+##
+## This file is part of Taurus
+##
+## http://taurus-scada.org
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Taurus is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Taurus is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Import time tests"""
+
+import os
+import sys
+import subprocess
+
+import taurus
+from taurus.external import unittest
+
+_SCRIPT = """
+import sys, time
+t0 = time.time()
+%s
+t1 = time.time()
+print repr((t1 - t0, [m for m in %r if m in sys.modules]))
+"""
+
+# the time budgets depend on the machine and its load, so they are only
+# checked on demand (e.g. TAURUS_IMPORT_BENCHMARK=1 python -m unittest ...)
+_BENCHMARK = bool(os.environ.get('TAURUS_IMPORT_BENCHMARK'))
+
+
+def _budget(name, default):
+    """returns the time budget (in s) given by the environment variable
+    `name`, or the default"""
+    return float(os.environ.get(name, default))
+
+
+class TaurusImportTimeTestCase(unittest.TestCase):
+
+    '''
+    Test that the cold import of taurus does not pull in heavy dependencies
+    that are only needed by the model classes and, if TAURUS_IMPORT_BENCHMARK
+    is set, that it stays within a time budget (which can be changed with
+    TAURUS_IMPORT_BUDGET and TAURUS_ATTRIBUTE_BUDGET)
+    '''
+
+    #: maximum time (in seconds) for a cold "import taurus"
+    importBudget = _budget('TAURUS_IMPORT_BUDGET', 0.15)
+    #: maximum time (in seconds) for creating the first attribute (this
+    #: includes loading the factories, numpy and the pint unit registry)
+    attributeBudget = _budget('TAURUS_ATTRIBUTE_BUDGET', 0.35)
+    #: number of times each import is measured (the best one is used)
+    repeat = 5
+    #: modules that must not be loaded by "import taurus"
+    heavyModules = ('numpy', 'PyTango', 'lxml', 'taurus.external.pint',
+                    'taurus.core.taurusattribute', 'taurus.core.util.codecs')
+
+    def _importTime(self, statement):
+        """Executes the given import statement in a fresh interpreter and
+        returns the best time (in s) and the heavy modules it loaded"""
+        script = _SCRIPT % (statement, self.heavyModules)
+        env = dict(os.environ)
+        path = os.path.dirname(os.path.dirname(os.path.abspath(
+            taurus.__file__)))
+        env['PYTHONPATH'] = os.pathsep.join(
+            [path, env.get('PYTHONPATH', '')])
+        results = []
+        for _ in range(self.repeat):
+            out = subprocess.check_output([sys.executable, '-c', script],
+                                          env=env)
+            results.append(eval(out.strip().splitlines()[-1]))
+        return min(results)
+
+    @unittest.skipUnless(_BENCHMARK, 'TAURUS_IMPORT_BENCHMARK is not set')
+    def testImportTaurus(self):
+        """Check that "import taurus" does not exceed its budget"""
+        elapsed, loaded = self._importTime('import taurus')
+        msg = 'import taurus took %.3fs (budget: %.3fs)' % (elapsed,
+                                                           self.importBudget)
+        self.assertLessEqual(elapsed, self.importBudget, msg)
+
+    @unittest.skipUnless(_BENCHMARK, 'TAURUS_IMPORT_BENCHMARK is not set')
+    def testImportAttribute(self):
+        """Check that creating the first attribute after a cold import does
+        not exceed its budget"""
+        statement = 'import taurus; taurus.Attribute("eval:1")'
+        elapsed, loaded = self._importTime(statement)
+        msg = 'creating the first attribute took %.3fs (budget: %.3fs)' % (
+            elapsed, self.attributeBudget)
+        self.assertLessEqual(elapsed, self.attributeBudget, msg)
+
+    def testImportIsLazy(self):
+        """Check that "import taurus" does not import heavy modules"""
+        elapsed, loaded = self._importTime('import taurus')
+        self.assertEqual(loaded, [], 'import taurus loaded %s' % loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()